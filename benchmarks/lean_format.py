@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Порівняння повного формату j1 та компактного LEAN_FORMAT
+
+Для кожного режиму виводить обсяг тіла відповіді та час розбору до
+WeatherInfo. За замовчуванням використовує записані відповіді з
+benchmarks/fixtures; з --live завантажує їх з сервера (WEATHER_API_URL
+або --base-url), додатково показуючи час запиту.
+
+Запуск:
+    python benchmarks/lean_format.py
+    python benchmarks/lean_format.py --live --city Kyiv
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from weather_app import api  # noqa: E402
+from weather_app.models import WeatherInfo  # noqa: E402
+
+
+def parse_j1(body: bytes) -> WeatherInfo:
+    """Шлях j1: повний json.loads, перевірка та витяг полів"""
+    data = api.check_payload(json.loads(body), "Kyiv")
+    return WeatherInfo.from_data(data)
+
+
+def parse_lean(body: bytes) -> WeatherInfo:
+    """Шлях lean: розбір одного рядка"""
+    return api.parse_lean_response(body.decode("utf-8"), "Kyiv")
+
+
+PARSERS: Dict[str, Callable[[bytes], WeatherInfo]] = {
+    "j1": parse_j1,
+    "lean": parse_lean,
+}
+
+
+def load_fixtures(city: str) -> Dict[str, bytes]:
+    """Читає записані відповіді для обох режимів"""
+    name = city.lower()
+    bodies = {}
+    for mode, file_name in (("j1", f"{name}_j1.json"), ("lean", f"{name}_lean.txt")):
+        with open(os.path.join(FIXTURES_DIR, file_name), "rb") as f:
+            bodies[mode] = f.read()
+    return bodies
+
+
+def fetch_live(city: str, base_url: str) -> Dict[str, Dict]:
+    """Завантажує обидва формати з сервера; повертає тіло та час запиту"""
+    import requests
+
+    results = {}
+    with requests.Session() as session:
+        for mode in PARSERS:
+            url = api.build_url(city, base_url.rstrip("/"), lean=(mode == "lean"))
+            started = time.perf_counter()
+            response = session.get(url, timeout=(api.DEFAULT_CONNECT_TIMEOUT, api.DEFAULT_READ_TIMEOUT))
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            results[mode] = {
+                "body": response.content,
+                "wire_bytes": int(response.headers.get("Content-Length") or len(response.content)),
+                "request_ms": elapsed * 1000,
+            }
+    return results
+
+
+def time_parse(parse: Callable[[bytes], WeatherInfo], body: bytes, repeat: int) -> float:
+    """Медіанний час розбору в мікросекундах"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(body)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Порівняння форматів j1 та lean")
+    parser.add_argument("--city", default="Kyiv")
+    parser.add_argument("--live", action="store_true", help="Завантажити відповіді з сервера")
+    parser.add_argument("--base-url", default=api.DEFAULT_BASE_URL)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.live:
+        live = fetch_live(args.city, args.base_url)
+        bodies = {mode: result["body"] for mode, result in live.items()}
+    else:
+        live = None
+        bodies = load_fixtures(args.city)
+
+    print(f"{'режим':<6} {'байт':>8} {'розбір, мкс':>12}" + (f" {'запит, мс':>10}" if live else ""))
+    for mode, parse in PARSERS.items():
+        body = bodies[mode]
+        info = parse(body)
+        size = live[mode]["wire_bytes"] if live else len(body)
+        line = f"{mode:<6} {size:>8} {time_parse(parse, body, args.repeat):>12.1f}"
+        if live:
+            line += f" {live[mode]['request_ms']:>10.1f}"
+        print(line + f"  {info!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Мікробенчмарк перевірки та витягування даних з відповіді j1
+
+Порівнює:
+    legacy     — перевірка і витягування двома проходами, як було до
+                 parse_weather (to_int — замикання на кожен виклик)
+    wrappers   — validate_weather_data + extract_weather_info (обгортки)
+    parse      — parse_weather, один прохід
+
+Запуск:
+    python benchmarks/parse_weather.py
+    python benchmarks/parse_weather.py --number 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Dict, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from weather_app.api import extract_weather_info, validate_weather_data  # noqa: E402
+from weather_app.models import parse_weather  # noqa: E402
+
+
+def legacy_validate(data: Dict) -> bool:
+    """Перевірка в тому вигляді, що була до parse_weather"""
+    try:
+        if not isinstance(data, dict):
+            return False
+        current_condition = data.get("current_condition")
+        nearest_area = data.get("nearest_area")
+        if not isinstance(current_condition, list) or not current_condition:
+            return False
+        if not isinstance(nearest_area, list) or not nearest_area:
+            return False
+        current = current_condition[0]
+        area = nearest_area[0]
+        if not isinstance(current, dict) or not isinstance(area, dict):
+            return False
+        if current.get("temp_C") is None:
+            return False
+        weather_desc_list = current.get("weatherDesc")
+        if not isinstance(weather_desc_list, list) or not weather_desc_list:
+            return False
+        weather_desc = weather_desc_list[0].get("value") if isinstance(weather_desc_list[0], dict) else None
+        if not weather_desc:
+            return False
+        area_name_list = area.get("areaName")
+        if not isinstance(area_name_list, list) or not area_name_list:
+            return False
+        area_name = area_name_list[0].get("value") if isinstance(area_name_list[0], dict) else None
+        if not area_name:
+            return False
+        return True
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return False
+
+
+def legacy_extract(data: Dict) -> Dict:
+    """Витягування в тому вигляді, що було до parse_weather"""
+    current = data["current_condition"][0]
+    area = data["nearest_area"][0]
+
+    def to_int(value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return 0
+
+    country_list = area.get("country")
+    country = country_list[0].get("value", "") if country_list else ""
+    return {
+        "city": area["areaName"][0]["value"],
+        "country": country,
+        "temperature": to_int(current.get("temp_C")),
+        "feels_like": to_int(current.get("FeelsLikeC")),
+        "description": current["weatherDesc"][0]["value"],
+        "humidity": to_int(current.get("humidity")),
+        "wind_speed": to_int(current.get("windspeedKmph")),
+        "pressure": to_int(current.get("pressure")),
+    }
+
+
+def legacy(data: Dict) -> Dict:
+    if legacy_validate(data):
+        return legacy_extract(data)
+    return {}
+
+
+def wrappers(data: Dict) -> Dict:
+    if validate_weather_data(data):
+        return extract_weather_info(data)
+    return {}
+
+
+CASES = {
+    "legacy": legacy,
+    "wrappers": wrappers,
+    "parse": parse_weather,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Перевірка та витягування j1")
+    parser.add_argument("--fixture", default="kyiv_j1.json")
+    parser.add_argument("--number", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(FIXTURES_DIR, args.fixture), "rb") as f:
+        data = json.load(f)
+
+    print(f"{'спосіб':<10} {'нс/виклик':>10}")
+    for name, func in CASES.items():
+        best = min(timeit.repeat(lambda: func(data), number=args.number, repeat=args.repeat))
+        print(f"{name:<10} {best / args.number * 1e9:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Порівняння повного та часткового (потокового) розбору j1
+
+Для записаної відповіді з benchmarks/fixtures вимірює для кожного
+способу: скільки байт тіла прочитано до отримання WeatherInfo, пікову
+пам'ять (tracemalloc) та процесорний час на один розбір.
+
+Запуск:
+    python benchmarks/partial_parse.py
+    python benchmarks/partial_parse.py --fixture kyiv_j1.json --chunk-size 1024
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from weather_app import jsonstream  # noqa: E402
+from weather_app.models import WeatherInfo  # noqa: E402
+
+
+class CountingChunks:
+    """Ітератор шматків тіла, що рахує прочитані байти"""
+
+    def __init__(self, body: bytes, chunk_size: int):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.read = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for start in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[start:start + self.chunk_size]
+            self.read += len(chunk)
+            yield chunk
+
+
+def full_parser(loads: Callable) -> Callable[[CountingChunks], WeatherInfo]:
+    """Поточний шлях: все тіло в пам'ять (як response.content), потім loads"""
+    def parse(chunks: CountingChunks) -> WeatherInfo:
+        return WeatherInfo.from_data(loads(b"".join(chunks)))
+    return parse
+
+
+def partial_parser(loads: Callable) -> Callable[[CountingChunks], WeatherInfo]:
+    """Потоковий шлях: лише current_condition та nearest_area"""
+    def parse(chunks: CountingChunks) -> WeatherInfo:
+        return WeatherInfo.from_data(jsonstream.extract_fields(chunks, loads=loads))
+    return parse
+
+
+def make_parsers() -> Dict[str, Callable[[CountingChunks], WeatherInfo]]:
+    parsers = {}
+    for backend, loads in jsonstream.LOADERS.items():
+        parsers[f"full/{backend}"] = full_parser(loads)
+        parsers[f"partial/{backend}"] = partial_parser(loads)
+    return parsers
+
+
+def measure(parse, body: bytes, chunk_size: int, repeat: int) -> Dict:
+    """Прочитані байти, пікова пам'ять та медіанний процесорний час"""
+    chunks = CountingChunks(body, chunk_size)
+    tracemalloc.start()
+    parse(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        fresh = CountingChunks(body, chunk_size)
+        started = time.process_time()
+        parse(fresh)
+        samples.append(time.process_time() - started)
+    samples.sort()
+    return {
+        "bytes_read": chunks.read,
+        "peak_bytes": peak,
+        "cpu_us": samples[len(samples) // 2] * 1e6,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Повний та частковий розбір j1")
+    parser.add_argument("--fixture", default="kyiv_j1.json")
+    parser.add_argument("--chunk-size", type=int, default=8192)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Вивести результати як JSON")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(FIXTURES_DIR, args.fixture), "rb") as f:
+        body = f.read()
+
+    results = {
+        name: measure(parse, body, args.chunk_size, args.repeat)
+        for name, parse in make_parsers().items()
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"тіло: {len(body)} байт, шматок: {args.chunk_size} байт")
+    print(f"{'спосіб':<16} {'прочитано':>10} {'пік пам., Б':>12} {'CPU, мкс':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<16} {result['bytes_read']:>10} "
+            f"{result['peak_bytes']:>12} {result['cpu_us']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
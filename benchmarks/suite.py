@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Набір мікробенчмарків для гарячих шляхів
+
+Покриває кеш (1, 100 та 10 000 ключів для обох сховищ), перевірку та
+витягування даних з записаних відповідей j1, локалізацію, форматування
+виводу та повний шлях fetch_and_display_weather через локальний
+HTTP-сервер.
+
+Запуск і порівняння з базовими результатами:
+    python benchmarks/suite.py run --output results.json
+    python benchmarks/suite.py run --filter cache/json --quick
+    python benchmarks/suite.py compare benchmarks/baseline.json results.json
+
+compare повертає код 1, якщо хоча б один бенчмарк повільніший за
+базовий більше ніж на --threshold (за замовчуванням 30%). Базові
+результати залежать від машини: оновлюйте benchmarks/baseline.json
+на тій самій машині, на якій порівнюєте.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baseline.json")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from weather_app import api, cache, cli, localization  # noqa: E402
+from weather_app.breaker import CircuitBreaker  # noqa: E402
+from weather_app.models import parse_weather  # noqa: E402
+
+DEFAULT_THRESHOLD = 0.3  # допустиме сповільнення перед позначкою регресії
+CACHE_SIZES = (1, 100, 10000)
+DESCRIPTION = "Patchy rain possible"
+
+Setup = Callable[[contextlib.ExitStack], Callable[[], object]]
+CASES: Dict[str, Setup] = {}
+
+
+def case(name: str):
+    """Реєструє функцію підготовки бенчмарку; вона повертає вимірювану дію"""
+    def register(setup: Setup) -> Setup:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def load_fixture(name: str = "kyiv_j1.json") -> Dict:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return json.load(f)
+
+
+def temp_cache_dir(stack: contextlib.ExitStack) -> str:
+    """Тимчасова директорія кешу; налаштування кешу відновлюються після бенчмарку"""
+    saved = (cache.CACHE_BACKEND, cache.CACHE_FILE, cache.MAX_ENTRIES, cache.MAX_BYTES,
+             cache.CACHE_MODE, cache.STALE_TTL, cache._memory.max_entries)
+
+    def restore():
+        backend, cache_file, max_entries, max_bytes, mode, stale_ttl, memory_size = saved
+        cache.configure(backend=backend, max_entries=max_entries, max_bytes=max_bytes,
+                        mode=mode, stale_ttl=stale_ttl, memory_size=memory_size)
+        cache.CACHE_FILE = cache_file
+
+    stack.callback(restore)
+    return stack.enter_context(tempfile.TemporaryDirectory(prefix="weather-bench-"))
+
+
+def populated_cache(stack: contextlib.ExitStack, backend: str, keys: int, memory_size: int) -> List[str]:
+    """Налаштовує кеш у тимчасовій директорії та заповнює його keys записами"""
+    cache.configure(
+        backend=backend,
+        cache_dir=temp_cache_dir(stack),
+        memory_size=memory_size,
+        max_entries=keys * 2,
+        max_bytes=1 << 40,
+        mode="full",
+        stale_ttl=0,
+    )
+    data = load_fixture()
+    current = {"current_condition": data["current_condition"], "nearest_area": data["nearest_area"]}
+    now = time.time()
+    cities = [f"city-{i}" for i in range(keys)]
+    # Одним записом, щоб не переписувати JSON-файл keys разів
+    cache._write_entries(
+        {cache.get_cache_key(city): cache.make_entry(current, now, 3600) for city in cities},
+        now=now,
+    )
+    return cities
+
+
+def register_cache_cases():
+    for backend in cache.BACKENDS:
+        for keys in CACHE_SIZES:
+            def get_cold(stack, backend=backend, keys=keys):
+                # Без кешу в пам'яті — як у кожному окремому запуску CLI
+                cities = populated_cache(stack, backend, keys, memory_size=0)
+                city = cities[len(cities) // 2]
+                return lambda: cache.get_from_cache(city, 3600)
+
+            def get_warm(stack, backend=backend, keys=keys):
+                cities = populated_cache(stack, backend, keys, memory_size=cache.MEMORY_TIER_SIZE)
+                city = cities[len(cities) // 2]
+                cache.get_from_cache(city, 3600)
+                return lambda: cache.get_from_cache(city, 3600)
+
+            def set_existing(stack, backend=backend, keys=keys):
+                cities = populated_cache(stack, backend, keys, memory_size=cache.MEMORY_TIER_SIZE)
+                city = cities[len(cities) // 2]
+                data = cache.get_from_cache(city, 3600)
+                return lambda: cache.set_to_cache(city, data, ttl=3600)
+
+            case(f"cache/{backend}/get_cold/{keys}")(get_cold)
+            case(f"cache/{backend}/get_warm/{keys}")(get_warm)
+            case(f"cache/{backend}/set/{keys}")(set_existing)
+
+
+register_cache_cases()
+
+
+@case("parse/validate_weather_data")
+def bench_validate(stack):
+    data = load_fixture()
+    return lambda: api.validate_weather_data(data)
+
+
+@case("parse/extract_weather_info")
+def bench_extract(stack):
+    data = load_fixture()
+    return lambda: api.extract_weather_info(data)
+
+
+@case("parse/parse_weather")
+def bench_parse_weather(stack):
+    data = load_fixture()
+    return lambda: parse_weather(data)
+
+
+@case("localization/translate")
+def bench_translate(stack):
+    return lambda: localization.translate(DESCRIPTION)
+
+
+@case("localization/get_weather_emoji")
+def bench_emoji(stack):
+    return lambda: localization.get_weather_emoji(DESCRIPTION)
+
+
+@case("cli/format_weather_output")
+def bench_format(stack):
+    info = parse_weather(load_fixture())
+    return lambda: cli.format_weather_output(info)
+
+
+def stub_backed_cli(stack: contextlib.ExitStack):
+    """Кеш у тимчасовій директорії та спільний клієнт, що ходить на локальний сервер"""
+    from loadtest.stub_server import StubWttr
+
+    cache.configure(cache_dir=temp_cache_dir(stack), memory_size=0)
+    stub = stack.enter_context(StubWttr({"/Kyiv": (200, load_fixture())}))
+    client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+    stack.callback(client.close)
+    previous = api.set_default_client(client)
+    stack.callback(api.set_default_client, previous)
+    stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+
+@case("cli/fetch_and_display_weather/network")
+def bench_display_network(stack):
+    stub_backed_cli(stack)
+    return lambda: cli.fetch_and_display_weather("Kyiv", use_cache=False)
+
+
+@case("cli/fetch_and_display_weather/cache_hit")
+def bench_display_cache_hit(stack):
+    stub_backed_cli(stack)
+    cli.fetch_and_display_weather("Kyiv")
+    return lambda: cli.fetch_and_display_weather("Kyiv")
+
+
+def measure(action: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    """Час однієї операції: найкращий та медіанний з repeat вимірювань"""
+    timer = timeit.Timer(action)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 10 if number < 1000 else 2
+    samples = sorted(t / number for t in timer.repeat(repeat=repeat, number=number))
+    return {
+        "ns_per_op": samples[0] * 1e9,
+        "median_ns": samples[len(samples) // 2] * 1e9,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(patterns: Optional[List[str]] = None, repeat: int = 5, min_time: float = 0.2,
+        log=sys.stderr) -> Dict:
+    """
+    Запускає бенчмарки, імена яких відповідають шаблонам (fnmatch)
+
+    Returns:
+        Словник з метаданими середовища та результатами за іменем бенчмарку
+    """
+    results = {}
+    for name, setup in CASES.items():
+        if patterns and not any(fnmatch.fnmatch(name, p) or p in name for p in patterns):
+            continue
+        with contextlib.ExitStack() as stack:
+            action = setup(stack)
+            results[name] = measure(action, repeat, min_time)
+        if log is not None:
+            print(f"{name:<48} {format_ns(results[name]['ns_per_op']):>12}", file=log)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "json_backend": api.jsonstream.JSON_BACKEND,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Порівнює результати з базовими
+
+    Returns:
+        Рядки порівняння для спільних бенчмарків; regression=True, якщо
+        поточний час більший за базовий більш ніж у (1 + threshold) разів
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        ratio = result["ns_per_op"] / base["ns_per_op"] if base["ns_per_op"] else float("inf")
+        rows.append({
+            "name": name,
+            "baseline_ns": base["ns_per_op"],
+            "current_ns": result["ns_per_op"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки гарячих шляхів weather_app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Запустити бенчмарки")
+    run_parser.add_argument("--output", "-o", help="Файл для результатів (JSON)")
+    run_parser.add_argument("--filter", "-k", action="append", metavar="PATTERN",
+                            help="Лише бенчмарки, що відповідають шаблону")
+    run_parser.add_argument("--quick", action="store_true", help="Менше повторів, коротші вимірювання")
+    run_parser.add_argument("--list", action="store_true", help="Показати імена бенчмарків")
+
+    compare_parser = commands.add_parser("compare", help="Порівняти результати з базовими")
+    compare_parser.add_argument("baseline", nargs="?", default=BASELINE_FILE)
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Допустиме сповільнення (0.3 = 30%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.list:
+            print("\n".join(CASES))
+            return 0
+        repeat, min_time = (3, 0.05) if args.quick else (5, 0.2)
+        results = run(args.filter, repeat=repeat, min_time=min_time)
+        output = json.dumps(results, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        marker = "РЕГРЕСІЯ" if row["regression"] else ""
+        print(
+            f"{row['name']:<48} {format_ns(row['baseline_ns']):>12} -> "
+            f"{format_ns(row['current_ns']):>12} {row['ratio']:>6.2f}x {marker}"
+        )
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\nПорівняно: {len(rows)}, регресій: {len(regressions)} (поріг {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Навантажувальне тестування weather_app на одній машині без мережі
+
+Піднімає локальний StubWttr із записаною відповіддю j1 та заданими
+затримкою і часткою помилок, запускає N одночасних клієнтів і
+звітує про запити/с, p50/p95/p99 затримки, частку влучань у кеш та
+кількість запитів, що дійшли до сервера.
+
+Режими:
+    api  — потоки в одному процесі: кеш → fetch_single_flight
+           (або api.get_weather з --no-cache)
+    cli  — окремий процес src/main.py на кожен запит, як у
+           скриптах, що викликають ./weather.sh
+
+Приклади:
+    python -m loadtest.driver --concurrency 32 --requests 2000 --cities 50
+    python -m loadtest.driver --mode cli --concurrency 8 --requests 200
+    python -m loadtest.driver --latency lognormal:0.08,0.6 \\
+        --fault 500=0.05 --fault timeout=0.01 --fault malformed=0.02 --timeout 1
+    python -m loadtest.driver --duration 30 --ttl 5 --json report.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "src", "main.py")
+DEFAULT_FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "kyiv_j1.json")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from loadtest.stub_server import StubWttr, load_fixture, parse_fault  # noqa: E402
+
+MODES = ("api", "cli")
+CACHE_HIT_MARKER = "📦 (дані з кешу)"
+PERCENTILES = (50, 95, 99)
+
+# Коди виходу main.py (див. cli.fetch_and_display_weather)
+EXIT_CODES = {1: "Error", 2: "CityNotFoundError", 3: "InvalidResponseError", 7: "NetworkError"}
+
+# (успіх, влучання в кеш, тип помилки або None)
+Outcome = Tuple[bool, bool, Optional[str]]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Перцентиль за найближчим рангом для відсортованого списку"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def city_names(count: int) -> List[str]:
+    return [f"City-{i}" for i in range(count)]
+
+
+def make_api_request(ttl: int, use_cache: bool) -> Callable[[str], Outcome]:
+    """Один запит через api у поточному процесі"""
+    from weather_app import api
+
+    def request(city: str) -> Outcome:
+        try:
+            if not use_cache:
+                api.get_weather(city)
+                return True, False, None
+            result = api.result_from_cache(city, ttl)
+            if result is not None:
+                return True, True, None
+            result = api.fetch_single_flight(city, ttl)
+            result.weather_info()
+            # Дочекалися чужого запиту — це теж влучання в кеш
+            return True, result.from_cache, None
+        except Exception as e:
+            return False, False, type(e).__name__
+
+    return request
+
+
+def make_cli_request(base_url: str, cache_dir: str, backend: str, ttl: int,
+                     use_cache: bool, timeout: float) -> Callable[[str], Outcome]:
+    """Один запит як окремий запуск src/main.py"""
+    env = dict(os.environ, WEATHER_API_URL=base_url, PYTHONIOENCODING="utf-8")
+    base_args = [sys.executable, MAIN, "--cache-dir", cache_dir,
+                 "--cache-backend", backend, "--ttl", str(ttl)]
+    if not use_cache:
+        base_args.append("--no-cache")
+
+    def request(city: str) -> Outcome:
+        try:
+            proc = subprocess.run(
+                base_args + ["--city", city], env=env, cwd=cache_dir,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return False, False, "ProcessTimeout"
+        if proc.returncode != 0:
+            return False, False, EXIT_CODES.get(proc.returncode, f"exit {proc.returncode}")
+        return True, CACHE_HIT_MARKER in proc.stdout.decode("utf-8", "replace"), None
+
+    return request
+
+
+def drive(request: Callable[[str], Outcome], cities: List[str], concurrency: int,
+          total: Optional[int] = None, duration: Optional[float] = None) -> Dict:
+    """
+    Запускає concurrency потоків, що виконують запити до вичерпання
+    total запитів або duration секунд
+
+    Міста обираються по колу, тож кожен потік звертається до різних
+    ключів, а популярні ключі повторюються з періодом len(cities).
+
+    Returns:
+        Сирі вимірювання: затримки, влучання, помилки та тривалість
+    """
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counters = {"issued": 0, "hits": 0}
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    def next_city() -> Optional[str]:
+        with lock:
+            index = counters["issued"]
+            if total is not None and index >= total:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            counters["issued"] += 1
+        return cities[index % len(cities)]
+
+    def worker():
+        while True:
+            city = next_city()
+            if city is None:
+                return
+            began = time.perf_counter()
+            ok, hit, error = request(city)
+            elapsed = time.perf_counter() - began
+            with lock:
+                latencies.append(elapsed)
+                if hit:
+                    counters["hits"] += 1
+                if not ok:
+                    errors[error] = errors.get(error, 0) + 1
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "elapsed": time.perf_counter() - start,
+        "latencies": latencies,
+        "hits": counters["hits"],
+        "errors": errors,
+    }
+
+
+def summarize(raw: Dict, upstream: Dict, config: Dict) -> Dict:
+    """Формує звіт: пропускна здатність, перцентилі затримки, кеш і сервер"""
+    latencies = sorted(raw["latencies"])
+    count = len(latencies)
+    failed = sum(raw["errors"].values())
+    elapsed = raw["elapsed"]
+    return {
+        "config": config,
+        "requests": count,
+        "ok": count - failed,
+        "errors": dict(sorted(raw["errors"].items())),
+        "elapsed_s": elapsed,
+        "requests_per_s": count / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{p}": percentile(latencies, p) * 1000 for p in PERCENTILES},
+            "mean": sum(latencies) / count * 1000 if count else 0.0,
+            "max": latencies[-1] * 1000 if count else 0.0,
+        },
+        "cache_hit_ratio": raw["hits"] / count if count else 0.0,
+        "upstream": upstream,
+    }
+
+
+@contextlib.contextmanager
+def api_environment(base_url: str, cache_dir: str, backend: str, timeout: float, use_breaker: bool):
+    """Налаштовує кеш і спільний клієнт api на локальний сервер"""
+    from weather_app import api, cache
+    from weather_app.breaker import CircuitBreaker
+
+    saved = cache.CACHE_FILE, cache.CACHE_BACKEND
+    cache.configure(backend=backend, cache_dir=cache_dir, memory_size=cache.MEMORY_TIER_SIZE)
+    client = api.WeatherClient(
+        base_url=base_url,
+        read_timeout=timeout,
+        pool_maxsize=api.DEFAULT_POOL_MAXSIZE * 4,
+        breaker=CircuitBreaker() if use_breaker else None,
+    )
+    previous = api.set_default_client(client)
+    try:
+        yield
+    finally:
+        api.set_default_client(previous)
+        client.close()
+        cache.CACHE_FILE, backend = saved
+        cache.configure(backend=backend, memory_size=cache.MEMORY_TIER_SIZE)
+
+
+def run(
+    mode: str = "api",
+    concurrency: int = 16,
+    total: Optional[int] = 1000,
+    duration: Optional[float] = None,
+    cities: int = 20,
+    ttl: int = 300,
+    use_cache: bool = True,
+    backend: str = "json",
+    latency=None,
+    faults: Optional[Dict[str, float]] = None,
+    timeout: float = 2.0,
+    use_breaker: bool = False,
+    fixture: str = DEFAULT_FIXTURE,
+    seed: Optional[int] = None,
+) -> Dict:
+    """
+    Проводить один прогін навантаження з новим кешем у тимчасовій директорії
+
+    Args:
+        mode: "api" або "cli"
+        concurrency: Кількість одночасних клієнтів
+        total: Кількість запитів (None — обмежено лише duration)
+        duration: Тривалість у секундах (None — обмежено лише total)
+        cities: Кількість різних міст
+        ttl: TTL кешу в секундах
+        use_cache: Чи використовувати кеш
+        backend: Сховище кешу: "json" або "sqlite"
+        latency: Затримка сервера (див. stub_server.parse_latency)
+        faults: Частки помилок сервера (див. stub_server.FAULTS)
+        timeout: Таймаут читання клієнта в секундах (режим api) або
+            на весь процес (режим cli — до нього додається таймаут main.py)
+        use_breaker: Увімкнути запобіжник у клієнті (режим api)
+        fixture: Файл з відповіддю j1 для будь-якого міста
+        seed: Зерно для відтворюваних затримок і помилок
+
+    Returns:
+        Звіт summarize()
+
+    Raises:
+        ValueError: Для невідомого режиму або без обмеження прогону
+    """
+    if mode not in MODES:
+        raise ValueError(f"Невідомий режим: {mode}")
+    if total is None and duration is None:
+        raise ValueError("Потрібно задати кількість запитів або тривалість")
+
+    config = {
+        "mode": mode, "concurrency": concurrency, "requests": total, "duration": duration,
+        "cities": cities, "ttl": ttl, "cache": use_cache, "backend": backend, "latency": latency,
+        "faults": faults or {}, "timeout": timeout, "breaker": use_breaker,
+    }
+    names = city_names(cities)
+    with contextlib.ExitStack() as stack:
+        cache_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="weather-load-"))
+        stub = stack.enter_context(StubWttr(
+            default=(200, load_fixture(fixture)),
+            latency=latency, faults=faults, seed=seed,
+            # Сервер "зависає" довше, ніж клієнт готовий чекати
+            hang=timeout + 1,
+        ))
+        if mode == "api":
+            stack.enter_context(api_environment(stub.url, cache_dir, backend, timeout, use_breaker))
+            request = make_api_request(ttl, use_cache)
+        else:
+            request = make_cli_request(stub.url, cache_dir, backend, ttl, use_cache, timeout + 30)
+        raw = drive(request, names, concurrency, total, duration)
+        upstream = stub.stats()
+    return summarize(raw, upstream, config)
+
+
+def format_report(report: Dict) -> str:
+    """Форматує звіт для виведення в консоль"""
+    config = report["config"]
+    latency = report["latency_ms"]
+    upstream = report["upstream"]
+    output = []
+    output.append("=" * 50)
+    output.append(
+        f"Режим: {config['mode']}, клієнтів: {config['concurrency']}, "
+        f"міст: {config['cities']}, кеш: {config['backend'] if config['cache'] else 'ні'}"
+    )
+    output.append(f"Запитів: {report['requests']} за {report['elapsed_s']:.2f} с "
+                  f"({report['requests_per_s']:.1f} запитів/с)")
+    output.append(
+        "Затримка, мс: " + ", ".join(
+            f"{name} {latency[name]:.2f}" for name in ("p50", "p95", "p99", "max")
+        )
+    )
+    output.append(f"Влучань у кеш: {report['cache_hit_ratio']:.1%}")
+    output.append(f"Запитів до сервера: {upstream['requests']} (пік одночасних: {upstream['peak_active']})")
+    if upstream["responses"]:
+        output.append("Відповіді сервера: " + ", ".join(
+            f"{name} {count}" for name, count in sorted(upstream["responses"].items())
+        ))
+    if report["errors"]:
+        output.append("Помилки клієнтів: " + ", ".join(
+            f"{name} {count}" for name, count in report["errors"].items()
+        ))
+    output.append("=" * 50)
+    return "\n".join(output)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Навантажувальне тестування weather_app")
+    parser.add_argument("--mode", choices=MODES, default="api")
+    parser.add_argument("--concurrency", "-n", type=int, default=16, help="Одночасних клієнтів")
+    parser.add_argument("--requests", type=int, default=1000, help="Загальна кількість запитів")
+    parser.add_argument("--duration", type=float,
+                        help="Тривалість у секундах (замість --requests)")
+    parser.add_argument("--cities", type=int, default=20, help="Кількість різних міст")
+    parser.add_argument("--ttl", type=int, default=300)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--cache-backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--latency", help="Затримка сервера: 0.05, uniform:a,b, exp:mean, lognormal:median,sigma")
+    parser.add_argument("--fault", action="append", default=[], metavar="KIND=RATE",
+                        help="Частка помилок сервера: 404, 500, 502, 503, timeout, malformed")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Таймаут читання клієнта (режим api)")
+    parser.add_argument("--breaker", action="store_true", help="Увімкнути запобіжник (режим api)")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", metavar="PATH", help="Записати звіт у JSON ('-' — у stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run(
+            mode=args.mode,
+            concurrency=args.concurrency,
+            total=None if args.duration else args.requests,
+            duration=args.duration,
+            cities=args.cities,
+            ttl=args.ttl,
+            use_cache=not args.no_cache,
+            backend=args.cache_backend,
+            latency=args.latency,
+            faults=dict(parse_fault(spec) for spec in args.fault),
+            timeout=args.timeout,
+            use_breaker=args.breaker,
+            fixture=args.fixture,
+            seed=args.seed,
+        )
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
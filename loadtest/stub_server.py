@@ -0,0 +1,310 @@
+"""
+Локальна заміна wttr.in для тестів, бенчмарків та навантажувального тестування
+
+Відповідає записаними відповідями j1 з налаштовуваною затримкою
+(фіксованою або з розподілу) та часткою помилок: 404, 5xx, таймаути
+(сервер не відповідає) і зіпсовані тіла.
+
+Окремий запуск:
+    python -m loadtest.stub_server --port 8080 \\
+        --fixture benchmarks/fixtures/kyiv_j1.json \\
+        --latency lognormal:0.08,0.5 --fault 500=0.02 --fault timeout=0.01
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+
+FAULTS = ("404", "500", "502", "503", "timeout", "malformed")
+DEFAULT_HANG = 30.0  # скільки секунд "зависає" відповідь з таймаутом
+
+Latency = Callable[[random.Random], float]
+
+
+def parse_latency(spec: Union[str, float, None]) -> Latency:
+    """
+    Розбирає опис затримки відповіді в секундах
+
+    Підтримувані формати:
+        0.05 або fixed:0.05       — фіксована
+        uniform:0.01,0.2          — рівномірна між межами
+        exp:0.05                  — експоненційна з середнім
+        lognormal:0.08,0.5        — логнормальна з медіаною та sigma
+
+    Raises:
+        ValueError: Для невідомого формату
+    """
+    if spec is None:
+        return lambda rng: 0.0
+    if isinstance(spec, (int, float)):
+        value = float(spec)
+        return lambda rng: value
+
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    try:
+        params = [float(x) for x in args.split(",")]
+    except ValueError:
+        raise ValueError(f"Некоректна затримка: {spec}")
+
+    if kind == "fixed" and len(params) == 1:
+        value = params[0]
+        return lambda rng: value
+    if kind == "uniform" and len(params) == 2:
+        low, high = params
+        return lambda rng: rng.uniform(low, high)
+    if kind == "exp" and len(params) == 1:
+        mean = params[0]
+        return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+    if kind == "lognormal" and len(params) == 2:
+        median, sigma = params
+        mu = math.log(median)
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Некоректна затримка: {spec}")
+
+
+def parse_fault(spec: str) -> Tuple[str, float]:
+    """Розбирає "500=0.02" у ("500", 0.02)"""
+    kind, _, rate = spec.partition("=")
+    if kind not in FAULTS:
+        raise ValueError(f"Невідомий тип помилки: {kind} (доступні: {', '.join(FAULTS)})")
+    try:
+        return kind, float(rate)
+    except ValueError:
+        raise ValueError(f"Некоректна частка помилок: {spec}")
+
+
+class StubWttr:
+    """
+    HTTP-сервер, що віддає заготовлені відповіді за декодованим шляхом
+
+    routes зіставляє шлях на кшталт "/Kyiv" з (status, body), де body —
+    bytes, str або об'єкт для json.dumps. Для інших шляхів віддається
+    default (за замовчуванням 404 "Unknown location"). Рахує запити,
+    коди відповідей та пікову кількість одночасних запитів.
+
+    Використання як контекстного менеджера:
+        with StubWttr({"/Kyiv": (200, payload)}) as stub:
+            requests.get(f"{stub.url}/Kyiv?format=j1")
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict] = None,
+        delay: float = 0.0,
+        chunked: bool = False,
+        default: Optional[Tuple[int, object]] = None,
+        latency: Union[str, float, Latency, None] = None,
+        faults: Optional[Dict[str, float]] = None,
+        hang: float = DEFAULT_HANG,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            routes: Шлях → (status, body)
+            delay: Фіксована затримка кожної відповіді в секундах
+            chunked: Віддавати тіло з Transfer-Encoding: chunked
+            default: (status, body) для шляхів, яких немає в routes
+            latency: Затримка: опис для parse_latency або функція від random.Random
+            faults: Тип помилки з FAULTS → частка запитів (0..1)
+            hang: Скільки секунд тримати з'єднання для помилки "timeout"
+            seed: Зерно генератора випадкових чисел для відтворюваності
+            host: Адреса для прослуховування
+            port: Порт (0 — будь-який вільний)
+        """
+        self.routes = dict(routes or {})
+        self.default = default or (404, "Unknown location")
+        self.delay = delay
+        self.chunked = chunked
+        self.latency = latency if callable(latency) else parse_latency(latency)
+        self.faults = dict(faults or {})
+        for kind in self.faults:
+            if kind not in FAULTS:
+                raise ValueError(f"Невідомий тип помилки: {kind}")
+        self.hang = hang
+        self.requests = []
+        self.statuses: Dict[str, int] = {}
+        self.active = 0
+        self.peak_active = 0
+        self._rng = random.Random(seed)
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def count(self, path: Optional[str] = None) -> int:
+        """Кількість запитів до шляху (None — усіх)"""
+        with self._lock:
+            if path is None:
+                return len(self.requests)
+            return sum(1 for p in self.requests if p == path)
+
+    def stats(self) -> Dict:
+        """Кількість запитів, відповіді за кодом/типом помилки та пікова паралельність"""
+        with self._lock:
+            return {
+                "requests": len(self.requests),
+                "responses": dict(self.statuses),
+                "peak_active": self.peak_active,
+            }
+
+    def start(self) -> "StubWttr":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._closed.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _choose(self) -> Tuple[float, Optional[str]]:
+        """Випадкова затримка та тип помилки (або None) для одного запиту"""
+        with self._lock:
+            delay = self.delay + max(0.0, self.latency(self._rng))
+            roll = self._rng.random()
+        for kind, rate in self.faults.items():
+            if roll < rate:
+                return delay, kind
+            roll -= rate
+        return delay, None
+
+    def _record(self, outcome: str):
+        with self._lock:
+            self.statuses[outcome] = self.statuses.get(outcome, 0) + 1
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки й тіло йдуть окремими записами; без TCP_NODELAY
+            # keep-alive клієнти чекають на відкладений ACK (~40 мс на запит)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                path = unquote(urlsplit(self.path).path)
+                with stub._lock:
+                    stub.requests.append(path)
+                    stub.active += 1
+                    stub.peak_active = max(stub.peak_active, stub.active)
+                try:
+                    delay, fault = stub._choose()
+                    if delay:
+                        time.sleep(delay)
+                    if fault == "timeout":
+                        # Не відповідаємо, поки клієнт не здасться
+                        stub._record("timeout")
+                        stub._closed.wait(stub.hang)
+                        self.close_connection = True
+                        return
+                    status, body = stub.routes.get(path, stub.default)
+                    if fault in ("404", "500", "502", "503"):
+                        status, body = int(fault), f"{fault} fault injected"
+                    body = self._encode(body)
+                    if fault == "malformed":
+                        status, body = 200, body[:len(body) // 2]
+                    stub._record(fault if fault == "malformed" else str(status))
+                    self._send(status, body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            @staticmethod
+            def _encode(body) -> bytes:
+                if not isinstance(body, (bytes, str)):
+                    body = json.dumps(body)
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                return body
+
+            def _send(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if stub.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for i in range(0, len(body), 7):
+                        piece = body[i:i + 7]
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def load_fixture(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main(argv=None) -> int:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Локальна заміна wttr.in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixture", default=os.path.join(root, "benchmarks", "fixtures", "kyiv_j1.json"),
+                        help="Тіло відповіді для будь-якого міста")
+    parser.add_argument("--latency", help="Затримка, наприклад 0.05, uniform:0.01,0.2, lognormal:0.08,0.5")
+    parser.add_argument("--fault", action="append", default=[], metavar="KIND=RATE",
+                        help=f"Частка помилок ({', '.join(FAULTS)}), можна кілька разів")
+    parser.add_argument("--hang", type=float, default=DEFAULT_HANG)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    try:
+        faults = dict(parse_fault(spec) for spec in args.fault)
+        stub = StubWttr(
+            default=(200, load_fixture(args.fixture)),
+            latency=args.latency, faults=faults, hang=args.hang, seed=args.seed,
+            host=args.host, port=args.port,
+        )
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    with stub:
+        print(f"Сервер працює на {stub.url} (Ctrl+C — вихід)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(json.dumps(stub.stats(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
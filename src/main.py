@@ -5,7 +5,7 @@
 
 import argparse
 import sys
-from weather_app import cli, cache
+from weather_app import cli, cache, geo, remote, timings
 
 
 def positive_int(value):
@@ -18,6 +18,102 @@ def positive_int(value):
     except (ValueError, TypeError):
         raise argparse.ArgumentTypeError(f"{value} is not a valid integer")
 
+def read_cities_file(path):
+    """Читає список міст з файлу: одне місто на рядок, # — коментар"""
+    cities = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                cities.append(line)
+    return cities
+
+def parse_watch_city(spec, default_interval):
+    """
+    Розбирає місто режиму --watch з необов'язковим власним інтервалом
+
+    "Lviv=120" — Львів кожні 120 секунд, "Kyiv" — з інтервалом --watch
+
+    Returns:
+        (назва міста, інтервал у секундах)
+    """
+    city, sep, interval = spec.rpartition('=')
+    if not sep:
+        return spec, default_interval
+    return city, positive_int(interval)
+
+def jitter_fraction(value):
+    """Перевіряє, чи є значення часткою в межах [0, 1)"""
+    try:
+        fvalue = float(value)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid number")
+    if not 0 <= fvalue < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not in range [0, 1)")
+    return fvalue
+
+def refresh_fraction(value):
+    """Перевіряє, чи є значення часткою в межах (0, 1)"""
+    try:
+        fvalue = float(value)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid number")
+    if not 0 < fvalue < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not in range (0, 1)")
+    return fvalue
+
+def non_negative_int(value):
+    """Перевіряє, чи є значення невід'ємним int"""
+    try:
+        ivalue = int(value)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid integer")
+    if ivalue < 0:
+        raise argparse.ArgumentTypeError(f"{value} is an invalid non-negative int value")
+    return ivalue
+
+def latitude(value):
+    """Перевіряє, чи є значення широтою в межах [-90, 90]"""
+    try:
+        fvalue = float(value)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid number")
+    if not -90 <= fvalue <= 90:
+        raise argparse.ArgumentTypeError(f"{value} is not in range [-90, 90]")
+    return fvalue
+
+def longitude(value):
+    """Перевіряє, чи є значення довготою в межах [-180, 180]"""
+    try:
+        fvalue = float(value)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid number")
+    if not -180 <= fvalue <= 180:
+        raise argparse.ArgumentTypeError(f"{value} is not in range [-180, 180]")
+    return fvalue
+
+def non_negative_float(value):
+    """Перевіряє, чи є значення невід'ємним числом"""
+    try:
+        fvalue = float(value)
+    except (ValueError, TypeError):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid number")
+    if not fvalue >= 0:
+        raise argparse.ArgumentTypeError(f"{value} is an invalid non-negative number")
+    return fvalue
+
+def fetch_from_daemon(cities, use_cache, ttl, lean):
+    """
+    Пробує отримати погоду від локального демона (--serve)
+
+    Returns:
+        Результат виводу або None, якщо демон не запущений чи перевантажений
+    """
+    responses = remote.fetch_weather(cities, use_cache=use_cache, ttl=ttl, lean=lean)
+    if responses is None or any(r.get("error") == remote.OVERLOADED for r in responses):
+        return None
+    return cli.display_remote(cities, responses)
+
 def main():
     """Главная функция приложения"""
     
@@ -30,11 +126,30 @@ def main():
   ./weather.sh                    # Погода за автовизначенням IP (Linux/macOS)
   weather.bat                     # Погода за автовизначенням IP (Windows)
   ./weather.sh --city Kyiv        # Погода для Києва (Linux/macOS)
+  ./weather.sh -c Kyiv -c Lviv    # Погода для кількох міст паралельно
+  ./weather.sh --cities-file cities.txt  # Міста з файлу (одне на рядок)
   weather.bat --city "New York"   # Погода для міста з пробілом (Windows)
+  ./weather.sh --lat 50.45 --lon 30.52  # Погода за координатами GPS
+  ./weather.sh --lat 50.45 --lon 30.52 --radius 5  # Брати кеш точки в межах 5 км
   ./weather.sh --watch            # Автооновлення кожні 5 хвилин (Linux/macOS)
   ./weather.sh --watch 60         # Автооновлення кожну хвилину (Linux/macOS)
+  ./weather.sh -w 300 -c Kyiv -c Lviv=60  # Таблиця міст, Львів — щохвилини
+  ./weather.sh -w 60 --metrics-port 9108  # Метрики Prometheus на 127.0.0.1:9108/metrics
   ./weather.sh --no-cache         # Без використання кешу (Linux/macOS)
   ./weather.sh --ttl 600          # Встановити TTL кешу 10 хвилин (Linux/macOS)
+  ./weather.sh --cache-backend sqlite --xdg-cache  # Кеш у SQLite в ~/.cache
+  ./weather.sh --lean --city Kyiv # Лише поточна погода, без прогнозу (менша відповідь)
+  ./weather.sh --stale-ttl 600    # Показувати застарілі дані до 10 хв, оновлюючи у фоні
+  ./weather.sh --cache-migrate    # Перенести JSON-кеш до SQLite
+  ./weather.sh --cache-prune      # Видалити давно прострочені та зайві записи кешу
+  ./weather.sh --cache-stats      # Статистика кешу
+  ./weather.sh --cache-negative   # Міста, які сервіс нещодавно не знайшов
+  ./weather.sh --cache-purge-negative  # Забути всі невідомі міста
+  ./weather.sh --timings -c Kyiv  # Час фаз (кеш, мережа, розбір, вивід) у stderr
+  ./weather.sh --timings json     # Те саме одним рядком JSON для збирача логів
+  ./weather.sh --warm cities.txt  # Оновлювати кеш міст на 80% TTL, щоб читачі не чекали
+  ./weather.sh --serve &          # Демон з теплим кешем; наступні запуски йдуть через нього
+  ./weather.sh --no-daemon -c Kyiv  # Не звертатися до демона
         """
     )
 
@@ -42,7 +157,46 @@ def main():
     parser.add_argument(
         '--city', '-c',
         type=str,
-        help='Назва міста (якщо не вказано - автовизначення за IP)'
+        action='append',
+        help='Назва міста (якщо не вказано - автовизначення за IP); '
+             'можна вказати кілька разів'
+    )
+
+    parser.add_argument(
+        '--cities-file',
+        metavar='PATH',
+        help='Файл зі списком міст (одне місто на рядок)'
+    )
+
+    parser.add_argument(
+        '--lat',
+        type=latitude,
+        metavar='DEGREES',
+        help='Широта точки (разом з --lon замість назви міста)'
+    )
+
+    parser.add_argument(
+        '--lon',
+        type=longitude,
+        metavar='DEGREES',
+        help='Довгота точки (разом з --lat)'
+    )
+
+    parser.add_argument(
+        '--radius',
+        type=non_negative_float,
+        metavar='KM',
+        help='Для координат брати актуальний кеш найближчої точки в межах '
+             'радіуса (за замовчуванням 3 км; 0 — лише точний збіг). Для '
+             'десятків тисяч точок — --cache-backend sqlite і більший '
+             '--cache-max-entries (за замовчуванням 5000 записів)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        metavar='N',
+        help='Кількість паралельних запитів для кількох міст'
     )
     
     parser.add_argument(
@@ -54,6 +208,37 @@ def main():
         help='Режим автооновлення з інтервалом у секундах (за замовчуванням 300)'
     )
     
+    parser.add_argument(
+        '--jitter',
+        type=jitter_fraction,
+        default=0.1,
+        metavar='FRACTION',
+        help='Випадковий зсув оновлень кількох міст у --watch та --warm як частка '
+             'інтервалу (за замовчуванням 0.1)'
+    )
+
+    parser.add_argument(
+        '--warm',
+        metavar='PATH',
+        help='Підігрівати кеш для міст з файлу (одне на рядок), оновлюючи '
+             'кожен запис до того, як він застаріє'
+    )
+
+    parser.add_argument(
+        '--warm-fraction',
+        type=refresh_fraction,
+        default=0.8,
+        metavar='FRACTION',
+        help='Частка TTL, після якої --warm оновлює запис (за замовчуванням 0.8)'
+    )
+
+    parser.add_argument(
+        '--metrics-port',
+        type=positive_int,
+        metavar='PORT',
+        help='Віддавати метрики Prometheus режиму --watch на 127.0.0.1:PORT/metrics'
+    )
+
     parser.add_argument(
         '--no-cache',
         action='store_true',
@@ -67,6 +252,135 @@ def main():
         help=f'TTL кешу в секундах (за замовчуванням {cache.DEFAULT_TTL})'
     )
     
+    parser.add_argument(
+        '--stale-ttl',
+        type=non_negative_int,
+        default=0,
+        metavar='SECONDS',
+        help='Скільки секунд після TTL показувати застарілі дані, '
+             'оновлюючи кеш у фоні (за замовчуванням 0 — вимкнено)'
+    )
+
+    parser.add_argument(
+        '--negative-ttl',
+        type=non_negative_int,
+        metavar='SECONDS',
+        help='Скільки секунд пам\'ятати, що місто не знайдено '
+             '(за замовчуванням 600; 0 — вимкнено)'
+    )
+
+    parser.add_argument(
+        '--lean',
+        action='store_true',
+        help='Запитувати лише поточну погоду в компактному текстовому форматі '
+             'замість повного j1 з прогнозом'
+    )
+
+    parser.add_argument(
+        '--cache-backend',
+        choices=cache.BACKENDS,
+        help='Сховище кешу: json (один файл) або sqlite (індексована база)'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='Директорія кешу (за замовчуванням .cache у поточній директорії)'
+    )
+
+    parser.add_argument(
+        '--xdg-cache',
+        action='store_true',
+        help='Зберігати кеш у $XDG_CACHE_HOME/weather-app'
+    )
+
+    parser.add_argument(
+        '--cache-migrate',
+        action='store_true',
+        help='Перенести записи з JSON-кешу до SQLite та вийти'
+    )
+
+    parser.add_argument(
+        '--cache-mode',
+        choices=cache.CACHE_MODES,
+        help='Що зберігати в кеші: full (повна відповідь) або compact (лише показані поля)'
+    )
+
+    parser.add_argument(
+        '--cache-max-entries',
+        type=positive_int,
+        metavar='N',
+        help='Максимальна кількість записів у кеші'
+    )
+
+    parser.add_argument(
+        '--cache-max-bytes',
+        type=positive_int,
+        metavar='BYTES',
+        help='Максимальний обсяг записів кешу в байтах'
+    )
+
+    parser.add_argument(
+        '--cache-prune',
+        action='store_true',
+        help='Видалити записи, прострочені довше за вікно --stale-ttl або '
+             'резерву на час недоступності сервісу (за замовчуванням доба), '
+             'витіснити зайві та вийти'
+    )
+
+    parser.add_argument(
+        '--cache-stats',
+        action='store_true',
+        help='Показати статистику кешу та вийти'
+    )
+
+    parser.add_argument(
+        '--cache-negative',
+        action='store_true',
+        help='Показати міста, які сервіс нещодавно не знайшов, та вийти'
+    )
+
+    parser.add_argument(
+        '--cache-purge-negative',
+        nargs='?',
+        const='',
+        metavar='CITY',
+        help='Забути невідоме місто (без CITY — усі) та вийти'
+    )
+
+    parser.add_argument(
+        '--timings',
+        nargs='?',
+        const='text',
+        choices=timings.OUTPUTS,
+        help='Вивести у stderr час кожної фази: кеш, очікування сервера, '
+             'читання та розбір відповіді, вивід (text або json)'
+    )
+
+    parser.add_argument(
+        '--serve',
+        nargs='?',
+        const='',
+        metavar='ADDRESS',
+        help='Запустити локальний демон з теплим кешем і пулом з\'єднань на '
+             'Unix-сокеті або host:port (за замовчуванням $WEATHER_DAEMON '
+             'або сокет у $XDG_RUNTIME_DIR)'
+    )
+
+    parser.add_argument(
+        '--queue-size',
+        type=positive_int,
+        metavar='N',
+        help='Скільки завантажень демон тримає в черзі, перш ніж '
+             'відмовляти (за замовчуванням 64)'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Не звертатися до демона, усе робити в цьому процесі'
+    )
+
     parser.add_argument(
         '--version', '-v',
         action='version',
@@ -76,35 +390,179 @@ def main():
     # Парсимо аргументи
     args = parser.parse_args()
 
+    # Налаштовуємо сховище кешу
+    cache_dir = cache.xdg_cache_dir() if args.xdg_cache else args.cache_dir
+    local_cache = bool(
+        args.cache_backend or cache_dir or args.cache_mode or args.stale_ttl
+        or args.cache_max_entries or args.cache_max_bytes
+        or args.negative_ttl is not None or args.radius is not None
+    )
+    if local_cache:
+        cache.configure(
+            backend=args.cache_backend,
+            cache_dir=cache_dir,
+            max_entries=args.cache_max_entries,
+            max_bytes=args.cache_max_bytes,
+            mode=args.cache_mode,
+            stale_ttl=args.stale_ttl,
+            negative_ttl=args.negative_ttl,
+            geo_radius=args.radius
+        )
+
+    if args.cache_migrate:
+        migrated = cache.migrate_json_to_sqlite()
+        print(f"📦 Перенесено записів до SQLite: {migrated}")
+        return
+
+    if args.cache_prune:
+        removed = cache.prune_cache()
+        print(f"🧹 Видалено записів з кешу: {removed}")
+        return
+
+    if args.cache_stats:
+        print(cli.format_cache_stats(cache.cache_stats()))
+        return
+
+    if args.cache_negative:
+        print(cli.format_negative_entries(cache.list_negative()))
+        return
+
+    if args.cache_purge_negative is not None:
+        removed = cache.purge_negative(args.cache_purge_negative or None)
+        print(f"🧹 Видалено невідомих міст з кешу: {removed}")
+        return
+
+    if args.serve is not None:
+        cli.serve_mode(args.serve or None, max_workers=args.workers, queue_size=args.queue_size)
+        return
+
+    if args.warm:
+        if args.no_cache:
+            parser.error("--warm не працює з --no-cache")
+        try:
+            warm_cities = read_cities_file(args.warm)
+        except OSError as e:
+            parser.error(f"не вдалося прочитати {args.warm}: {e}")
+        if not warm_cities:
+            parser.error(f"у {args.warm} немає жодного міста")
+        cli.warm_mode(
+            warm_cities,
+            ttl=args.ttl,
+            fraction=args.warm_fraction,
+            jitter=args.jitter,
+            max_workers=args.workers,
+            lean=args.lean
+        )
+        return
+
+    if args.timings:
+        timings.enable(args.timings)
+
     # Визначаємо режим роботи
     use_cache = not args.no_cache
+    # Демон має власний кеш; з локальними налаштуваннями кешу чи --timings
+    # запит виконується в цьому процесі
+    use_daemon = not (args.no_daemon or args.timings or local_cache)
+
+    # Збираємо міста з аргументів та файлу
+    cities = list(args.city or [])
+    if args.cities_file:
+        try:
+            cities.extend(read_cities_file(args.cities_file))
+        except OSError as e:
+            parser.error(f"не вдалося прочитати {args.cities_file}: {e}")
+    if (args.lat is None) != (args.lon is None):
+        parser.error("--lat і --lon задаються разом")
+    if args.lat is not None:
+        cities.append(geo.format_coordinates(args.lat, args.lon))
+
+    if len(cities) > 1 and args.watch is not None:
+        # Усі міста в одному процесі з власними інтервалами
+        try:
+            watch_cities = [parse_watch_city(spec, args.watch) for spec in cities]
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"неправильний інтервал міста: {e}")
+        cli.watch_many(
+            watch_cities,
+            use_cache=use_cache,
+            ttl=args.ttl,
+            lean=args.lean,
+            max_workers=args.workers,
+            jitter=args.jitter,
+            metrics_port=args.metrics_port
+        )
+        return
+
+    if len(cities) > 1:
+        success = fetch_from_daemon(cities, use_cache, args.ttl, args.lean) if use_daemon else None
+        if success is not None:
+            if not success:
+                sys.exit(1)
+            return
+        try:
+            with timings.phase("total"):
+                success = cli.fetch_and_display_many(
+                    cities,
+                    use_cache=use_cache,
+                    ttl=args.ttl,
+                    max_workers=args.workers,
+                    lean=args.lean
+                )
+        finally:
+            cli.report_timings()
+        if not success:
+            sys.exit(1)
+        return
+
+    if args.metrics_port is not None and args.watch is None:
+        parser.error("--metrics-port працює лише з --watch")
+
+    city = cities[0] if cities else None
 
     # Якщо вказано режим watch
     if args.watch is not None:
         # В режимі watch, якщо місто не вказано - запитуємо у користувача
-        city = args.city
+        interval = args.watch
         if city is None:
             city = cli.get_user_choice()
+        else:
+            try:
+                city, interval = parse_watch_city(city, args.watch)
+            except argparse.ArgumentTypeError as e:
+                parser.error(f"неправильний інтервал міста: {e}")
         
         cli.watch_mode(
             city=city,
-            interval=args.watch,
+            interval=interval,
             use_cache=use_cache,
-            ttl=args.ttl
+            ttl=args.ttl,
+            stale_ttl=args.stale_ttl,
+            lean=args.lean,
+            metrics_port=args.metrics_port
         )
     else:
         # Звичайний режим - одноразовий вивід
-        city = args.city
-
         # Якщо місто не вказано - пропонуємо вибір
         if city is None:
             city = cli.get_user_choice()
-        
-        success = cli.fetch_and_display_weather(
-            city=city,
-            use_cache=use_cache,
-            ttl=args.ttl
-        )
+
+        success = fetch_from_daemon([city], use_cache, args.ttl, args.lean) if use_daemon else None
+        if success is not None:
+            if not success:
+                sys.exit(1)
+            return
+
+        try:
+            with timings.phase("total"):
+                success = cli.fetch_and_display_weather(
+                    city=city,
+                    use_cache=use_cache,
+                    ttl=args.ttl,
+                    stale_ttl=args.stale_ttl,
+                    lean=args.lean
+                )
+        finally:
+            cli.report_timings()
         
         if not success:
             sys.exit(1)
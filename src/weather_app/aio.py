@@ -0,0 +1,266 @@
+"""
+Асинхронний клієнт wttr.in на asyncio без додаткових залежностей
+"""
+
+import asyncio
+import json
+import ssl
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from . import api, cache
+from .api import CircuitOpenError, CityNotFoundError, NetworkError, InvalidResponseError, WeatherResult
+from .breaker import CircuitBreaker
+
+
+DEFAULT_DEADLINE = api.DEFAULT_CONNECT_TIMEOUT + api.DEFAULT_READ_TIMEOUT
+DEFAULT_MAX_CONCURRENCY = 32
+MAX_HEADER_LINES = 100
+USER_AGENT = "weather-app/1.0 (asyncio)"
+
+
+class _ProtocolError(Exception):
+    """Відповідь сервера не є коректним HTTP/1.1"""
+    pass
+
+
+def _build_request(url: str) -> Tuple[str, int, bool, bytes]:
+    """
+    Готує адресу з'єднання та байти GET-запиту
+
+    Returns:
+        (хост, порт, чи потрібен TLS, байти запиту)
+    """
+    parts = urlsplit(url)
+    use_tls = parts.scheme == "https"
+    host = parts.hostname or ""
+    port = parts.port or (443 if use_tls else 80)
+
+    # Кодуємо шлях так само, як це робить requests (пробіли тощо)
+    target = quote(parts.path or "/", safe="/%:@,+~!$&'()*;=")
+    if parts.query:
+        target += "?" + parts.query
+
+    host_header = parts.netloc.rsplit("@", 1)[-1]
+    request = (
+        f"GET {target} HTTP/1.1\r\n"
+        f"Host: {host_header}\r\n"
+        f"User-Agent: {USER_AGENT}\r\n"
+        "Accept: application/json\r\n"
+        "Accept-Encoding: identity\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode("ascii")
+    return host, port, use_tls, request
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    """Читає тіло відповіді з урахуванням chunked та Content-Length"""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise _ProtocolError("некоректний розмір chunk")
+            if size == 0:
+                # Пропускаємо trailer до порожнього рядка
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return b"".join(chunks)
+
+    length = headers.get("content-length")
+    if length is not None:
+        try:
+            return await reader.readexactly(int(length))
+        except ValueError:
+            raise _ProtocolError("некоректний Content-Length")
+
+    return await reader.read()
+
+
+async def _http_get(url: str, ssl_context: Optional[ssl.SSLContext]) -> Tuple[int, bytes]:
+    """
+    Виконує один GET-запит
+
+    Returns:
+        (HTTP статус, тіло відповіді)
+    """
+    host, port, use_tls, request = _build_request(url)
+    if use_tls and ssl_context is None:
+        ssl_context = ssl.create_default_context()
+
+    reader, writer = await asyncio.open_connection(
+        host, port, ssl=ssl_context if use_tls else None
+    )
+    try:
+        writer.write(request)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        fields = status_line.split(None, 2)
+        if len(fields) < 2 or not fields[0].startswith(b"HTTP/"):
+            raise _ProtocolError("некоректний рядок статусу")
+        try:
+            status_code = int(fields[1])
+        except ValueError:
+            raise _ProtocolError("некоректний код статусу")
+
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _ProtocolError("забагато заголовків")
+
+        body = await _read_body(reader, headers)
+        return status_code, body
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def aget_weather(
+    city: Optional[str] = None,
+    base_url: str = api.DEFAULT_BASE_URL,
+    deadline: float = DEFAULT_DEADLINE,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> Dict:
+    """
+    Асинхронно отримує дані про погоду для міста або за IP
+
+    Класифікація помилок та валідація такі самі, як у api.get_weather.
+    Скасування корутини закриває з'єднання та пробрасує CancelledError.
+
+    Args:
+        city: Назва міста. Якщо None — автовизначення за IP
+        base_url: Базова адреса сервісу
+        deadline: Загальний час на запит у секундах
+        ssl_context: Власний SSL-контекст для https
+        breaker: Запобіжник, як у WeatherClient (None — без запобіжника)
+
+    Returns:
+        Словник з даними про погоду
+
+    Raises:
+        NetworkError: При проблемах з мережею або перевищенні deadline
+        CircuitOpenError: Якщо запобіжник відкритий (запит не виконувався)
+        CityNotFoundError: Якщо місто не знайдено
+        InvalidResponseError: При некоректній відповіді від сервера
+    """
+    if breaker is None:
+        return await _request(city, base_url, deadline, ssl_context)
+
+    if not breaker.allow_request():
+        raise CircuitOpenError("Сервіс тимчасово недоступний (запобіжник відкритий)")
+    try:
+        data = await _request(city, base_url, deadline, ssl_context)
+    except NetworkError:
+        breaker.record_failure()
+        raise
+    except CityNotFoundError:
+        # Сервер відповів — він працює
+        breaker.record_success()
+        raise
+    breaker.record_success()
+    return data
+
+
+async def _request(
+    city: Optional[str],
+    base_url: str,
+    deadline: float,
+    ssl_context: Optional[ssl.SSLContext],
+) -> Dict:
+    """Виконує HTTP-запит та класифікує відповідь"""
+    url = api.build_url(city, base_url.rstrip("/"))
+
+    try:
+        status_code, body = await asyncio.wait_for(
+            _http_get(url, ssl_context), timeout=deadline
+        )
+    except asyncio.TimeoutError:
+        raise NetworkError("Таймаут при з'єднанні з сервером")
+    except (OSError, asyncio.IncompleteReadError):
+        raise NetworkError("Помилка з'єднання з сервером")
+    except (_ProtocolError, ValueError) as e:
+        raise NetworkError(f"Проблеми з мережею: {str(e)}")
+
+    # Перевіряємо статус
+    api.check_status(status_code, city)
+
+    # Парсимо JSON
+    try:
+        data = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise InvalidResponseError("Некоректна відповідь сервера (не JSON)")
+
+    return api.check_payload(data, city)
+
+
+async def aget_weather_many(
+    cities: Iterable[Optional[str]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    use_cache: bool = True,
+    ttl: int = cache.DEFAULT_TTL,
+    base_url: str = api.DEFAULT_BASE_URL,
+    deadline: float = DEFAULT_DEADLINE,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> List[WeatherResult]:
+    """
+    Асинхронно отримує погоду для багатьох міст
+
+    Поводиться як api.get_weather_many: дедуплікація за ключем кешу,
+    спершу попадання в кеш, помилки повертаються в результатах, а
+    запити йдуть через запобіжник зі спільним для всіх процесів станом.
+    Кількість одночасних запитів обмежена семафором.
+
+    Args:
+        cities: Назви міст (None — автовизначення за IP)
+        max_concurrency: Максимальна кількість одночасних запитів
+        use_cache: Чи використовувати кеш
+        ttl: TTL кешу в секундах
+        base_url: Базова адреса сервісу
+        deadline: Час на кожен окремий запит у секундах
+        ssl_context: Власний SSL-контекст для https
+        breaker: Запобіжник (за замовчуванням новий CircuitBreaker, що
+            читає спільний стан поруч із кешем)
+
+    Returns:
+        Список результатів у порядку вхідних міст
+    """
+    cities = list(cities)
+    results, misses = api.partition_cached(cities, use_cache, ttl)
+    if breaker is None:
+        breaker = CircuitBreaker()
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch_one(city: Optional[str]) -> WeatherResult:
+        async with semaphore:
+            try:
+                data = await aget_weather(city, base_url, deadline, ssl_context, breaker)
+            except Exception as e:
+                return WeatherResult(city, error=e)
+        return WeatherResult(city, data)
+
+    fetched = await asyncio.gather(*(fetch_one(city) for city in misses.values()))
+
+    for key, result in zip(misses, fetched):
+        if use_cache:
+            api.cache_result(result, ttl)
+        results[key] = result
+
+    return [results[cache.get_cache_key(city)] for city in cities]
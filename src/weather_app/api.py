@@ -2,9 +2,38 @@
 API клієнт для роботи з wttr.in
 """
 
-import requests
-from typing import Dict, Optional
 import json
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+from . import cache, geo, jsonstream, locking, metrics, timings
+from .breaker import CircuitBreaker
+from .models import ValidationError, WeatherInfo, parse_weather
+
+if TYPE_CHECKING:
+    import requests
+
+
+DEFAULT_BASE_URL = os.environ.get("WEATHER_API_URL", "https://wttr.in")
+DEFAULT_CONNECT_TIMEOUT = 3.05  # секунди на встановлення з'єднання
+DEFAULT_READ_TIMEOUT = 10  # секунди на очікування відповіді
+DEFAULT_POOL_CONNECTIONS = 4  # кількість пулів (хостів)
+DEFAULT_POOL_MAXSIZE = 16  # з'єднань у пулі на хост
+DEFAULT_MAX_WORKERS = 8  # паралельних запитів у get_weather_many
+# Потоковий розбір j1 лише поточної погоди (WEATHER_PARTIAL_PARSE=1)
+DEFAULT_PARTIAL_PARSE = os.environ.get("WEATHER_PARTIAL_PARSE", "") == "1"
+STREAM_CHUNK_SIZE = 8192  # байт на шматок при потоковому читанні
+
+# Компактний формат wttr.in: лише поля, які показує CLI, замість повного j1
+# (температура|відчувається|опис|вологість|вітер|тиск|місце)
+LEAN_FORMAT = "%t|%f|%C|%h|%w|%P|%l"
+LEAN_FIELDS = 7
+
+_NUMBER_RE = re.compile(r"[-+]?\d+")
 
 
 class NetworkError(Exception):
@@ -12,6 +41,11 @@ class NetworkError(Exception):
     pass
 
 
+class CircuitOpenError(NetworkError):
+    """Запобіжник відкритий — запит до сервера не виконувався"""
+    pass
+
+
 class CityNotFoundError(Exception):
     """Місто не знайдено або не розпізнано"""
     pass
@@ -22,69 +56,711 @@ class InvalidResponseError(Exception):
     pass
 
 
+def error_class(error: Exception) -> str:
+    """Клас помилки для метрик і відповідей демона: один з винятків модуля або ім'я типу"""
+    for cls in (CityNotFoundError, NetworkError, InvalidResponseError):
+        if isinstance(error, cls):
+            return cls.__name__
+    return type(error).__name__
+
 
-def get_weather(city: Optional[str] = None) -> Dict:
+def build_url(city: Optional[str], base_url: str = DEFAULT_BASE_URL, lean: bool = False) -> str:
     """
-    Отримує дані про погоду для вказаного міста або за IP
+    Формує URL запиту до wttr.in
 
     Args:
         city: Назва міста. Якщо None — автовизначення за IP
+        base_url: Базова адреса сервісу
+        lean: Запитати компактний формат LEAN_FORMAT (метричні одиниці)
+            замість повного j1
+
+    Returns:
+        Повний URL запиту
+    """
+    if lean:
+        query = f"format={quote(LEAN_FORMAT, safe='')}&m"
+    else:
+        query = "format=j1"
+    if city:
+        return f"{base_url}/{city}?{query}"
+    return f"{base_url}/?{query}"
+
+
+def check_status(status_code: int, city: Optional[str]):
+    """
+    Класифікує HTTP статус відповіді
+
+    Raises:
+        CityNotFoundError: Для коду 404
+        NetworkError: Для інших кодів, крім 200
+    """
+    if status_code != 200:
+        if status_code == 404:
+            raise CityNotFoundError(f"Місто '{city}' не розпізнано")
+        raise NetworkError(f"HTTP код відповіді: {status_code}")
+
+
+def check_payload(data: Dict, city: Optional[str]) -> Dict:
+    """
+    Перевіряє розпарсену відповідь API
+
+    Raises:
+        CityNotFoundError: Якщо місто не розпізнано
+        InvalidResponseError: Якщо відсутні обов'язкові поля
+    """
+    # Спочатку перевіряємо, чи є nearest_area і чи місто розпізнано
+    nearest_area = data.get("nearest_area") if isinstance(data, dict) else None
+    if not nearest_area or (
+        isinstance(nearest_area, list) and len(nearest_area) == 0
+    ):
+        raise CityNotFoundError(f"Місто '{city}' не розпізнано")
+
+    # Валідуємо обов'язкові поля
+    try:
+        parse_weather(data)
+    except ValidationError as e:
+        raise InvalidResponseError(f"Відсутні обов'язкові поля у відповіді ({e.field})")
+
+    return data
+
+
+def _lean_int(value: str) -> int:
+    """Витягує ціле число з поля на кшталт +25°C або ↗10km/h"""
+    match = _NUMBER_RE.search(value)
+    return int(match.group()) if match else 0
+
+
+def parse_lean_response(text: str, city: Optional[str]) -> WeatherInfo:
+    """
+    Розбирає відповідь у форматі LEAN_FORMAT
+
+    Приклад відповіді: "+25°C|+28°C|Sunny|60%|↗10km/h|1013hPa|Kyiv, Ukraine".
+    Для запиту за координатами місце приходить як "50.45,30.52" і
+    зберігається як назва без країни.
+
+    Args:
+        text: Тіло відповіді
+        city: Назва міста (для повідомлень про помилки)
+
+    Returns:
+        WeatherInfo з тими самими полями, що й extract_weather_info
+
+    Raises:
+        CityNotFoundError: Якщо місто не розпізнано
+        InvalidResponseError: Якщо відповідь має інший формат
+    """
+    # Місце (%l) — останнє поле, і лише воно може містити будь-які символи
+    fields = [field.strip() for field in text.strip().split("|", LEAN_FIELDS - 1)]
+    if len(fields) != LEAN_FIELDS:
+        if "unknown location" in text.lower():
+            raise CityNotFoundError(f"Місто '{city}' не розпізнано")
+        raise InvalidResponseError("Некоректна відповідь сервера (очікувався компактний формат)")
+
+    temperature, feels_like, description, humidity, wind, pressure, location = fields
+    if not description or not location:
+        raise InvalidResponseError("Відсутні обов'язкові поля у відповіді")
+
+    if geo.parse_coordinates(location) is not None:
+        name, country = location, ""
+    else:
+        # Місце приходить як "Місто" або "Місто, Країна"
+        name, _, country = location.partition(",")
+    return WeatherInfo(
+        city=name.strip(),
+        country=country.strip(),
+        temperature=_lean_int(temperature),
+        feels_like=_lean_int(feels_like),
+        description=description,
+        humidity=_lean_int(humidity),
+        wind_speed=_lean_int(wind),
+        pressure=_lean_int(pressure),
+    )
+
+
+class WeatherClient:
+    """
+    Клієнт wttr.in з власною HTTP-сесією
+
+    Сесія тримає пул keep-alive з'єднань, тож повторні запити не
+    проходять TCP+TLS рукостискання заново. Екземпляр можна
+    використовувати з кількох потоків одночасно.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        cache=None,
+        ttl: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        session: Optional["requests.Session"] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        partial: bool = DEFAULT_PARTIAL_PARSE,
+    ):
+        """
+        Args:
+            base_url: Базова адреса сервісу
+            connect_timeout: Таймаут встановлення з'єднання в секундах
+            read_timeout: Таймаут читання відповіді в секундах
+            pool_connections: Кількість пулів з'єднань (по одному на хост)
+            pool_maxsize: Максимум з'єднань у пулі одного хоста
+            cache: Об'єкт з lookup_cache/set_to_cache (наприклад,
+                модуль cache) або None, щоб не кешувати
+            ttl: TTL кешу в секундах (None — значення кешу за замовчуванням)
+            clock: Джерело поточного часу для перевірки TTL
+            session: Готова сесія requests замість створення нової
+            breaker: Запобіжник, що відхиляє запити до деградованого
+                сервера (None — без запобіжника)
+            partial: Читати j1 потоково і розбирати лише current_condition
+                та nearest_area. Результат fetch тоді не містить прогнозу
+                (weather), але сам прогноз не читається в пам'ять
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.ttl = ttl
+        self.clock = clock
+        self.breaker = breaker
+        self.partial = partial
+
+        if session is None:
+            # HTTP-стек імпортуємо лише тоді, коли справді потрібна мережа:
+            # на шляху влучання в кеш він займає більшу частину запуску
+            with timings.phase("http.setup"):
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+        self.session = session
+
+    def fetch(self, city: Optional[str] = None) -> Dict:
+        """
+        Завантажує дані з API без звернення до кешу
+
+        Args:
+            city: Назва міста. Якщо None — автовизначення за IP
+
+        Returns:
+            Словник з даними про погоду
+
+        Raises:
+            CircuitOpenError: Якщо запобіжник відкритий
+            NetworkError: При проблемах з мережею
+            CityNotFoundError: Якщо місто не знайдено
+            InvalidResponseError: При некоректній відповіді від сервера
+        """
+        return self._fetch(city, lean=False)
+
+    def fetch_lean(self, city: Optional[str] = None) -> WeatherInfo:
+        """
+        Завантажує лише поточну погоду в компактному форматі LEAN_FORMAT
+
+        Відповідь у кілька десятків байт замість повного j1 з прогнозом
+        на три дні; підходить, коли прогноз не потрібен.
+
+        Args:
+            city: Назва міста. Якщо None — автовизначення за IP
+
+        Returns:
+            WeatherInfo з поточною погодою
+
+        Raises:
+            Ті самі винятки, що й fetch
+        """
+        return self._fetch(city, lean=True)
+
+    def _fetch(self, city: Optional[str], lean: bool):
+        """Виконує запит через запобіжник, якщо він є"""
+        if self.breaker is None:
+            return self._request(city, lean)
+
+        with timings.phase("breaker"):
+            allowed = self.breaker.allow_request()
+        if not allowed:
+            raise CircuitOpenError("Сервіс тимчасово недоступний (запобіжник відкритий)")
+        try:
+            data = self._request(city, lean)
+        except NetworkError:
+            with timings.phase("breaker"):
+                self.breaker.record_failure()
+            raise
+        except CityNotFoundError:
+            # Сервер відповів — він працює
+            with timings.phase("breaker"):
+                self.breaker.record_success()
+            raise
+        with timings.phase("breaker"):
+            self.breaker.record_success()
+        return data
+
+    def _request(self, city: Optional[str], lean: bool = False):
+        """Виконує HTTP-запит та класифікує відповідь"""
+        import requests
+
+        url = build_url(city, self.base_url, lean=lean)
+
+        try:
+            if self.partial and not lean:
+                # Тіло читається шматками, прогноз не розбирається
+                with timings.phase("http.wait"):
+                    response = self.session.get(url, timeout=self.timeout, stream=True)
+                with response:
+                    check_status(response.status_code, city)
+                    with timings.phase("http.stream"):
+                        data = self._read_partial(response)
+                with timings.phase("parse.validate"):
+                    return check_payload(data, city)
+
+            # Робимо запит через спільну сесію
+            started = time.perf_counter()
+            response = self.session.get(url, timeout=self.timeout)
+            metrics.RECEIVED_BYTES.inc(len(response.content))
+            if timings.is_enabled():
+                # elapsed — час до заголовків; решта get — читання тіла
+                waited = response.elapsed.total_seconds()
+                timings.record("http.wait", waited)
+                timings.record("http.body", max(0.0, time.perf_counter() - started - waited))
+
+            # Перевіряємо статус
+            check_status(response.status_code, city)
+
+            if lean:
+                with timings.phase("parse.validate"):
+                    return parse_lean_response(response.text, city)
+
+            # Парсимо JSON
+            with timings.phase("parse.json"):
+                data = response.json()
+
+            with timings.phase("parse.validate"):
+                return check_payload(data, city)
+
+        except json.JSONDecodeError:
+            # Перед RequestException: requests.JSONDecodeError успадковує обидва
+            raise InvalidResponseError("Некоректна відповідь сервера (не JSON)")
+        except requests.exceptions.Timeout:
+            raise NetworkError("Таймаут при з'єднанні з сервером")
+        except requests.exceptions.ConnectionError:
+            raise NetworkError("Помилка з'єднання з сервером")
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Проблеми з мережею: {str(e)}")
+
+    @staticmethod
+    def _read_partial(response) -> Dict:
+        """Розбирає з потокової відповіді лише jsonstream.J1_FIELDS"""
+        received = 0
+
+        def chunks():
+            nonlocal received
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+
+        body = chunks()
+        try:
+            data = jsonstream.extract_fields(body, jsonstream.J1_FIELDS)
+            # Решту тіла дочитуємо без розбору, щоб з'єднання повернулося в пул
+            for _ in body:
+                pass
+        finally:
+            metrics.RECEIVED_BYTES.inc(received)
+        return data
+
+    def get_weather(self, city: Optional[str] = None) -> Dict:
+        """
+        Отримує дані про погоду, використовуючи кеш клієнта, якщо він є
+
+        Args:
+            city: Назва міста. Якщо None — автовизначення за IP
+
+        Returns:
+            Словник з даними про погоду
+        """
+        if self.cache is None:
+            return self.fetch(city)
+
+        ttl = self.ttl if self.ttl is not None else self.cache.DEFAULT_TTL
+        hit = self.cache.lookup_cache(city, ttl, now=self.clock())
+        if hit is not None:
+            # Компактний запис не містить повних даних — відтворюємо їх
+            return hit.data if hit.data is not None else hit.info().to_data()
+
+        data = self.fetch(city)
+        self.cache.set_to_cache(city, data, now=self.clock(), ttl=ttl)
+        return data
+
+    def close(self):
+        """Закриває сесію та всі з'єднання пулу"""
+        self.session.close()
+
+
+_default_client: Optional[WeatherClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> WeatherClient:
+    """
+    Повертає спільний клієнт, створюючи його при першому виклику
+
+    Returns:
+        Екземпляр WeatherClient без кешу, але із запобіжником, стан
+        якого спільний для всіх процесів з тим самим кешем
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = WeatherClient(breaker=CircuitBreaker())
+    return _default_client
+
+
+def set_default_client(client: Optional[WeatherClient]) -> Optional[WeatherClient]:
+    """
+    Замінює спільний клієнт (наприклад, на клієнт локального сервера)
+
+    Args:
+        client: Новий клієнт або None, щоб наступний виклик створив типовий
+
+    Returns:
+        Попередній спільний клієнт
+    """
+    global _default_client
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+    return previous
+
+
+def location(
+    city: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None
+) -> Optional[str]:
+    """
+    Формує місце запиту: назву міста або координати "lat,lon"
+
+    Рядок координат можна передавати як city будь-якій функції модуля;
+    кеш тоді повертає запис найближчої точки в межах
+    cache.GEO_RADIUS_KM.
+
+    Args:
+        city: Назва міста. Якщо None — автовизначення за IP
+        lat: Широта (разом з lon замість city)
+        lon: Довгота
+
+    Returns:
+        Місце запиту або None для автовизначення
+
+    Raises:
+        ValueError: Якщо задано лише одну координату, координати разом
+            з city або координати поза допустимими межами
+    """
+    if lat is None and lon is None:
+        return city
+    if lat is None or lon is None:
+        raise ValueError("Широта й довгота задаються разом")
+    if city is not None:
+        raise ValueError("Потрібне або місто, або координати")
+    return geo.format_coordinates(lat, lon)
+
+
+def get_weather(
+    city: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None
+) -> Dict:
+    """
+    Отримує дані про погоду для вказаного міста, координат або за IP
+
+    Args:
+        city: Назва міста. Якщо None — автовизначення за IP
+        lat: Широта (разом з lon замість city)
+        lon: Довгота
 
     Returns:
         Словник з даними про погоду
 
     Raises:
+        ValueError: Для некоректних координат (див. location)
         NetworkError: При проблемах з мережею
         CityNotFoundError: Якщо місто не знайдено
         InvalidResponseError: При некоректній відповіді від сервера
     """
-    # Формуємо URL
-    if city:
-        url = f"https://wttr.in/{city}?format=j1"
-    else:
-        url = "https://wttr.in/?format=j1"
-    
+    return get_default_client().fetch(location(city, lat, lon))
+
+
+def get_weather_lean(
+    city: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None
+) -> WeatherInfo:
+    """
+    Отримує лише поточну погоду в компактному форматі (без прогнозу)
+
+    Args:
+        city: Назва міста. Якщо None — автовизначення за IP
+        lat: Широта (разом з lon замість city)
+        lon: Довгота
+
+    Returns:
+        WeatherInfo з поточною погодою
+
+    Raises:
+        Ті самі винятки, що й get_weather
+    """
+    return get_default_client().fetch_lean(location(city, lat, lon))
+
+
+class WeatherResult:
+    """Результат отримання погоди для одного міста у пакетному запиті"""
+
+    __slots__ = ("city", "data", "error", "from_cache", "info")
+
+    def __init__(
+        self,
+        city: Optional[str],
+        data: Optional[Dict] = None,
+        error: Optional[Exception] = None,
+        from_cache: bool = False,
+        info: Optional[WeatherInfo] = None,
+    ):
+        self.city = city
+        self.data = data
+        self.error = error
+        self.from_cache = from_cache
+        self.info = info
+
+    def weather_info(self) -> WeatherInfo:
+        """
+        Повертає запис для відображення: з компактного кешу або
+        витягнутий з повних даних
+
+        Raises:
+            ValidationError: Якщо повні дані мають некоректну структуру
+        """
+        if self.info is None:
+            self.info = WeatherInfo.from_data(self.data)
+        return self.info
+
+    @property
+    def ok(self) -> bool:
+        """True, якщо дані отримано без помилки"""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else type(self.error).__name__
+        return f"WeatherResult({self.city!r}, {status})"
+
+
+def result_from_cache(city: Optional[str], ttl: int) -> Optional[WeatherResult]:
+    """
+    Формує результат з актуального запису кешу
+
+    Returns:
+        WeatherResult з повними даними або компактним записом, з
+        CityNotFoundError для негативного запису, або None
+    """
+    entry = cache.get_entry_from_cache(city, ttl)
+    if entry is None:
+        message = cache.get_negative(city)
+        if message is None:
+            return None
+        return WeatherResult(city, error=CityNotFoundError(message), from_cache=True)
+    if "info" in entry:
+        info = WeatherInfo.from_dict(entry["info"])
+        return WeatherResult(city, from_cache=True, info=info)
+    return WeatherResult(city, entry["data"], from_cache=True)
+
+
+def partition_cached(
+    cities: List[Optional[str]],
+    use_cache: bool,
+    ttl: int
+):
+    """
+    Дедуплікує міста за ключем кешу та відокремлює попадання в кеш
+
+    Returns:
+        (ключ → результат з кешу, ключ → місто для завантаження)
+    """
+    results: Dict[str, WeatherResult] = {}
+    misses: Dict[str, Optional[str]] = {}
+    for city in cities:
+        key = cache.get_cache_key(city)
+        if key in results or key in misses:
+            continue
+        result = result_from_cache(city, ttl) if use_cache else None
+        if result is not None:
+            results[key] = result
+        else:
+            misses[key] = city
+    return results, misses
+
+
+def fetch_result(
+    city: Optional[str],
+    lean: bool = False,
+    client: Optional[WeatherClient] = None,
+) -> WeatherResult:
+    """
+    Завантажує дані з мережі у повному (j1) або компактному форматі
+
+    Args:
+        city: Назва міста або None для автовизначення
+        lean: Завантажити лише поточну погоду (LEAN_FORMAT)
+        client: Клієнт для запиту (за замовчуванням get_weather/get_weather_lean)
+
+    Returns:
+        WeatherResult з повними даними або лише з WeatherInfo
+    """
+    if lean:
+        fetch = client.fetch_lean if client is not None else get_weather_lean
+        return WeatherResult(city, info=fetch(city))
+    fetch = client.fetch if client is not None else get_weather
+    return WeatherResult(city, fetch(city))
+
+
+def cache_result(result: WeatherResult, ttl: int = cache.DEFAULT_TTL):
+    """
+    Записує завантажений результат у кеш (компактний — як WeatherInfo)
+
+    Невідоме місто записується як негативний запис з власним TTL,
+    інші помилки не кешуються.
+    """
+    if isinstance(result.error, CityNotFoundError):
+        cache.set_negative(result.city, str(result.error))
+    elif result.ok:
+        cache.set_to_cache(result.city, result.data, ttl=ttl, info=result.info)
+
+
+def _fetch_and_cache(
+    city: Optional[str],
+    ttl: int,
+    lean: bool,
+    client: Optional[WeatherClient]
+) -> WeatherResult:
     try:
-        # Робимо запит
-        response = requests.get(url, timeout=10)
-
-        # Перевіряємо статус
-        if response.status_code != 200:
-            if response.status_code == 404:
-                raise CityNotFoundError(f"Місто '{city}' не розпізнано")
-            else:
-                raise NetworkError(f"HTTP код відповіді: {response.status_code}")
-
-        # Парсимо JSON
-        data = response.json()
-
-        # Спочатку перевіряємо, чи є nearest_area і чи місто розпізнано
-        nearest_area = data.get("nearest_area")
-        if not nearest_area or (
-            isinstance(nearest_area, list) and len(nearest_area) == 0
-        ):
-            raise CityNotFoundError(f"Місто '{city}' не розпізнано")
+        result = fetch_result(city, lean, client)
+    except CityNotFoundError as e:
+        cache_result(WeatherResult(city, error=e), ttl)
+        raise
+    cache_result(result, ttl)
+    return result
 
-        # Валідуємо обов'язкові поля
-        if not validate_weather_data(data):
-            raise InvalidResponseError("Відсутні обов'язкові поля у відповіді")
-            
-        return data
-        
-    except requests.exceptions.Timeout:
-        raise NetworkError("Таймаут при з'єднанні з сервером")
-    except requests.exceptions.ConnectionError:
-        raise NetworkError("Помилка з'єднання з сервером")
-    except requests.exceptions.RequestException as e:
-        raise NetworkError(f"Проблеми з мережею: {str(e)}")
-    except json.JSONDecodeError:
-        raise InvalidResponseError("Некоректна відповідь сервера (не JSON)")
+
+def fetch_single_flight(
+    city: Optional[str],
+    ttl: int = cache.DEFAULT_TTL,
+    lock_timeout: Optional[float] = locking.DEFAULT_LOCK_TIMEOUT,
+    client: Optional[WeatherClient] = None,
+    lean: bool = False,
+) -> WeatherResult:
+    """
+    Завантажує дані для міста, якого немає в кеші, не більше одного
+    разу на всі процеси
+
+    Процес, що отримав блокування ключа, завантажує дані та пише їх
+    у кеш. Решта чекають на блокування і читають щойно записаний запис.
+    Якщо дочекатися не вдалося, дані завантажуються без блокування.
+
+    Args:
+        city: Назва міста або None для автовизначення
+        ttl: TTL кешу в секундах
+        lock_timeout: Скільки секунд чекати на чужий запит
+        client: Клієнт для запиту (за замовчуванням get_weather)
+        lean: Завантажувати лише поточну погоду (LEAN_FORMAT)
+
+    Returns:
+        WeatherResult з даними з мережі або з кешу
+
+    Raises:
+        NetworkError, CityNotFoundError, InvalidResponseError: Як get_weather
+    """
+    try:
+        with locking.key_lock(cache.get_cache_key(city), timeout=lock_timeout):
+            # Поки ми чекали, запис міг оновити інший процес
+            result = result_from_cache(city, ttl)
+            if result is not None and not result.ok:
+                raise result.error
+            if result is not None:
+                return result
+            return _fetch_and_cache(city, ttl, lean, client)
+    except locking.LockTimeout:
+        return _fetch_and_cache(city, ttl, lean, client)
+
+
+def get_weather_many(
+    cities: Iterable[Optional[str]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    use_cache: bool = True,
+    ttl: int = cache.DEFAULT_TTL,
+    client: Optional[WeatherClient] = None,
+    lean: bool = False,
+) -> List[WeatherResult]:
+    """
+    Отримує погоду для багатьох міст паралельно
+
+    Міста дедуплікуються за ключем кешу, спершу віддаються актуальні
+    записи з кешу, а з мережі паралельно завантажуються лише промахи.
+    Помилка одного міста не зупиняє решту — вона повертається у його
+    результаті.
+
+    Args:
+        cities: Назви міст (None — автовизначення за IP)
+        max_workers: Максимальна кількість одночасних запитів
+        use_cache: Чи використовувати кеш
+        ttl: TTL кешу в секундах
+        client: Клієнт для запитів (за замовчуванням спільний)
+        lean: Завантажувати лише поточну погоду (LEAN_FORMAT)
+
+    Returns:
+        Список результатів у порядку вхідних міст
+    """
+    if client is None:
+        client = get_default_client()
+
+    cities = list(cities)
+    results, misses = partition_cached(cities, use_cache, ttl)
+
+    # Завантажуємо промахи паралельно
+    if misses:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = max(1, min(max_workers, len(misses)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(fetch_result, city, lean, client)
+                for key, city in misses.items()
+            }
+            for key, future in futures.items():
+                city = misses[key]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = WeatherResult(city, error=e)
+                # Пишемо в кеш з одного потоку, щоб уникнути гонок
+                if use_cache:
+                    cache_result(result, ttl)
+                results[key] = result
+
+    return [results[cache.get_cache_key(city)] for city in cities]
 
 
 def validate_weather_data(data: Dict) -> bool:
     """
     Перевіряє наявність обов'язкових полів у відповіді API
 
+    Тонка обгортка над parse_weather; щоб дізнатися, яке саме поле
+    не пройшло перевірку, викликайте parse_weather напряму.
+
     Args:
         data: Дані від API
 
@@ -92,56 +768,10 @@ def validate_weather_data(data: Dict) -> bool:
         True якщо всі обов'язкові поля присутні
     """
     try:
-        # Перевіряємо, що data є словником
-        if not isinstance(data, dict):
-            return False
-            
-        # Перевіряємо наявність основних полів
-        current_condition = data.get("current_condition")
-        nearest_area = data.get("nearest_area")
-        
-        # Перевіряємо, що current_condition є списком і не пустий
-        if not isinstance(current_condition, list) or not current_condition:
-            return False
-            
-        # Перевіряємо, що nearest_area є списком і не пустий  
-        if not isinstance(nearest_area, list) or not nearest_area:
-            return False
-            
-        current = current_condition[0]
-        area = nearest_area[0]
-        
-        # Перевіряємо, що current і area є словниками
-        if not isinstance(current, dict) or not isinstance(area, dict):
-            return False
-
-        # Перевіряємо температуру
-        temp = current.get("temp_C")
-        if temp is None:
-            return False
-
-        # Перевіряємо опис погоди
-        weather_desc_list = current.get("weatherDesc")
-        if not isinstance(weather_desc_list, list) or not weather_desc_list:
-            return False
-            
-        weather_desc = weather_desc_list[0].get("value") if isinstance(weather_desc_list[0], dict) else None
-        if not weather_desc:
-            return False
-
-        # Перевіряємо назву міста
-        area_name_list = area.get("areaName")
-        if not isinstance(area_name_list, list) or not area_name_list:
-            return False
-            
-        area_name = area_name_list[0].get("value") if isinstance(area_name_list[0], dict) else None
-        if not area_name:
-            return False
-            
-        return True
-        
-    except (KeyError, IndexError, TypeError, AttributeError):
+        parse_weather(data)
+    except ValidationError:
         return False
+    return True
 
 
 def extract_weather_info(data: Dict) -> Dict:
@@ -153,29 +783,8 @@ def extract_weather_info(data: Dict) -> Dict:
 
     Returns:
         Словник з потрібними полями
+
+    Raises:
+        ValidationError: Якщо відсутні обов'язкові поля
     """
-    current = data["current_condition"][0]
-    area = data["nearest_area"][0]
-    
-    def to_int(value: Optional[str]) -> int:
-        """Безпечне перетворення в int"""
-        if value is None:
-            return 0
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return 0
-
-    country_list = area.get("country")
-    country = country_list[0].get("value", "") if country_list else ""
-
-    return {
-        "city": area["areaName"][0]["value"],
-        "country": country,
-        "temperature": to_int(current.get("temp_C")),
-        "feels_like": to_int(current.get("FeelsLikeC")),
-        "description": current["weatherDesc"][0]["value"],
-        "humidity": to_int(current.get("humidity")),
-        "wind_speed": to_int(current.get("windspeedKmph")),
-        "pressure": to_int(current.get("pressure")),
-    }
+    return parse_weather(data).to_dict()
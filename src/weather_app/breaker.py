@@ -0,0 +1,185 @@
+"""
+Запобіжник (circuit breaker) для деградованого wttr.in
+
+Після кількох поспіль мережевих помилок запобіжник відкривається і
+запити одразу відхиляються (api.CircuitOpenError) замість очікування
+таймауту. Через recovery_timeout пропускається один пробний запит
+(half-open): успіх закриває запобіжник, помилка — відкриває знову.
+
+Стан зберігається у файлі поруч із кешем, тож його бачать усі
+процеси, що працюють з тим самим кешем.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from . import cache, locking
+
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE_NAME = "breaker.json"
+FAILURE_THRESHOLD = 5  # помилок поспіль до відкриття
+RECOVERY_TIMEOUT = 30.0  # секунд до пробного запиту
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_LOCK_KEY = "__circuit_breaker__"
+
+
+def state_path() -> str:
+    """Шлях до файлу стану поруч із CACHE_FILE"""
+    return os.path.join(os.path.dirname(cache.CACHE_FILE), STATE_FILE_NAME)
+
+
+class CircuitBreaker:
+    """
+    Запобіжник зі станом у спільному файлі
+
+    Переходи між станами пишуться в лог (logger weather_app.breaker)
+    та рахуються як у пам'яті процесу (stats()), так і в спільних
+    лічильниках кешу (breaker_open, breaker_half_open, breaker_closed).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_timeout: float = RECOVERY_TIMEOUT,
+        clock: Callable[[], float] = time.time,
+        path: Optional[str] = None,
+    ):
+        """
+        Args:
+            failure_threshold: Кількість помилок поспіль до відкриття
+            recovery_timeout: Секунд у відкритому стані до пробного запиту
+            clock: Джерело поточного часу
+            path: Файл стану (за замовчуванням поруч із кешем)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self._path = path
+        self._lock = threading.Lock()
+        self.transitions: Dict[str, int] = {}
+        self.rejected = 0
+
+    @property
+    def path(self) -> str:
+        return self._path or state_path()
+
+    def read_state(self) -> Dict:
+        """Читає стан; відсутній або пошкоджений файл означає closed"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+            state = None
+        if not isinstance(state, dict) or state.get("state") not in (CLOSED, OPEN, HALF_OPEN):
+            return {"state": CLOSED, "failures": 0}
+        return state
+
+    def _write_state(self, state: Dict):
+        cache.ensure_dir(self.path)
+        temp_file = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_file, self.path)
+        except OSError:
+            pass
+
+    def _update(self, change: Callable[[Dict, float], Optional[Dict]]):
+        """Змінює стан під міжпроцесним блокуванням"""
+        with self._lock:
+            try:
+                with locking.key_lock(_LOCK_KEY, timeout=1.0):
+                    return self._apply(change)
+            except locking.LockTimeout:
+                return self._apply(change)
+
+    def _apply(self, change):
+        state = self.read_state()
+        old = state["state"]
+        new_state = change(dict(state), self.clock())
+        if new_state is None:
+            return state
+        self._write_state(new_state)
+        if new_state["state"] != old:
+            self._transition(old, new_state["state"])
+        return new_state
+
+    def _transition(self, old: str, new: str):
+        name = f"{old}->{new}"
+        self.transitions[name] = self.transitions.get(name, 0) + 1
+        cache.increment_counter(f"breaker_{new}")
+        log = logger.warning if new == OPEN else logger.info
+        log("Circuit breaker: %s -> %s", old, new)
+
+    def allow_request(self) -> bool:
+        """
+        Перевіряє, чи можна виконати запит
+
+        У закритому стані запит дозволено завжди. У відкритому — лише
+        один пробний запит після recovery_timeout; якщо проба зависла,
+        через recovery_timeout дозволяється наступна.
+
+        Returns:
+            False, якщо запит слід відхилити одразу
+        """
+        if self.read_state()["state"] == CLOSED:
+            return True
+
+        granted = []
+
+        def try_probe(state, now):
+            if state["state"] == CLOSED:
+                granted.append(True)
+                return None
+            since = state.get("probe_at") or state.get("opened_at", 0)
+            if now - since < self.recovery_timeout:
+                return None
+            # Пропускаємо один пробний запит; інші чекають на його результат
+            granted.append(True)
+            state["state"] = HALF_OPEN
+            state["probe_at"] = now
+            return state
+
+        self._update(try_probe)
+        if granted:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        """Фіксує успішну відповідь сервера"""
+        state = self.read_state()
+        if state["state"] == CLOSED and not state.get("failures"):
+            return
+        self._update(lambda state, now: {"state": CLOSED, "failures": 0})
+
+    def record_failure(self):
+        """Фіксує мережеву помилку або 5xx"""
+        def fail(state, now):
+            failures = int(state.get("failures", 0)) + 1
+            if state["state"] == HALF_OPEN or failures >= self.failure_threshold:
+                return {"state": OPEN, "failures": failures, "opened_at": now}
+            state["failures"] = failures
+            return state
+
+        self._update(fail)
+
+    def stats(self) -> Dict:
+        """Поточний стан та лічильники цього процесу"""
+        state = self.read_state()
+        return {
+            "state": state["state"],
+            "failures": state.get("failures", 0),
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
@@ -1,17 +1,92 @@
 """
 Модуль кешування даних про погоду з TTL
+
+Записи зберігаються у змінному сховищі: JSON-файл (за замовчуванням)
+або індексована база SQLite. Кожен запис — словник з полями "data"
+(повні дані API) або "info" (компактний WeatherInfo), "cached_at" (час
+запису) та "expires_at" (час завершення TTL, з яким запис було
+збережено).
+
+Повні дані зберігаються під канонічним ключем місця (CANONICAL_PREFIX,
+назва й країна з nearest_area та округлені координати), а ключ, за яким
+місто запитали, стає записом-псевдонімом {"alias": канонічний ключ}.
+Тож "Kyiv", "Kiev" і "Київ" після першого завантаження кожного з них
+ведуть до одного запису, і оновлення будь-якого з них видно всім.
+Відповіді без координат (--lean) зберігаються під ключем запиту.
+
+Негативні записи ("місто не знайдено") мають ключ з префіксом
+NEGATIVE_PREFIX, поле "not_found" з текстом помилки та власний
+короткий TTL (NEGATIVE_TTL): повторний запит хибної назви отримує
+відповідь без мережі, а виправлена на сервері назва знову запитується
+після завершення цього TTL.
+
+Запити за координатами ("lat,lon") зберігаються під ключами з префіксом
+GEO_PREFIX разом з коміркою сітки точки (geo.grid_cell), тож можна
+повернути актуальний запис найближчої точки в межах GEO_RADIUS_KM
+замість запиту до мережі для кожної трохи іншої точки. У SQLite комірка
+— індексовані колонки geo_row/geo_col, і пошук читає лише сусідні
+комірки; JSON-сховище однаково розбирає весь файл при кожному читанні,
+тож для десятків тисяч точок потрібні --cache-backend sqlite та
+--cache-max-entries більше за MAX_ENTRIES (точки рахуються разом з
+іншими записами).
 """
 
+import atexit
 import json
 import os
+import sqlite3
+import threading
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from . import geo, timings
+from .models import WeatherInfo
+
+try:
+    import fcntl
+except ImportError:  # Windows: між процесами записи не блокуються
+    fcntl = None
+
 
 CACHE_FILE = ".cache/weather.json"
+SQLITE_FILE_NAME = "weather.db"
 DEFAULT_TTL = 300  # 5 хвилин за замовчуванням
 
+MEMORY_TIER_SIZE = 1024  # записів у пам'яті процесу; 0 — вимкнено
+MAX_ENTRIES = 5000  # максимум записів у сховищі
+MAX_BYTES = 64 * 1024 * 1024  # максимальний обсяг записів у байтах
+STALE_TTL = 0  # скільки секунд після TTL запис ще можна віддавати як застарілий
+FALLBACK_TTL = 86400  # скільки секунд після TTL зберігати запис для показу, коли сервіс недоступний
+NEGATIVE_TTL = 600  # скільки секунд пам'ятати, що місто не знайдено; 0 — вимкнено
+NEGATIVE_PREFIX = "404:"  # префікс ключів негативних записів
+CANONICAL_PREFIX = "@"  # префікс канонічних ключів місць
+CANONICAL_PRECISION = 2  # знаків після коми в координатах канонічного ключа (~1 км)
+ALIAS_TTL = 30 * 86400  # скільки секунд живе запис-псевдонім
+GEO_PREFIX = "geo:"  # префікс ключів запитів за координатами
+GEO_RADIUS_KM = 3.0  # радіус, у якому придатний запис сусідньої точки; 0 — вимкнено
+COUNTERS_FILE_NAME = "counters.json"
+COUNTER_FLUSH_INTERVAL = 5.0  # як часто процес записує накопичені лічильники, секунд
+
+# Межі груп віку записів для статистики (секунди, підпис)
+AGE_BUCKETS = (
+    (60, "<1m"),
+    (300, "1-5m"),
+    (900, "5-15m"),
+    (3600, "15-60m"),
+    (86400, "1-24h"),
+)
+
+BACKENDS = ("json", "sqlite")
+CACHE_BACKEND = os.environ.get("WEATHER_CACHE_BACKEND", "json")
+
+# full — зберігати повну відповідь j1; compact — лише WeatherInfo
+CACHE_MODES = ("full", "compact")
+CACHE_MODE = os.environ.get("WEATHER_CACHE_MODE", "full")
+APP_DIR_NAME = "weather-app"
+
 
 def ensure_cache_dir():
     """Створює директорію для кешу, якщо її немає"""
@@ -19,114 +94,1431 @@ def ensure_cache_dir():
     cache_dir.mkdir(parents=True, exist_ok=True)
 
 
+def xdg_cache_dir() -> str:
+    """
+    Повертає абсолютну директорію кешу за специфікацією XDG
+
+    Returns:
+        $XDG_CACHE_HOME/weather-app або ~/.cache/weather-app
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base or not os.path.isabs(base):
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def configure(
+    backend: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    memory_size: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    mode: Optional[str] = None,
+    stale_ttl: Optional[int] = None,
+    negative_ttl: Optional[int] = None,
+    geo_radius: Optional[float] = None,
+    fallback_ttl: Optional[int] = None
+):
+    """
+    Налаштовує сховище кешу
+
+    Args:
+        backend: "json" або "sqlite"
+        cache_dir: Директорія кешу (наприклад, xdg_cache_dir())
+        memory_size: Розмір кешу в пам'яті процесу (0 — вимкнути)
+        max_entries: Максимум записів у сховищі
+        max_bytes: Максимальний обсяг записів у байтах
+        mode: "full" або "compact"
+        stale_ttl: Вікно stale-while-revalidate у секундах
+        negative_ttl: TTL негативних записів у секундах (0 — вимкнути)
+        geo_radius: Радіус пошуку запису сусідньої точки в км (0 — вимкнути)
+        fallback_ttl: Скільки секунд після TTL зберігати записи для показу
+            при недоступному сервісі (0 — видаляти одразу)
+
+    Raises:
+        ValueError: Для невідомого backend або режиму
+    """
+    global CACHE_BACKEND, CACHE_FILE, MAX_ENTRIES, MAX_BYTES, CACHE_MODE, STALE_TTL, NEGATIVE_TTL
+    global GEO_RADIUS_KM, FALLBACK_TTL
+    if backend is not None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Невідомий тип кешу: {backend}")
+        CACHE_BACKEND = backend
+    if cache_dir is not None:
+        CACHE_FILE = os.path.join(cache_dir, os.path.basename(CACHE_FILE))
+    if memory_size is not None:
+        _memory.clear()
+        _memory.max_entries = memory_size
+    if max_entries is not None:
+        MAX_ENTRIES = max_entries
+    if max_bytes is not None:
+        MAX_BYTES = max_bytes
+    if mode is not None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Невідомий режим кешу: {mode}")
+        CACHE_MODE = mode
+    if stale_ttl is not None:
+        STALE_TTL = stale_ttl
+    if negative_ttl is not None:
+        NEGATIVE_TTL = negative_ttl
+    if geo_radius is not None:
+        GEO_RADIUS_KM = geo_radius
+    if fallback_ttl is not None:
+        FALLBACK_TTL = fallback_ttl
+
+
 def get_cache_key(city: Optional[str]) -> str:
     """
     Формує ключ для кешу
 
+    Координати "lat,lon" нормалізуються до COORDINATE_PRECISION знаків
+    і отримують префікс GEO_PREFIX.
+
     Args:
-        city: Назва міста або None для автовизначення
+        city: Назва міста, координати "lat,lon" або None для автовизначення
 
     Returns:
         Ключ для кешу
     """
     if city:
+        point = geo.parse_coordinates(city)
+        if point is not None:
+            return GEO_PREFIX + geo.format_coordinates(*point)
         return city.lower().strip()
     return "AUTO"
 
 
-def get_from_cache(city: Optional[str], ttl: int = DEFAULT_TTL) -> Optional[Dict]:
+def geo_point(key: str) -> Optional[Tuple[float, float]]:
+    """Координати ключа з префіксом GEO_PREFIX або None для інших ключів"""
+    if not key.startswith(GEO_PREFIX):
+        return None
+    return geo.parse_coordinates(key[len(GEO_PREFIX):])
+
+
+def grid_cell_of(key: str) -> Tuple[Optional[int], Optional[int]]:
+    """Комірка сітки ключа точки або (None, None) для інших ключів"""
+    point = geo_point(key)
+    if point is None:
+        return None, None
+    return geo.grid_cell(*point)
+
+
+def negative_key(city: Optional[str]) -> str:
+    """Ключ негативного запису міста"""
+    return NEGATIVE_PREFIX + get_cache_key(city)
+
+
+def canonical_key(data: Optional[Dict]) -> Optional[str]:
     """
-    Отримує дані з кешу, якщо вони актуальні
+    Канонічний ключ місця з nearest_area: назва, країна й координати,
+    округлені до CANONICAL_PRECISION знаків
 
     Args:
-        city: Назва міста або None для автовизначення
+        data: Повні дані API
+
+    Returns:
+        Ключ з префіксом CANONICAL_PREFIX або None, якщо у відповіді
+        немає назви чи координат (наприклад, для компактного формату --lean)
+    """
+    try:
+        area = data["nearest_area"][0]
+        name = area["areaName"][0]["value"]
+        country = (area.get("country") or [{}])[0].get("value") or ""
+        lat, lon = float(area["latitude"]), float(area["longitude"])
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+        return None
+    if not str(name).strip():
+        return None
+    coords = f"{lat:.{CANONICAL_PRECISION}f},{lon:.{CANONICAL_PRECISION}f}"
+    return CANONICAL_PREFIX + "|".join((str(name).lower().strip(), str(country).lower().strip(), coords))
+
+
+def make_alias_entry(target: str, now: float) -> Dict:
+    """Створює запис-псевдонім, що веде до канонічного ключа target"""
+    return {"alias": target, "cached_at": now, "expires_at": now + ALIAS_TTL}
+
+
+def make_entry(data: Dict, now: float, ttl: int) -> Dict:
+    """Створює запис кешу з повними даними"""
+    return {"data": data, "cached_at": now, "expires_at": now + ttl}
+
+
+def make_info_entry(info: WeatherInfo, now: float, ttl: int) -> Dict:
+    """Створює компактний запис кешу"""
+    return {"info": info.to_dict(), "cached_at": now, "expires_at": now + ttl}
+
+
+def entry_expires_at(entry: Dict) -> float:
+    """Час завершення TTL запису (для старих записів — cached_at + DEFAULT_TTL)"""
+    return entry.get("expires_at", entry.get("cached_at", 0) + DEFAULT_TTL)
+
+
+def entry_recency(entry: Dict) -> float:
+    """Час останнього відомого використання запису для LRU"""
+    return entry.get("accessed_at") or entry.get("cached_at", 0)
+
+
+def entry_size(entry: Dict) -> int:
+    """Розмір серіалізованого запису в байтах"""
+    return len(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def select_evictions(
+    entries: Dict[str, Dict],
+    now: float,
+    max_entries: int,
+    max_bytes: Optional[int] = None,
+    sizes: Optional[Dict[str, int]] = None
+) -> List[str]:
+    """
+    Визначає записи для видалення: прострочені, а потім найдавніше
+    використані, доки кеш не вкладеться в обмеження
+
+    Args:
+        entries: Усі записи сховища
+        now: Поточний час
+        max_entries: Максимум записів
+        max_bytes: Максимальний обсяг (враховується, якщо задано sizes)
+        sizes: Розміри записів у байтах
+
+    Returns:
+        Список ключів для видалення
+    """
+    removed = [k for k, e in entries.items() if entry_expires_at(e) < now]
+    alive = sorted(
+        (k for k in entries if entry_expires_at(entries[k]) >= now),
+        key=lambda k: entry_recency(entries[k])
+    )
+
+    total = sum(sizes[k] for k in alive) if sizes is not None else 0
+    over_bytes = sizes is not None and max_bytes is not None
+    index = 0
+    while index < len(alive) and (
+        len(alive) - index > max_entries or (over_bytes and total > max_bytes)
+    ):
+        key = alive[index]
+        removed.append(key)
+        if sizes is not None:
+            total -= sizes[key]
+        index += 1
+    return removed
+
+
+def _resolve_alias(key: str, get) -> Dict[str, Optional[Dict]]:
+    """
+    Читає запис ключа, а для запису-псевдоніма — ще й запис його цілі
+
+    Args:
+        key: Ключ кешу
+        get: Функція читання запису за ключем
+
+    Returns:
+        Ключ → запис (None, якщо запису немає) для всіх прочитаних ключів
+    """
+    entry = get(key)
+    found = {key: entry if isinstance(entry, dict) else None}
+    if found[key] is not None and "alias" in found[key]:
+        target = found[key]["alias"]
+        entry = get(target)
+        found[target] = entry if isinstance(entry, dict) else None
+    return found
+
+
+class JsonFileStore:
+    """
+    Кеш в одному JSON-файлі
+
+    Кожне читання розбирає весь файл, а кожен запис переписує його
+    атомарно через тимчасовий файл. Читання-зміна-запис виконується під
+    ексклюзивним блокуванням файлу "<ім'я>.lock", тож одночасні записи
+    з потоків і процесів не затирають один одного.
+    """
+
+    _thread_lock = threading.Lock()  # замість fcntl там, де його немає
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Тримає ексклюзивне блокування файлу на час читання-зміни-запису"""
+        ensure_dir(self.path)
+        if fcntl is None:
+            with self._thread_lock:
+                yield
+            return
+        # Кожен виклик відкриває власний дескриптор: flock тоді розділяє
+        # і потоки одного процесу
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def load(self) -> Dict[str, Dict]:
+        """Читає весь файл кешу; при помилці повертає порожній словник"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+        except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+            return {}
+        return cache_data if isinstance(cache_data, dict) else {}
+
+    def version(self) -> Optional[Tuple]:
+        """Ознака зміни файлу: inode, mtime та розмір"""
+        return _stat_token(self.path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        item = self.load().get(key)
+        return item if isinstance(item, dict) else None
+
+    def resolve(self, key: str) -> Dict[str, Optional[Dict]]:
+        """Запис ключа та, якщо це псевдонім, запис його цілі за одне читання файлу"""
+        return _resolve_alias(key, self.load().get)
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        return iter(list(self.load().items()))
+
+    def keys(self) -> List[str]:
+        return list(self.load())
+
+    def grid_keys(self, rows: Tuple[int, int], columns: List[Tuple[int, int]]) -> List[str]:
+        """Ключі точок у вікні сітки geo.grid_window() (перебір усього файлу)"""
+        found = []
+        for key in self.load():
+            point = geo_point(key)
+            if point is not None and geo.in_window(geo.grid_cell(*point), rows, columns):
+                found.append(key)
+        return found
+
+    def apply(
+        self,
+        changes: Dict[str, Optional[Dict]],
+        touch: Optional[Dict[str, float]] = None,
+        now: Optional[float] = None
+    ) -> List[str]:
+        """
+        Застосовує зміни одним перезаписом файлу
+
+        Args:
+            changes: Ключ → новий запис або None для видалення
+            touch: Ключ → час останнього читання для LRU
+            now: Якщо задано — заодно видаляє прострочені записи та
+                витісняє найдавніші за межами MAX_ENTRIES/MAX_BYTES
+
+        Returns:
+            Ключі, видалені під час компактизації
+        """
+        with self.locked():
+            return self._apply(changes, touch, now)
+
+    def _apply(
+        self,
+        changes: Dict[str, Optional[Dict]],
+        touch: Optional[Dict[str, float]],
+        now: Optional[float]
+    ) -> List[str]:
+        cache_data = self.load()
+        for key, entry in changes.items():
+            if entry is None:
+                cache_data.pop(key, None)
+            else:
+                cache_data[key] = entry
+        for key, accessed_at in (touch or {}).items():
+            item = cache_data.get(key)
+            if isinstance(item, dict) and accessed_at > entry_recency(item):
+                item["accessed_at"] = accessed_at
+
+        removed: List[str] = []
+        text = self.dumps(cache_data)
+        if now is not None:
+            # Розміри записів рахуємо лише тоді, коли файл завеликий
+            sizes = None
+            if len(text.encode("utf-8")) > MAX_BYTES:
+                sizes = {k: entry_size(e) for k, e in cache_data.items()}
+            removed = select_evictions(cache_data, now, MAX_ENTRIES, MAX_BYTES, sizes)
+            if removed:
+                for key in removed:
+                    del cache_data[key]
+                text = self.dumps(cache_data)
+
+        self.write(text)
+        return removed
+
+    @staticmethod
+    def dumps(cache_data: Dict[str, Dict]) -> str:
+        return json.dumps(cache_data, ensure_ascii=False, indent=2)
+
+    def write(self, text: str):
+        """Атомарно записує весь кеш"""
+        # Власний тимчасовий файл для кожного потоку кожного процесу
+        temp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+            # Перейменовуємо тимчасовий файл в основний
+            os.replace(temp_file, self.path)
+
+        except IOError:
+            # При помилці запису - видаляємо тимчасовий файл, якщо він існує
+            if os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+            # Помилку запису ігноруємо - кеш не критичний для роботи
+
+    def set(self, key: str, entry: Dict):
+        self.apply({key: entry})
+
+    def delete(self, key: str):
+        self.apply({key: None})
+
+    def clear(self):
+        if os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except IOError:
+                pass
+
+    def vacuum(self):
+        """Файл і так переписується повністю — нічого робити не треба"""
+        pass
+
+    def file_size(self) -> int:
+        token = _stat_token(self.path)
+        return token[2] if token else 0
+
+
+class SqliteStore:
+    """
+    Кеш у базі SQLite: один рядок на ключ та індекс за часом завершення
+
+    Читання та запис одного ключа не залежать від загального розміру
+    кешу. Ключі точок (GEO_PREFIX) мають комірку сітки в колонках
+    geo_row/geo_col з власним індексом для пошуку сусідніх точок.
+    База працює в режимі WAL, тож читачі не блокують записувача.
+    Кожен потік отримує власне з'єднання.
+    """
+
+    _COLUMNS = ("cached_at", "expires_at", "accessed_at")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            ensure_dir(self.path)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " cached_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL DEFAULT 0,"
+                " size INTEGER NOT NULL DEFAULT 0,"
+                " geo_row INTEGER,"
+                " geo_col INTEGER"
+                ") WITHOUT ROWID"
+            )
+            # Бази, створені до появи LRU, отримують нові колонки
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if "accessed_at" not in columns:
+                conn.execute(
+                    "ALTER TABLE entries ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+                )
+                conn.execute("UPDATE entries SET accessed_at = cached_at")
+            if "size" not in columns:
+                conn.execute(
+                    "ALTER TABLE entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+                )
+                conn.execute("UPDATE entries SET size = length(CAST(value AS BLOB))")
+            if "geo_row" not in columns:
+                conn.execute("ALTER TABLE entries ADD COLUMN geo_row INTEGER")
+                conn.execute("ALTER TABLE entries ADD COLUMN geo_col INTEGER")
+                keys = [key for (key,) in conn.execute(
+                    "SELECT key FROM entries WHERE key LIKE ?", (GEO_PREFIX + "%",)
+                )]
+                conn.executemany(
+                    "UPDATE entries SET geo_row = ?, geo_col = ? WHERE key = ?",
+                    [(*grid_cell_of(key), key) for key in keys]
+                )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_expires_at"
+                " ON entries (expires_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed_at"
+                " ON entries (accessed_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_geo_cell"
+                " ON entries (geo_row, geo_col) WHERE geo_row IS NOT NULL"
+            )
+            self._local.conn = conn
+        return conn
+
+    @classmethod
+    def _to_row(cls, key: str, entry: Dict) -> Tuple:
+        rest = {k: v for k, v in entry.items() if k not in cls._COLUMNS}
+        value = json.dumps(rest, ensure_ascii=False)
+        return (
+            key,
+            value,
+            entry.get("cached_at", 0),
+            entry_expires_at(entry),
+            entry_recency(entry),
+            len(value.encode("utf-8")),
+            *grid_cell_of(key),
+        )
+
+    @staticmethod
+    def _from_row(value: str, cached_at: float, expires_at: float, accessed_at: float) -> Dict:
+        entry = json.loads(value)
+        entry["cached_at"] = cached_at
+        entry["expires_at"] = expires_at
+        if accessed_at and accessed_at != cached_at:
+            entry["accessed_at"] = accessed_at
+        return entry
+
+    def version(self) -> Optional[Tuple]:
+        """Ознака зміни бази: стан основного файлу та WAL-журналу"""
+        return (_stat_token(self.path), _stat_token(f"{self.path}-wal"))
+
+    def get(self, key: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            "SELECT value, cached_at, expires_at, accessed_at"
+            " FROM entries WHERE key = ?",
+            (key,)
+        ).fetchone()
+        return self._from_row(*row) if row else None
+
+    def resolve(self, key: str) -> Dict[str, Optional[Dict]]:
+        """Запис ключа та, якщо це псевдонім, запис його цілі"""
+        return _resolve_alias(key, self.get)
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        rows = self._connect().execute(
+            "SELECT key, value, cached_at, expires_at, accessed_at FROM entries"
+        ).fetchall()
+        for key, *row in rows:
+            yield key, self._from_row(*row)
+
+    def keys(self) -> List[str]:
+        return [key for (key,) in self._connect().execute("SELECT key FROM entries")]
+
+    def grid_keys(self, rows: Tuple[int, int], columns: List[Tuple[int, int]]) -> List[str]:
+        """Ключі точок у вікні сітки geo.grid_window() (за індексом entries_geo_cell)"""
+        spans = " OR ".join("geo_col BETWEEN ? AND ?" for _ in columns)
+        params = [*rows] + [bound for span in columns for bound in span]
+        return [key for (key,) in self._connect().execute(
+            "SELECT key FROM entries"
+            f" WHERE geo_row IS NOT NULL AND geo_row BETWEEN ? AND ? AND ({spans})",
+            params
+        )]
+
+    def apply(
+        self,
+        changes: Dict[str, Optional[Dict]],
+        touch: Optional[Dict[str, float]] = None,
+        now: Optional[float] = None
+    ) -> List[str]:
+        """
+        Застосовує зміни в одній транзакції
+
+        Args:
+            changes: Ключ → новий запис або None для видалення
+            touch: Ключ → час останнього читання для LRU
+            now: Якщо задано — заодно видаляє прострочені записи та
+                витісняє найдавніші за межами MAX_ENTRIES/MAX_BYTES
+
+        Returns:
+            Ключі, видалені під час компактизації
+        """
+        conn = self._connect()
+        removed: List[str] = []
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for key, entry in changes.items():
+                if entry is None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries"
+                        " (key, value, cached_at, expires_at, accessed_at, size, geo_row, geo_col)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._to_row(key, entry)
+                    )
+            if touch:
+                conn.executemany(
+                    "UPDATE entries SET accessed_at = ?"
+                    " WHERE key = ? AND accessed_at < ?",
+                    [(ts, key, ts) for key, ts in touch.items()]
+                )
+            if now is not None:
+                removed = self._compact(conn, now)
+        return removed
+
+    @staticmethod
+    def _compact(conn: sqlite3.Connection, now: float) -> List[str]:
+        """Видаляє прострочені та найдавніше використані записи"""
+        removed = [key for (key,) in conn.execute(
+            "SELECT key FROM entries WHERE expires_at < ?", (now,)
+        )]
+        if removed:
+            conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= MAX_ENTRIES and total <= MAX_BYTES:
+            return removed
+
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ):
+            if count <= MAX_ENTRIES and total <= MAX_BYTES:
+                break
+            victims.append(key)
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+        return removed + victims
+
+    def set(self, key: str, entry: Dict):
+        self.apply({key: entry})
+
+    def delete(self, key: str):
+        self.apply({key: None})
+
+    def clear(self):
+        if os.path.exists(self.path):
+            self._connect().execute("DELETE FROM entries")
+
+    def vacuum(self):
+        """Повертає звільнене місце файлової системи"""
+        conn = self._connect()
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def file_size(self) -> int:
+        total = 0
+        for path in (self.path, f"{self.path}-wal"):
+            token = _stat_token(path)
+            total += token[2] if token else 0
+        return total
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class MemoryTier:
+    """
+    Обмежений LRU-кеш записів у пам'яті процесу
+
+    Тримає копії записів сховища, щоб повторні читання коштували
+    звернення до словника замість дискового I/O та розбору JSON.
+    Вміст скидається, щойно змінюється ознака версії сховища
+    (inode/mtime файлу), тобто коли кеш оновив інший процес.
+    """
+
+    _ABSENT = object()
+
+    def __init__(self, max_entries: int = MEMORY_TIER_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def sync(self, version):
+        """Скидає вміст, якщо версія сховища змінилася"""
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+
+    def lookup(self, key: str):
+        """
+        Шукає запис у пам'яті
+
+        Returns:
+            Запис, None (відомо, що запису немає) або MemoryTier._ABSENT,
+            якщо ключа в пам'яті немає
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return self._ABSENT
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: str, entry: Optional[Dict], version=None):
+        """
+        Запам'ятовує запис (None — відсутність запису)
+
+        Args:
+            key: Ключ кешу
+            entry: Запис або None
+            version: Нова версія сховища після власного запису
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version is not None:
+                self._version = version
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key: str):
+        """Як lookup, але без зміни порядку LRU та лічильників"""
+        with self._lock:
+            return self._entries.get(key, self._ABSENT)
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _stat_token(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def ensure_dir(path: str):
+    """Створює батьківську директорію файлу сховища"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+
+def sqlite_path() -> str:
+    """Шлях до бази SQLite поруч із CACHE_FILE"""
+    return os.path.join(os.path.dirname(CACHE_FILE), SQLITE_FILE_NAME)
+
+
+_store = None
+_store_config: Optional[Tuple[str, str]] = None
+_store_lock = threading.Lock()
+_memory = MemoryTier()
+_pending_access: Dict[str, float] = {}
+_pending_lock = threading.Lock()
+# Шлях файлу лічильників → назва → ще не записане збільшення
+_pending_counters: Dict[str, Dict[str, int]] = {}
+_counters_lock = threading.Lock()
+_counters_flushed_at = 0.0
+
+
+def get_store():
+    """
+    Повертає сховище для поточних CACHE_BACKEND та CACHE_FILE
+
+    Сховище створюється заново, якщо налаштування змінилися.
+    """
+    global _store, _store_config
+    config = (CACHE_BACKEND, CACHE_FILE)
+    if _store_config != config:
+        with _store_lock:
+            if _store_config != config:
+                if isinstance(_store, SqliteStore):
+                    _store.close()
+                backend, cache_file = config
+                _store = SqliteStore(sqlite_path()) if backend == "sqlite" else JsonFileStore(cache_file)
+                _store_config = config
+                _memory.clear()
+    return _store
+
+
+def memory_stats() -> Dict[str, int]:
+    """
+    Повертає лічильники кешу в пам'яті
+
+    Returns:
+        Словник з полями size, hits, misses, evictions, invalidations
+    """
+    return _memory.stats()
+
+
+def _read_entry(key: str) -> Optional[Dict]:
+    """Читає запис через кеш у пам'яті, звертаючись до сховища лише за потреби"""
+    with timings.phase("cache.read"):
+        store = get_store()
+        if _memory.max_entries <= 0:
+            return store.get(key)
+
+        _memory.sync(store.version())
+        entry = _memory.lookup(key)
+        if entry is MemoryTier._ABSENT:
+            entry = store.get(key)
+            _memory.put(key, entry)
+        return entry
+
+
+def _read_resolved(key: str) -> Tuple[str, Optional[Dict]]:
+    """
+    Читає запис, ідучи за псевдонімом, одним зверненням до сховища
+
+    Returns:
+        (ключ знайденого запису, запис або None)
+    """
+    with timings.phase("cache.read"):
+        store = get_store()
+        if _memory.max_entries > 0:
+            _memory.sync(store.version())
+            entry = _memory.lookup(key)
+            if entry is not MemoryTier._ABSENT:
+                if entry is None or "alias" not in entry:
+                    return key, entry
+                target = _memory.lookup(entry["alias"])
+                if target is not MemoryTier._ABSENT:
+                    return entry["alias"], target
+
+        found = store.resolve(key)
+        for found_key, found_entry in found.items():
+            _memory.put(found_key, found_entry)
+    entry = found[key]
+    if entry is not None and "alias" in entry:
+        return entry["alias"], found[entry["alias"]]
+    return key, entry
+
+
+def _nearby_keys(lat: float, lon: float, radius_km: float) -> List[Tuple[float, str]]:
+    """
+    Шукає ключі точок у радіусі, читаючи зі сховища лише сусідні комірки сітки
+
+    Returns:
+        Список (відстань у км, ключ), від найближчої точки
+    """
+    rows, columns = geo.grid_window(lat, lon, radius_km)
+    found = []
+    for key in get_store().grid_keys(rows, columns):
+        point = geo_point(key)
+        if point is None:
+            continue
+        distance = geo.haversine_km(lat, lon, *point)
+        if distance <= radius_km:
+            found.append((distance, key))
+    found.sort()
+    return found
+
+
+def _record_access(key: str, now: float):
+    """Запам'ятовує читання ключа; у сховище потрапить з наступним записом"""
+    with _pending_lock:
+        _pending_access[key] = now
+
+
+def _take_pending_access() -> Dict[str, float]:
+    global _pending_access
+    with _pending_lock:
+        touch, _pending_access = _pending_access, {}
+    return touch
+
+
+def _write_entries(changes: Dict[str, Optional[Dict]], now: Optional[float] = None) -> List[str]:
+    """
+    Записує зміни у сховище та оновлює кеш у пам'яті
+
+    Разом із записом у сховище потрапляють накопичені часи читань,
+    а якщо задано now — видаляються прострочені та зайві записи, а
+    псевдоніми, які вже відомі з пам'яті, не переписуються.
+    Прострочені записи живуть ще max(STALE_TTL, FALLBACK_TTL) секунд,
+    щоб їх можна було віддати як застарілі або як останні відомі дані,
+    коли сервіс недоступний. Обмеження розміру витісняють їх першими.
+
+    Returns:
+        Ключі, видалені під час компактизації
+    """
+    with timings.phase("cache.write"):
+        store = get_store()
+        if _memory.max_entries > 0:
+            # Підтягуємо чужі зміни до запису, щоб не сплутати їх із власними
+            _memory.sync(store.version())
+            if now is not None:
+                changes = {
+                    key: entry for key, entry in changes.items()
+                    if not _alias_is_current(key, entry, now)
+                }
+        expired_before = now - max(STALE_TTL, FALLBACK_TTL) if now is not None else None
+        removed = store.apply(changes, touch=_take_pending_access(), now=expired_before)
+        version = store.version()
+    for key, entry in changes.items():
+        _memory.put(key, entry, version=version)
+    for key in removed:
+        _memory.discard(key)
+    return removed
+
+
+def _alias_is_current(key: str, entry: Optional[Dict], now: float) -> bool:
+    """
+    Чи вже є в пам'яті такий самий псевдонім, що проживе ще щонайменше
+    половину ALIAS_TTL
+
+    Тоді повторний запис того самого міста не переписує псевдонім.
+    """
+    if entry is None or "alias" not in entry:
+        return False
+    known = _memory.peek(key)
+    return (
+        isinstance(known, dict)
+        and known.get("alias") == entry["alias"]
+        and entry_expires_at(known) - now >= ALIAS_TTL / 2
+    )
+
+
+class CacheHit:
+    """Знайдений запис кешу разом з його віком"""
+
+    __slots__ = ("key", "entry", "age", "stale")
+
+    def __init__(self, key: str, entry: Dict, age: float, stale: bool):
+        self.key = key
+        self.entry = entry
+        self.age = age
+        self.stale = stale
+
+    @property
+    def data(self) -> Optional[Dict]:
+        """Повні дані API або None для компактного запису"""
+        return self.entry.get("data")
+
+    def info(self) -> WeatherInfo:
+        """
+        Повертає WeatherInfo запису
+
+        Raises:
+            ValidationError: Якщо повні дані мають некоректну структуру
+        """
+        if "info" in self.entry:
+            return WeatherInfo.from_dict(self.entry["info"])
+        return WeatherInfo.from_data(self.entry["data"])
+
+
+def lookup_cache(
+    city: Optional[str],
+    ttl: int = DEFAULT_TTL,
+    stale_ttl: int = 0,
+    now: Optional[float] = None
+) -> Optional[CacheHit]:
+    """
+    Шукає запис кешу, допускаючи застарілі дані в межах stale_ttl
+
+    Для координат без власного запису повертається запис найближчої
+    точки в межах GEO_RADIUS_KM: актуальний, а якщо такого немає —
+    застарілий.
+
+    Args:
+        city: Назва міста, координати "lat,lon" або None для автовизначення
         ttl: Час життя кешу в секундах
+        stale_ttl: Скільки секунд після ttl запис ще повертається
+            з позначкою stale
+        now: Поточний час (за замовчуванням time.time())
 
     Returns:
-        Дані з кешу або None, якщо кеш застарів/відсутній
+        CacheHit з віком запису або None, якщо запису немає чи він
+        старший за ttl + stale_ttl
     """
-    ensure_cache_dir()
+    key = get_cache_key(city)
+    if now is None:
+        now = time.time()
+    hit = _lookup_key(key, ttl, stale_ttl, now)
+    if hit is None or hit.stale:
+        point = geo_point(key)
+        if point is not None and GEO_RADIUS_KM > 0:
+            hit = _lookup_nearby(key, point, ttl, stale_ttl, now) or hit
+    return hit
+
 
-    # Перевіряємо існування файлу
-    if not os.path.exists(CACHE_FILE):
+def _lookup_nearby(
+    key: str,
+    point: Tuple[float, float],
+    ttl: int,
+    stale_ttl: int,
+    now: float
+) -> Optional[CacheHit]:
+    """Найближчий актуальний (або, якщо такого немає, застарілий) запис сусідньої точки"""
+    try:
+        candidates = _nearby_keys(*point, GEO_RADIUS_KM)
+    except (sqlite3.Error, OSError):
         return None
+    stale_hit = None
+    for _, near_key in candidates:
+        if near_key == key:
+            continue
+        hit = _lookup_key(near_key, ttl, stale_ttl, now)
+        if hit is None:
+            continue
+        if not hit.stale:
+            return hit
+        if stale_hit is None:
+            stale_hit = hit
+    return stale_hit
+
 
+def _lookup_key(key: str, ttl: int, stale_ttl: int, now: float) -> Optional[CacheHit]:
+    """Шукає запис за ключем, ідучи за псевдонімом"""
+    alias_key = key
     try:
-        # Читаємо кеш
-        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+        # Відома назва — йдемо за псевдонімом до запису місця
+        key, cached_item = _read_resolved(key)
+    except (sqlite3.Error, ValueError):
+        # При будь-яких помилках читання кешу - ігноруємо його
+        return None
 
-        # Отримуємо ключ
-        key = get_cache_key(city)
+    if cached_item is None:
+        return None
 
-        # Перевіряємо наявність даних для ключа
-        if key not in cache_data:
-            return None
+    # Перевіряємо TTL
+    age = now - cached_item.get("cached_at", 0)
+    if age > ttl + stale_ttl:
+        # Прострочений запис не тримаємо в пам'яті
+        _memory.discard(key)
+        return None
 
-        cached_item = cache_data[key]
+    stale = age > ttl
+    if not stale:
+        _record_access(key, now)
+        if alias_key != key:
+            _record_access(alias_key, now)
+    return CacheHit(key, cached_item, age, stale)
 
-        # Перевіряємо TTL
-        cached_at = cached_item.get("cached_at", 0)
-        if time.time() - cached_at > ttl:
-            return None
 
-        return cached_item.get("data")
+def get_entry_from_cache(
+    city: Optional[str],
+    ttl: int = DEFAULT_TTL,
+    now: Optional[float] = None
+) -> Optional[Dict]:
+    """
+    Отримує актуальний запис кешу разом з полями cached_at/expires_at
 
-    except (json.JSONDecodeError, IOError, KeyError):
-        # При будь-яких помилках читання кешу - ігноруємо його
+    Args:
+        city: Назва міста або None для автовизначення
+        ttl: Час життя кешу в секундах
+        now: Поточний час (за замовчуванням time.time())
+
+    Returns:
+        Запис з полем "data" або "info", або None
+    """
+    hit = lookup_cache(city, ttl, now=now)
+    if hit is None:
         return None
+    return hit.entry
 
 
-def set_to_cache(city: Optional[str], data: Dict):
+def get_from_cache(
+    city: Optional[str],
+    ttl: int = DEFAULT_TTL,
+    now: Optional[float] = None
+) -> Optional[Dict]:
     """
-    Зберігає дані в кеш
+    Отримує дані з кешу, якщо вони актуальні
 
     Args:
         city: Назва міста або None для автовизначення
-        data: Дані для збереження
+        ttl: Час життя кешу в секундах
+        now: Поточний час (за замовчуванням time.time())
+
+    Returns:
+        Дані з кешу або None, якщо кеш застарів/відсутній або запис
+        компактний (див. get_info_from_cache)
+    """
+    cached_item = get_entry_from_cache(city, ttl, now)
+    if cached_item is None:
+        return None
+    return cached_item.get("data")
+
+
+def get_info_from_cache(
+    city: Optional[str],
+    ttl: int = DEFAULT_TTL,
+    now: Optional[float] = None
+) -> Optional[WeatherInfo]:
+    """
+    Отримує компактний запис з кешу
+
+    Для компактних записів витягування з повних даних не потрібне,
+    для повних — запис витягується з них.
+
+    Returns:
+        WeatherInfo або None, якщо кеш застарів/відсутній
     """
-    ensure_cache_dir()
+    hit = lookup_cache(city, ttl, now=now)
+    if hit is None:
+        return None
+    return hit.info()
+
+
+def set_to_cache(
+    city: Optional[str],
+    data: Dict,
+    now: Optional[float] = None,
+    ttl: int = DEFAULT_TTL,
+    info: Optional[WeatherInfo] = None
+):
+    """
+    Зберігає дані в кеш
+
+    Повні дані з координатами записуються під канонічним ключем місця,
+    а назва city стає псевдонімом цього ключа. У режимі "compact" або
+    без повних даних (data=None) зберігається лише WeatherInfo
+    (переданий або витягнутий з data). Заодно видаляє прострочені записи
+    та витісняє найдавніше використані, якщо кеш перевищує MAX_ENTRIES
+    або MAX_BYTES.
 
-    # Читаємо існуючий кеш або створюємо новий
-    cache_data = {}
-    if os.path.exists(CACHE_FILE):
+    Args:
+        city: Назва міста або None для автовизначення
+        data: Повні дані для збереження або None, якщо є лише info
+        now: Час запису (за замовчуванням time.time())
+        ttl: TTL запису, за яким сховище визначає прострочені записи
+        info: Вже витягнутий запис для компактного режиму
+    """
+    if now is None:
+        now = time.time()
+    if CACHE_MODE == "compact" or data is None:
         try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # При помилці читання - створюємо новий кеш
-            cache_data = {}
+            entry = make_info_entry(info or WeatherInfo.from_data(data), now, ttl)
+        except ValueError:
+            # Некоректні дані не кешуємо
+            return
+    else:
+        entry = make_entry(data, now, ttl)
 
-    # Додаємо/оновлюємо дані
     key = get_cache_key(city)
-    cache_data[key] = {
-        "data": data,
-        "cached_at": time.time()
-    }
+    # Автовизначення за IP не прив'язуємо до місця: воно змінюється разом з мережею
+    target = canonical_key(data) if city else None
+    if target is None or target == key:
+        changes = {key: entry}
+    else:
+        changes = {target: entry, key: make_alias_entry(target, now)}
+    try:
+        _write_entries(changes, now=now)
+    except (sqlite3.Error, OSError):
+        # Кеш не критичний для роботи
+        pass
 
-    # Атомарний запис через тимчасовий файл
-    temp_file = f"{CACHE_FILE}.tmp"
+
+def set_negative(
+    city: Optional[str],
+    message: str,
+    now: Optional[float] = None,
+    ttl: Optional[int] = None
+):
+    """
+    Запам'ятовує, що місто не знайдено
+
+    Args:
+        city: Назва міста або None для автовизначення
+        message: Текст помилки, який отримають повторні запити
+        now: Час запису (за замовчуванням time.time())
+        ttl: TTL запису (за замовчуванням NEGATIVE_TTL; 0 — не записувати)
+    """
+    if ttl is None:
+        ttl = NEGATIVE_TTL
+    if ttl <= 0:
+        return
+    if now is None:
+        now = time.time()
+    entry = {"not_found": message, "city": city, "cached_at": now, "expires_at": now + ttl}
     try:
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        _write_entries({negative_key(city): entry}, now=now)
+    except (sqlite3.Error, OSError):
+        # Кеш не критичний для роботи
+        pass
 
-        # Перейменовуємо тимчасовий файл в основний
-        os.replace(temp_file, CACHE_FILE)
 
-    except IOError as e:
-        # При помилці запису - видаляємо тимчасовий файл, якщо він існує
-        if os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-        # Помилку запису ігноруємо - кеш не критичний для роботи
+def get_negative(city: Optional[str], now: Optional[float] = None) -> Optional[str]:
+    """
+    Перевіряє, чи місто нещодавно не знайдено
+
+    Args:
+        city: Назва міста або None для автовизначення
+        now: Поточний час (за замовчуванням time.time())
+
+    Returns:
+        Текст збереженої помилки або None
+    """
+    if NEGATIVE_TTL <= 0:
+        return None
+    try:
+        entry = _read_entry(negative_key(city))
+    except (sqlite3.Error, ValueError):
+        return None
+    if entry is None:
+        return None
+    if now is None:
+        now = time.time()
+    if entry_expires_at(entry) < now:
+        return None
+    return entry.get("not_found")
+
+
+def list_negative(now: Optional[float] = None) -> List[Dict]:
+    """
+    Повертає актуальні негативні записи
+
+    Args:
+        now: Поточний час (за замовчуванням time.time())
+
+    Returns:
+        Список словників з полями city, message, age та expires_in,
+        відсортований за назвою міста
+    """
+    if now is None:
+        now = time.time()
+    found = []
+    for key, entry in get_store().items():
+        if not key.startswith(NEGATIVE_PREFIX) or entry_expires_at(entry) < now:
+            continue
+        found.append({
+            "city": entry.get("city") or key[len(NEGATIVE_PREFIX):],
+            "message": entry.get("not_found", ""),
+            "age": now - entry.get("cached_at", 0),
+            "expires_in": entry_expires_at(entry) - now,
+        })
+    return sorted(found, key=lambda item: str(item["city"]).lower())
+
+
+def purge_negative(city: Optional[str] = None) -> int:
+    """
+    Видаляє негативні записи
+
+    Args:
+        city: Місто, запис якого треба видалити (None — усі записи)
+
+    Returns:
+        Кількість видалених записів
+    """
+    store = get_store()
+    if city is not None:
+        keys = [negative_key(city)] if store.get(negative_key(city)) is not None else []
+    else:
+        keys = [key for key, _ in store.items() if key.startswith(NEGATIVE_PREFIX)]
+    if keys:
+        try:
+            _write_entries({key: None for key in keys})
+        except (sqlite3.Error, OSError):
+            return 0
+    return len(keys)
 
 
 def clear_cache():
     """Повністю очищає кеш"""
-    if os.path.exists(CACHE_FILE):
+    _memory.clear()
+    try:
+        get_store().clear()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def prune_cache(now: Optional[float] = None) -> int:
+    """
+    Компактизує кеш: видаляє записи, прострочені довше за
+    max(STALE_TTL, FALLBACK_TTL), застосовує обмеження розміру та
+    повертає звільнене місце
+
+    Записи, прострочені нещодавно, лишаються: їх ще можна віддати як
+    застарілі або як останні відомі дані, коли сервіс недоступний.
+
+    Args:
+        now: Поточний час (за замовчуванням time.time())
+
+    Returns:
+        Кількість видалених записів
+    """
+    if now is None:
+        now = time.time()
+    removed = _write_entries({}, now=now)
+    get_store().vacuum()
+    return len(removed)
+
+
+def cache_stats(now: Optional[float] = None) -> Dict:
+    """
+    Збирає статистику сховища кешу
+
+    Args:
+        now: Поточний час (за замовчуванням time.time())
+
+    Returns:
+        Словник з полями backend, path, entries, bytes, file_bytes,
+        expired, negative (кількість негативних записів), aliases
+        (кількість записів-псевдонімів), points (кількість точок, запитаних
+        за координатами) та ages (кількість записів
+        у кожній групі віку)
+    """
+    if now is None:
+        now = time.time()
+    store = get_store()
+
+    ages = {label: 0 for _, label in AGE_BUCKETS}
+    ages[">24h"] = 0
+    entries = expired = total = negative = aliases = points = 0
+    for key, entry in store.items():
+        entries += 1
+        negative += key.startswith(NEGATIVE_PREFIX)
+        aliases += "alias" in entry
+        points += key.startswith(GEO_PREFIX)
+        total += entry_size(entry)
+        if entry_expires_at(entry) < now:
+            expired += 1
+        age = now - entry.get("cached_at", 0)
+        for limit, label in AGE_BUCKETS:
+            if age < limit:
+                ages[label] += 1
+                break
+        else:
+            ages[">24h"] += 1
+
+    return {
+        "backend": CACHE_BACKEND,
+        "path": store.path,
+        "entries": entries,
+        "bytes": total,
+        "file_bytes": store.file_size(),
+        "expired": expired,
+        "negative": negative,
+        "aliases": aliases,
+        "points": points,
+        "ages": ages,
+        "counters": read_counters(),
+    }
+
+
+def counters_path() -> str:
+    """Шлях до файлу лічильників поруч із CACHE_FILE"""
+    return os.path.join(os.path.dirname(CACHE_FILE), COUNTERS_FILE_NAME)
+
+
+def read_counters() -> Dict[str, int]:
+    """
+    Читає лічильники подій кешу, спільні для всіх процесів
+
+    Returns:
+        Назва події → кількість
+    """
+    flush_counters()
+    counters = JsonFileStore(counters_path()).load()
+    return {k: v for k, v in counters.items() if isinstance(v, int)}
+
+
+def increment_counter(name: str, amount: int = 1):
+    """
+    Збільшує лічильник події (наприклад, віддачі застарілих даних)
+
+    Збільшення накопичуються в пам'яті процесу і потрапляють у файл
+    одним оновленням не частіше ніж раз на COUNTER_FLUSH_INTERVAL
+    секунд; решту записують read_counters та завершення процесу.
+    """
+    global _counters_flushed_at
+    path = counters_path()
+    with _counters_lock:
+        pending = _pending_counters.setdefault(path, {})
+        pending[name] = pending.get(name, 0) + amount
+        due = time.monotonic() - _counters_flushed_at >= COUNTER_FLUSH_INTERVAL
+    if due:
+        flush_counters()
+
+
+def flush_counters():
+    """
+    Записує накопичені збільшення лічильників
+
+    Файл лічильників змінюється під тим самим блокуванням, що й
+    JSON-кеш, тож збільшення з кількох процесів не губляться.
+    """
+    global _pending_counters, _counters_flushed_at
+    with _counters_lock:
+        pending, _pending_counters = _pending_counters, {}
+        _counters_flushed_at = time.monotonic()
+    for path, amounts in pending.items():
+        store = JsonFileStore(path)
         try:
-            os.remove(CACHE_FILE)
-        except IOError:
+            with store.locked():
+                counters = store.load()
+                for name, amount in amounts.items():
+                    counters[name] = int(counters.get(name, 0)) + amount
+                store.write(store.dumps(counters))
+        except OSError:
             pass
+
+
+# Збільшення, накопичені до завершення процесу, не губляться
+atexit.register(flush_counters)
+
+
+def migrate_json_to_sqlite(
+    json_path: Optional[str] = None,
+    db_path: Optional[str] = None
+) -> int:
+    """
+    Одноразово переносить записи з JSON-файлу до бази SQLite
+
+    Після успішного перенесення JSON-файл перейменовується на
+    "<ім'я>.migrated", щоб повторний запуск нічого не дублював.
+
+    Args:
+        json_path: Шлях до JSON-кешу (за замовчуванням CACHE_FILE)
+        db_path: Шлях до бази (за замовчуванням поруч із CACHE_FILE)
+
+    Returns:
+        Кількість перенесених записів
+    """
+    json_path = json_path or CACHE_FILE
+    if not os.path.exists(json_path):
+        return 0
+
+    source = JsonFileStore(json_path)
+    changes = {}
+    for key, entry in source.items():
+        # Разом з даними переносимо псевдоніми та негативні записи: без
+        # них пошук за назвою чи невідомим містом знову йде в мережу
+        if isinstance(entry, dict) and ("data" in entry or "info" in entry or "expires_at" in entry):
+            changes[key] = entry
+
+    target = SqliteStore(db_path or sqlite_path())
+    try:
+        target.apply(changes)
+    finally:
+        target.close()
+
+    os.replace(json_path, f"{json_path}.migrated")
+    return len(changes)
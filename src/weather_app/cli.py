@@ -2,24 +2,30 @@
 CLI інтерфейс для виведення погоди в консоль
 """
 
-import os
+import contextlib
+import io
 import sys
 import time
-from typing import Dict, Optional
-from . import api, cache, localization
+from typing import Dict, List, Optional, Tuple, Union
+from . import cache, localization, metrics, timings
+from .models import WeatherInfo
+from .scheduler import DEFAULT_JITTER, Scheduler
+from .screen import Screen
 
+# Колонки таблиці режиму --watch з кількома містами: (заголовок, вирівнювання)
+TABLE_COLUMNS = (
+    ("Місто", "<"), ("°C", ">"), ("Відч.", ">"), ("Опис", "<"),
+    ("Волог.", ">"), ("Вітер", ">"), ("Тиск", ">"), ("Оновлено", "<"),
+)
+AUTO_CITY_LABEL = "За IP"
 
-def clear_screen():
-    """Очищає екран консолі"""
-    os.system('cls' if os.name == 'nt' else 'clear')
 
-
-def format_weather_output(weather_info: Dict) -> str:
+def format_weather_output(weather_info: Union[Dict, WeatherInfo]) -> str:
     """
     Форматує дані про погоду для виведення в консоль
 
     Args:
-        weather_info: Словник з інформацією про погоду
+        weather_info: WeatherInfo або словник з інформацією про погоду
 
     Returns:
         Відформатований рядок для виведення
@@ -49,6 +55,143 @@ def format_weather_output(weather_info: Dict) -> str:
     return "\n".join(output)
 
 
+def format_weather_table(rows: List[Tuple[str, Optional[WeatherInfo], str]]) -> str:
+    """
+    Форматує погоду кількох міст однією таблицею
+
+    Args:
+        rows: (назва міста, WeatherInfo або None, стан оновлення)
+
+    Returns:
+        Відформатований рядок для виведення
+    """
+    lines = []
+    for label, info, status in rows:
+        if info is None:
+            lines.append((label, "", "", "…", "", "", "", status))
+            continue
+        lines.append((
+            label,
+            f"{info['temperature']}",
+            f"{info['feels_like']}",
+            localization.translate(info["description"]),
+            f"{info['humidity']}%",
+            f"{info['wind_speed']} км/год",
+            f"{info['pressure']} мбар",
+            status,
+        ))
+
+    headers = tuple(title for title, _ in TABLE_COLUMNS)
+    widths = [max(len(cells[i]) for cells in [headers] + lines) for i in range(len(headers))]
+
+    def format_row(cells):
+        return "  ".join(
+            f"{cell:{align}{width}}" for cell, (_, align), width in zip(cells, TABLE_COLUMNS, widths)
+        ).rstrip()
+
+    total_width = sum(widths) + 2 * (len(widths) - 1)
+    output = []
+    output.append("=" * total_width)
+    output.append(format_row(headers))
+    output.append("-" * total_width)
+    output.extend(format_row(cells) for cells in lines)
+    output.append("=" * total_width)
+
+    return "\n".join(output)
+
+
+def format_cache_stats(stats: Dict) -> str:
+    """
+    Форматує статистику кешу для виведення в консоль
+
+    Args:
+        stats: Результат cache.cache_stats()
+
+    Returns:
+        Відформатований рядок для виведення
+    """
+    output = []
+    output.append("=" * 50)
+    output.append(f"🗄️  Сховище: {stats['backend']} ({stats['path']})")
+    output.append(f"📦 Записів: {stats['entries']}")
+    output.append(f"💾 Обсяг записів: {stats['bytes']} байт")
+    output.append(f"📁 Розмір файлів: {stats['file_bytes']} байт")
+    output.append(f"⌛ Прострочених: {stats['expired']}")
+    if stats.get("aliases"):
+        output.append(f"🔗 Псевдонімів назв: {stats['aliases']}")
+    if stats.get("points"):
+        output.append(f"📍 Точок за координатами: {stats['points']}")
+    if stats.get("negative"):
+        output.append(f"🚫 Невідомих міст: {stats['negative']}")
+    output.append("🕒 Вік записів:")
+    for label, count in stats["ages"].items():
+        output.append(f"   {label:>7}: {count}")
+    counters = stats.get("counters") or {}
+    if counters:
+        output.append("📊 Події:")
+        for name, count in sorted(counters.items()):
+            output.append(f"   {name}: {count}")
+    output.append("=" * 50)
+
+    return "\n".join(output)
+
+
+def format_negative_entries(entries: List[Dict]) -> str:
+    """
+    Форматує негативні записи кешу для виведення в консоль
+
+    Args:
+        entries: Результат cache.list_negative()
+
+    Returns:
+        Відформатований рядок для виведення
+    """
+    if not entries:
+        return "🚫 Невідомих міст у кеші немає"
+    output = [f"🚫 Невідомі міста: {len(entries)}"]
+    width = max(len(str(entry["city"])) for entry in entries)
+    for entry in entries:
+        output.append(
+            f"   {str(entry['city']):<{width}}  ще {int(entry['expires_in'])} с · {entry['message']}"
+        )
+    return "\n".join(output)
+
+
+def format_timings(phases: Dict[str, Dict]) -> str:
+    """
+    Форматує час фаз для виведення в консоль
+
+    Args:
+        phases: Результат timings.snapshot()
+
+    Returns:
+        Відформатований рядок для виведення
+    """
+    output = []
+    output.append("=" * 50)
+    output.append("⏱️  Час фаз:")
+    for name, phase in phases.items():
+        count = f" ×{phase['count']}" if phase["count"] > 1 else ""
+        output.append(f"   {name:<15} {phase['ms']:>10.2f} мс{count}")
+    output.append("=" * 50)
+
+    return "\n".join(output)
+
+
+def report_timings():
+    """
+    Виводить у stderr час фаз, зібраний з останнього звіту, якщо
+    вимірювання увімкнене (--timings), та починає збір заново
+    """
+    if not timings.is_enabled():
+        return
+    if timings.output_format() == "json":
+        timings.emit_json()
+    else:
+        print(format_timings(timings.snapshot()), file=sys.stderr)
+    timings.reset()
+
+
 def print_error(message: str, exit_code: int = 1):
     """
     Виводить повідомлення про помилку та завершує програму
@@ -90,108 +233,551 @@ def get_user_choice() -> Optional[str]:
         else:
             print("❌ Невірний вибір. Спробуйте ще раз.")
 
+
+def fallback_from_cache(city: Optional[str], use_cache: bool = True) -> Optional[WeatherInfo]:
+    """
+    Повертає останній відомий запис кешу незалежно від TTL
+
+    Використовується, коли сервер недоступний або запобіжник відкритий.
+    Виводить позначку з віком даних.
+
+    Args:
+        city: Назва міста або None для автовизначення
+        use_cache: Чи використовувати кеш
+
+    Returns:
+        WeatherInfo або None, якщо в кеші нічого немає
+    """
+    if not use_cache:
+        return None
+    try:
+        hit = cache.lookup_cache(city, ttl=0, stale_ttl=float("inf"))
+        weather_info = hit.info() if hit else None
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    if weather_info is None:
+        return None
+    print(f"⚠️  (сервіс недоступний; показуємо дані {int(hit.age)} с тому)")
+    cache.increment_counter("fallback_served")
+    return weather_info
+
 def fetch_and_display_weather(
     city: Optional[str] = None,
     use_cache: bool = True,
     ttl: int = cache.DEFAULT_TTL,
-    quiet: bool = False
+    quiet: bool = False,
+    stale_ttl: int = 0,
+    refresh_mode: str = "process",
+    lean: bool = False
 ) -> bool:
     """
     Отримує та виводить дані про погоду
 
+    Якщо запис кешу старший за ttl, але молодший за ttl + stale_ttl,
+    він одразу виводиться з позначкою застарілості, а свіжі дані
+    завантажуються у фоні (stale-while-revalidate).
+
     Args:
         city: Назва міста або None для автовизначення
         use_cache: Чи використовувати кеш
         ttl: TTL кешу в секундах
         quiet: Тихий режим (не виводити повідомлення про кеш)
+        stale_ttl: Вікно, протягом якого можна віддати застарілі дані
+        refresh_mode: Як оновлювати застарілі дані: "thread" або "process"
+        lean: Завантажувати лише поточну погоду в компактному форматі
 
     Returns:
         True якщо дані успішно отримано та виведено
     """
-    weather_data = None
-    from_cache = False
+    weather_info = None
 
     # Пробуємо отримати з кешу
     if use_cache:
-        weather_data = cache.get_from_cache(city, ttl)
-        if weather_data:
-            from_cache = True
+        try:
+            hit = cache.lookup_cache(city, ttl, stale_ttl)
+            weather_info = hit.info() if hit else None
+        except (KeyError, IndexError, TypeError, ValueError):
+            # Пошкоджений запис кешу - завантажуємо заново
+            weather_info = None
+        if weather_info and hit.stale:
+            # Віддаємо застарілі дані одразу, а оновлюємо у фоні
+            print(f"⚠️  (застарілі дані, {int(hit.age)} с тому; оновлюємо у фоні)")
+            cache.increment_counter("stale_served")
+            metrics.CACHE_STALE.inc()
+            from . import refresh
+            refresh.schedule_refresh(city, ttl, mode=refresh_mode, lean=lean)
+        elif weather_info:
+            metrics.CACHE_HITS.inc()
             if not quiet:
                 print("📦 (дані з кешу)")
+        else:
+            metrics.CACHE_MISSES.inc()
+
+    # Місто нещодавно не знайдено — відповідаємо без мережі
+    if weather_info is None and use_cache:
+        message = cache.get_negative(city)
+        if message is not None:
+            print_error(f"{message} (збережено в кеші; --cache-purge-negative, щоб забути)", exit_code=2)
+            return False
+
+    # Якщо в кеші немає — запитуємо з API.
+    # Мережевий стек імпортуємо лише тут, щоб влучання в кеш не платило за нього
+    if weather_info is None:
+        from . import api
 
-    # Якщо в кеші немає — запитуємо з API
-    if not weather_data:
         try:
             if not quiet:
                 print("🔄 Завантаження даних...")
-            weather_data = api.get_weather(city)
-
-            # Зберігаємо в кеш
-            if use_cache:
-                cache.set_to_cache(city, weather_data)
+            with metrics.FETCH_DURATION.time():
+                if use_cache:
+                    # Один запит на всі процеси, що одночасно шукають це місто
+                    result = api.fetch_single_flight(city, ttl, lean=lean)
+                else:
+                    result = api.fetch_result(city, lean)
 
         except api.CityNotFoundError as e:
+            metrics.UPSTREAM_ERRORS.inc(labels=("CityNotFoundError",))
             print_error(str(e), exit_code=2)
             return False
         except api.NetworkError as e:
-            print_error(str(e), exit_code=7)
-            return False
+            metrics.UPSTREAM_ERRORS.inc(labels=("NetworkError",))
+            # Сервер недоступний — показуємо останні відомі дані, якщо є
+            weather_info = fallback_from_cache(city, use_cache)
+            if weather_info is None:
+                print_error(str(e), exit_code=7)
+                return False
+            with timings.phase("render"), metrics.RENDER_DURATION.time():
+                print(format_weather_output(weather_info))
+            return True
         except api.InvalidResponseError as e:
+            metrics.UPSTREAM_ERRORS.inc(labels=("InvalidResponseError",))
             print_error(str(e), exit_code=3)
             return False
         except Exception as e:
             print_error(f"Невідома помилка: {str(e)}", exit_code=1)
             return False
 
-    # Витягуємо потрібну інформацію
-    try:
-        weather_info = api.extract_weather_info(weather_data)
-    except (KeyError, ValueError) as e:
-        print_error("Некоректна структура даних від API", exit_code=3)
-        return False
+        # Витягуємо потрібну інформацію
+        try:
+            weather_info = result.weather_info()
+        except (KeyError, IndexError, ValueError) as e:
+            metrics.UPSTREAM_ERRORS.inc(labels=("InvalidResponseError",))
+            print_error("Некоректна структура даних від API", exit_code=3)
+            return False
 
     # Виводимо результат
-    print(format_weather_output(weather_info))
+    with timings.phase("render"), metrics.RENDER_DURATION.time():
+        print(format_weather_output(weather_info))
 
     return True
 
 
+def fetch_and_display_many(
+    cities: List[Optional[str]],
+    use_cache: bool = True,
+    ttl: int = cache.DEFAULT_TTL,
+    max_workers: Optional[int] = None,
+    lean: bool = False
+) -> bool:
+    """
+    Отримує та виводить погоду для кількох міст паралельно
+
+    Args:
+        cities: Список назв міст
+        use_cache: Чи використовувати кеш
+        ttl: TTL кешу в секундах
+        max_workers: Максимальна кількість одночасних запитів
+        lean: Завантажувати лише поточну погоду в компактному форматі
+
+    Returns:
+        True якщо дані для всіх міст успішно отримано та виведено
+    """
+    from . import api
+
+    kwargs = {"use_cache": use_cache, "ttl": ttl, "lean": lean}
+    if max_workers is not None:
+        kwargs["max_workers"] = max_workers
+
+    print(f"🔄 Завантаження даних для {len(cities)} міст...")
+    results = api.get_weather_many(cities, **kwargs)
+
+    success = True
+    for result in results:
+        if result.ok:
+            try:
+                weather_info = result.weather_info()
+            except (KeyError, IndexError, ValueError):
+                print(f"❌ {result.city}: Некоректна структура даних від API", file=sys.stderr)
+                success = False
+                continue
+            with timings.phase("render"):
+                print(format_weather_output(weather_info))
+        else:
+            print(f"❌ {result.city}: {result.error}", file=sys.stderr)
+            success = False
+
+    return success
+
+
+# Коди виходу для помилок, що прийшли від демона, — як у fetch_and_display_weather
+REMOTE_EXIT_CODES = {"CityNotFoundError": 2, "NetworkError": 7, "InvalidResponseError": 3}
+
+
+def display_remote(cities: List[Optional[str]], responses: List[Dict], quiet: bool = False) -> bool:
+    """
+    Виводить відповіді демона так само, як це роблять
+    fetch_and_display_weather (одне місто) та fetch_and_display_many
+
+    Args:
+        cities: Міста в порядку запитів
+        responses: Відповіді демона (див. remote)
+        quiet: Тихий режим (не виводити повідомлення про кеш)
+
+    Returns:
+        True якщо дані для всіх міст успішно отримано та виведено
+    """
+    success = True
+    for city, response in zip(cities, responses):
+        if not response.get("ok"):
+            message = response.get("message") or response.get("error")
+            if len(responses) == 1:
+                print_error(message, exit_code=REMOTE_EXIT_CODES.get(response.get("error"), 1))
+                return False
+            print(f"❌ {city}: {message}", file=sys.stderr)
+            success = False
+            continue
+
+        source = response.get("source")
+        if source == "fallback":
+            print(f"⚠️  (сервіс недоступний; показуємо дані {response.get('age', 0)} с тому)")
+        elif source == "cache" and not quiet:
+            print("📦 (дані з кешу)")
+        with timings.phase("render"), metrics.RENDER_DURATION.time():
+            print(format_weather_output(WeatherInfo.from_dict(response["info"])))
+
+    return success
+
+
+def serve_mode(
+    address: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    queue_size: Optional[int] = None
+):
+    """
+    Запускає локальний демон погоди до натискання Ctrl+C
+
+    Args:
+        address: Шлях до Unix-сокета або "host:port"
+            (за замовчуванням remote.default_address())
+        max_workers: Кількість паралельних завантажень з мережі
+        queue_size: Скільки завантажень може чекати в черзі
+    """
+    from . import daemon, remote
+
+    address = address or remote.default_address()
+    kwargs = {}
+    if max_workers is not None:
+        kwargs["max_workers"] = max_workers
+    if queue_size is not None:
+        kwargs["queue_size"] = queue_size
+
+    try:
+        server = daemon.make_server(address, daemon.WeatherDaemon(**kwargs))
+    except OSError as e:
+        print_error(f"Не вдалося запустити демон на {address}: {e}")
+        return
+
+    import signal
+
+    # SIGTERM зупиняє демон так само, як Ctrl+C, і прибирає файл сокета
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    print(f"🛰️  Демон погоди слухає {address}")
+    print("Натисніть Ctrl+C для виходу")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\n👋 Демон зупинено")
+    finally:
+        server.server_close()
+
+
 def watch_mode(
     city: Optional[str] = None,
     interval: int = 300,
     use_cache: bool = True,
-    ttl: int = cache.DEFAULT_TTL
+    ttl: int = cache.DEFAULT_TTL,
+    stale_ttl: int = 0,
+    lean: bool = False,
+    metrics_port: Optional[int] = None
 ):
     """
     Режим автоматичного оновлення погоди
 
+    Помилка оновлення показується в кадрі й не завершує режим: наступне
+    оновлення запитує дані знову.
+
     Args:
         city: Назва міста або None для автовизначення
         interval: Інтервал оновлення в секундах
         use_cache: Чи використовувати кеш
         ttl: TTL кешу в секундах
+        stale_ttl: Вікно stale-while-revalidate (оновлення у фоновому потоці)
+        lean: Завантажувати лише поточну погоду в компактному форматі
+        metrics_port: Локальний порт для метрик Prometheus (/metrics)
+            або None, щоб не запускати сервер метрик
     """
-    print(f"🔄 Режим автооновлення кожні {interval} секунд")
-    print("Натисніть Ctrl+C для виходу\n")
+    if metrics_port is not None:
+        # Сервер працює у власному потоці й не затримує оновлення
+        try:
+            metrics.serve(metrics_port)
+        except OSError as e:
+            print_error(f"Не вдалося запустити сервер метрик на порту {metrics_port}: {e}")
+            return
+
+    screen = Screen()
+    last_body = None
+    changed_at = ""
 
     try:
         while True:
-            # Очищаємо екран
-            clear_screen()
+            # Збираємо вивід оновлення, щоб показати його одним кадром
+            buffer = io.StringIO()
+            with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer), \
+                    timings.phase("total"):
+                try:
+                    fetch_and_display_weather(
+                        city, use_cache, ttl, quiet=True,
+                        stale_ttl=stale_ttl, refresh_mode="thread", lean=lean
+                    )
+                except SystemExit:
+                    # Помилка оновлення лишається в кадрі, а наступне
+                    # оновлення пробує знову, як у watch_many
+                    pass
+            report_timings()
+
+            # Час показуємо від останньої зміни даних, тож однакові
+            # оновлення дають однаковий кадр і нічого не виводять
+            body = buffer.getvalue().rstrip("\n")
+            if body != last_body:
+                last_body = body
+                changed_at = time.strftime("%H:%M:%S")
+
+            frame = [f"⏰ Оновлено: {changed_at}"]
+            if metrics_port is not None:
+                frame.append(f"📊 Метрики: http://{metrics.DEFAULT_HOST}:{metrics_port}/metrics")
+            frame += ["", body, "", f"⏳ Оновлення кожні {interval} секунд · Ctrl+C — вихід"]
+            screen.render("\n".join(frame))
+
+            # Чекаємо
+            time.sleep(interval)
+
+    except KeyboardInterrupt:
+        print("\n\n👋 Вихід з режиму автооновлення")
+        sys.exit(0)
 
-            # Показуємо час оновлення
-            current_time = time.strftime("%H:%M:%S")
-            print(f"⏰ Оновлено: {current_time}\n")
 
-            # Отримуємо та відображаємо погоду
-            fetch_and_display_weather(city, use_cache, ttl, quiet=True)
+def format_warm_stats(stats: Dict) -> str:
+    """Форматує лічильники Warmer одним рядком"""
+    ratio = stats["hit_ratio"]
+    ratio_text = "—" if ratio is None else f"{ratio:.1%}"
+    return (
+        f"🔥 Оновлено: {stats['refreshes']}, помилок: {stats['errors']} · "
+        f"warm hit ratio: {ratio_text} ({stats['hits']}/{stats['probes']})"
+    )
 
-            # Показуємо таймер до наступного оновлення
-            print(f"\n⏳ Наступне оновлення через {interval} секунд...")
 
-            # Чекаємо
-            time.sleep(interval)
+def warm_mode(
+    cities: List[Optional[str]],
+    ttl: int = cache.DEFAULT_TTL,
+    fraction: Optional[float] = None,
+    jitter: float = DEFAULT_JITTER,
+    max_workers: Optional[int] = None,
+    lean: bool = False
+):
+    """
+    Підігріває кеш для списку міст до натискання Ctrl+C
+
+    Args:
+        cities: Міста для підігріву
+        ttl: TTL записів кешу в секундах
+        fraction: Частка TTL, після якої запис оновлюється
+        jitter: Випадковий зсув оновлень як частка інтервалу
+        max_workers: Максимальна кількість одночасних запитів
+        lean: Завантажувати лише поточну погоду в компактному форматі
+    """
+    from .warmer import Warmer
+
+    kwargs = {"ttl": ttl, "jitter": jitter, "lean": lean}
+    if fraction is not None:
+        kwargs["fraction"] = fraction
+    if max_workers is not None:
+        kwargs["max_workers"] = max_workers
+    try:
+        warmer = Warmer(cities, **kwargs)
+    except ValueError as e:
+        print_error(str(e))
+        return
+
+    print(f"🔥 Підігрів кешу для {len(warmer.cities)} міст, TTL {ttl} с")
+    print("Натисніть Ctrl+C для виходу")
+
+    def report(count: int):
+        print(f"{time.strftime('%H:%M:%S')} {format_warm_stats(warmer.stats())}")
+
+    try:
+        warmer.run(on_batch=report)
+    except KeyboardInterrupt:
+        print(f"\n\n{format_warm_stats(warmer.stats())}")
+        print("👋 Вихід з режиму підігріву")
+        sys.exit(0)
+
+
+def fetch_city_result(city: Optional[str], use_cache: bool, ttl: int, lean: bool):
+    """
+    Отримує результат для одного міста, не друкуючи нічого
+
+    Виконується в пулі потоків watch_many: читає кеш і за потреби
+    завантажує дані, але в кеш не пише — це робить потік планувальника,
+    як у api.get_weather_many.
+
+    Returns:
+        api.WeatherResult з даними або з помилкою
+    """
+    from . import api
+
+    if use_cache:
+        result = api.result_from_cache(city, ttl)
+        if result is not None:
+            return result
+    try:
+        with metrics.FETCH_DURATION.time():
+            return api.fetch_result(city, lean)
+    except Exception as e:
+        return api.WeatherResult(city, error=e)
+
+
+def watch_many(
+    cities: List[Tuple[Optional[str], int]],
+    use_cache: bool = True,
+    ttl: int = cache.DEFAULT_TTL,
+    lean: bool = False,
+    max_workers: Optional[int] = None,
+    jitter: float = DEFAULT_JITTER,
+    metrics_port: Optional[int] = None
+):
+    """
+    Режим автооновлення для кількох міст в одному процесі
+
+    Планувальник на купі тримає час наступного оновлення кожного міста
+    з власним інтервалом і випадковим зсувом. Оновлення виконуються в
+    обмеженому пулі потоків, тож повільне місто не затримує інших, а
+    результати виводяться однією таблицею після кожного оновлення.
+
+    Args:
+        cities: Пари (назва міста або None для автовизначення, інтервал у секундах)
+        use_cache: Чи використовувати кеш
+        ttl: TTL кешу в секундах
+        lean: Завантажувати лише поточну погоду в компактному форматі
+        max_workers: Максимальна кількість одночасних запитів
+        jitter: Частка інтервалу для випадкового зсуву оновлень
+        metrics_port: Локальний порт для метрик Prometheus або None
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from . import api
+
+    if metrics_port is not None:
+        try:
+            metrics.serve(metrics_port)
+        except OSError as e:
+            print_error(f"Не вдалося запустити сервер метрик на порту {metrics_port}: {e}")
+            return
+
+    # Одне місто — один рядок, навіть якщо його вказали кілька разів
+    jobs: Dict[str, Tuple[Optional[str], int]] = {}
+    for city, interval in cities:
+        jobs.setdefault(cache.get_cache_key(city), (city, interval))
+
+    scheduler = Scheduler()
+    for key, (city, interval) in jobs.items():
+        scheduler.add(key, interval, jitter)
+
+    rows: Dict[str, Tuple[Optional[WeatherInfo], str]] = {key: (None, "очікування") for key in jobs}
+    workers = max(1, min(max_workers or api.DEFAULT_MAX_WORKERS, len(jobs)))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    in_flight = {}
+
+    screen = Screen()
+    changed_at = time.strftime("%H:%M:%S")
+
+    def render():
+        with timings.phase("render"), metrics.RENDER_DURATION.time():
+            frame = [f"⏰ Оновлено: {changed_at} · міст: {len(jobs)}"]
+            if metrics_port is not None:
+                frame.append(f"📊 Метрики: http://{metrics.DEFAULT_HOST}:{metrics_port}/metrics")
+            frame += ["", format_weather_table([
+                (city if city is not None else AUTO_CITY_LABEL, *rows[key])
+                for key, (city, _) in jobs.items()
+            ]), "", "Натисніть Ctrl+C для виходу"]
+            # Однаковий кадр не виводиться, змінені рядки переписуються на місці
+            screen.render("\n".join(frame))
+
+    def apply(key: str, result) -> bool:
+        """Оновлює рядок міста; повертає True, якщо рядок змінився"""
+        previous = rows[key]
+        if result.ok:
+            try:
+                info = result.weather_info()
+            except (KeyError, IndexError, ValueError):
+                result.error = api.InvalidResponseError("Некоректна структура даних від API")
+        if not result.ok:
+            if not result.from_cache:
+                metrics.UPSTREAM_ERRORS.inc(labels=(api.error_class(result.error),))
+                if use_cache:
+                    # Невідоме місто запам'ятовується як негативний запис
+                    api.cache_result(result, ttl)
+            # Залишаємо останні відомі дані з позначкою помилки
+            rows[key] = (previous[0], f"❌ {result.error}")
+            return rows[key] != previous
+        if use_cache:
+            if result.from_cache:
+                metrics.CACHE_HITS.inc()
+            else:
+                metrics.CACHE_MISSES.inc()
+                # Пишемо в кеш з одного потоку, щоб уникнути гонок
+                api.cache_result(result, ttl)
+        if previous[0] == info and not previous[1].startswith("❌"):
+            # Ті самі дані: час у рядку лишається часом останньої зміни
+            return False
+        rows[key] = (info, time.strftime("%H:%M:%S"))
+        return True
+
+    render()
+    try:
+        while True:
+            for key in scheduler.pop_due():
+                city = jobs[key][0]
+                future = executor.submit(fetch_city_result, city, use_cache, ttl, lean)
+                in_flight[future] = key
+
+            next_due = scheduler.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - scheduler.clock())
+            if not in_flight:
+                time.sleep(timeout)
+                continue
+
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            changed = False
+            for future in done:
+                key = in_flight.pop(future)
+                changed = apply(key, future.result()) or changed
+                # Наступне оновлення рахуємо від завершення поточного
+                scheduler.schedule(key)
+            if changed:
+                changed_at = time.strftime("%H:%M:%S")
+                render()
 
     except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
         print("\n\n👋 Вихід з режиму автооновлення")
         sys.exit(0)
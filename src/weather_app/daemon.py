@@ -0,0 +1,255 @@
+"""
+Локальний демон погоди: довгоживучий процес із теплим кешем
+
+Кожен запуск ./weather.sh платить за старт інтерпретатора, імпорти,
+розбір файлу кешу та нове TLS-з'єднання. Демон (src/main.py --serve)
+тримає все це в пам'яті: шар кешу в пам'яті, пул з'єднань спільного
+WeatherClient і таблицю запитів, що вже виконуються, тож одночасні
+запити одного міста йдуть до сервера один раз.
+
+Завантаження з мережі виконує фіксований пул потоків з обмеженою
+чергою. Коли черга повна, запит одразу отримує відповідь "Overloaded"
+замість того, щоб чекати: клієнт тоді працює у власному процесі.
+Протокол описано в remote.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from . import api, cache, remote
+from .api import error_class
+
+
+DEFAULT_QUEUE_SIZE = 64  # завантажень, що чекають на вільний потік
+
+
+def error_response(error: str, message: str) -> Dict:
+    """Відповідь з помилкою: error — ім'я класу, message — текст для користувача"""
+    return {"ok": False, "error": error, "message": message}
+
+
+def _resolved(response: Dict) -> Future:
+    future = Future()
+    future.set_result(response)
+    return future
+
+
+class WeatherDaemon:
+    """
+    Виконує запити клієнтів: кеш, дедуплікація, обмежена черга
+
+    Читання кешу відбувається одразу в потоці з'єднання, а промахи
+    стають у чергу пулу потоків. Усі звернення до кешу йдуть під одним
+    блокуванням: сховища кешу не розраховані на одночасних записувачів.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = api.DEFAULT_MAX_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        client: Optional[api.WeatherClient] = None,
+    ):
+        """
+        Args:
+            max_workers: Кількість потоків для завантажень з мережі
+            queue_size: Скільки завантажень може чекати на вільний потік
+            client: Клієнт для запитів (за замовчуванням спільний)
+        """
+        self.client = client
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._in_flight: Dict[Tuple[str, bool, bool], Future] = {}
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        for index in range(max_workers):
+            threading.Thread(target=self._work, name=f"weather-daemon-{index}", daemon=True).start()
+
+    def submit(self, request: Dict) -> Future:
+        """
+        Приймає запит клієнта
+
+        Args:
+            request: {"city", "ttl", "lean", "cache"} (див. remote)
+
+        Returns:
+            Future з відповіддю; для того самого міста з тими самими
+            lean і cache, що вже завантажується, — той самий Future
+        """
+        city = request.get("city")
+        try:
+            ttl = int(request.get("ttl", cache.DEFAULT_TTL))
+        except (TypeError, ValueError):
+            ttl = None
+        if ttl is None or (city is not None and not isinstance(city, str)):
+            return _resolved(error_response(remote.BAD_REQUEST, "Некоректний запит"))
+        lean = bool(request.get("lean", False))
+        use_cache = bool(request.get("cache", True))
+
+        if use_cache:
+            with self._cache_lock:
+                result = api.result_from_cache(city, ttl)
+            if result is not None:
+                return _resolved(self._respond(result, "cache"))
+
+        # Запит без кешу не отримує результат запиту, що може відповісти з кешу
+        key = (cache.get_cache_key(city), lean, use_cache)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            try:
+                self._queue.put_nowait((key, city, ttl, lean, use_cache, future))
+            except queue.Full:
+                return _resolved(error_response(remote.OVERLOADED, "Черга демона переповнена"))
+            self._in_flight[key] = future
+        return future
+
+    def pending(self) -> int:
+        """Кількість завантажень, що чекають на вільний потік"""
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            key, city, ttl, lean, use_cache, future = self._queue.get()
+            try:
+                response = self._fetch(city, ttl, lean, use_cache)
+            except Exception as e:
+                response = error_response(error_class(e), f"Невідома помилка: {e}")
+            with self._lock:
+                del self._in_flight[key]
+            future.set_result(response)
+
+    def _fetch(self, city: Optional[str], ttl: int, lean: bool, use_cache: bool) -> Dict:
+        try:
+            result = api.fetch_result(city, lean, self.client)
+            response = self._respond(result, "network")
+        except api.NetworkError as e:
+            # Сервер недоступний — віддаємо останні відомі дані, якщо є
+            hit = None
+            if use_cache:
+                with self._cache_lock:
+                    hit = cache.lookup_cache(city, ttl=0, stale_ttl=float("inf"))
+            if hit is None:
+                return error_response(error_class(e), str(e))
+            return {"ok": True, "info": hit.info().to_dict(), "source": "fallback", "age": int(hit.age)}
+        except api.CityNotFoundError as e:
+            if use_cache:
+                # Повторні запити хибної назви отримають відповідь без мережі
+                with self._cache_lock:
+                    cache.set_negative(city, str(e))
+            return error_response(error_class(e), str(e))
+        except api.InvalidResponseError as e:
+            return error_response(error_class(e), str(e))
+        if response["ok"] and use_cache:
+            with self._cache_lock:
+                api.cache_result(result, ttl)
+        return response
+
+    @staticmethod
+    def _respond(result: api.WeatherResult, source: str) -> Dict:
+        if not result.ok:
+            return error_response(error_class(result.error), str(result.error))
+        try:
+            info = result.weather_info()
+        except (KeyError, IndexError, ValueError):
+            return error_response("InvalidResponseError", "Некоректна структура даних від API")
+        return {"ok": True, "info": info.to_dict(), "source": source}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """З'єднання клієнта: читає запити, поки відповіді на попередні ще готуються"""
+
+    def handle(self):
+        replies: "queue.Queue" = queue.Queue()
+        writer = threading.Thread(target=self._write, args=(replies,), daemon=True)
+        writer.start()
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            if not isinstance(request, dict):
+                replies.put((None, _resolved(error_response(remote.BAD_REQUEST, "Некоректний запит"))))
+                continue
+            try:
+                future = self.server.weather.submit(request)
+            except Exception as e:
+                # Без відповіді на цей запит писач чекав би на неї вічно
+                future = _resolved(error_response(error_class(e), f"Невідома помилка: {e}"))
+            replies.put((request.get("id"), future))
+        replies.put(None)
+        writer.join()
+
+    def _write(self, replies: "queue.Queue"):
+        # Відповіді йдуть у порядку запитів, навіть якщо готові не в ньому
+        while True:
+            item = replies.get()
+            if item is None:
+                return
+            request_id, future = item
+            response = dict(future.result(), id=request_id)
+            try:
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            except OSError:
+                return
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def server_close(self):
+            super().server_close()
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+
+
+def make_server(address: str, weather: WeatherDaemon) -> socketserver.BaseServer:
+    """
+    Створює сервер демона на Unix-сокеті або localhost TCP
+
+    Залишений після аварійної зупинки файл сокета видаляється.
+
+    Args:
+        address: Шлях до Unix-сокета або "host:port" (див. remote.parse_address)
+        weather: Обробник запитів
+
+    Returns:
+        Сервер; запускається через serve_forever()
+
+    Raises:
+        OSError: Якщо адреса зайнята (зокрема іншим демоном)
+    """
+    family, target = remote.parse_address(address)
+    if family == socket.AF_INET:
+        server = _TCPServer(target, _Handler)
+    else:
+        if os.path.exists(target):
+            sock = remote.connect(target)
+            if sock is not None:
+                sock.close()
+                raise OSError(f"демон уже слухає {target}")
+            os.unlink(target)
+        # Сокет доступний лише власнику
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(target, _Handler)
+        finally:
+            os.umask(umask)
+    server.weather = weather
+    return server
@@ -0,0 +1,130 @@
+"""
+Координати та просторовий індекс для пошуку найближчого запису кешу
+
+Запит за координатами ("50.4501,30.5234") з трохи іншою точкою дає
+інший ключ кешу. Щоб не ходити в мережу за кожною такою точкою, кеш
+шукає актуальний запис у межах радіуса.
+
+Точки розкладені по комірках сітки зі стороною GRID_CELL_KM (за
+широтою). Сховище зберігає комірку разом із записом, тож пошук у
+радіусі читає лише комірки, що перетинають квадрат навколо точки
+(grid_window), і його вартість залежить від кількості точок поблизу,
+а не від їх загальної кількості.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180  # ~111.2 км на градус широти
+COORDINATE_PRECISION = 4  # знаків після коми в ключі точки (~11 м)
+# Сторона комірки сітки. Комірки зберігаються в сховищі, тож після зміни
+# значення старі записи шукатимуться в чужих комірках, доки не оновляться
+GRID_CELL_KM = 5.0
+GRID_CELL_DEG = GRID_CELL_KM / KM_PER_DEGREE
+
+
+def check_coordinates(lat: float, lon: float):
+    """
+    Перевіряє, що координати лежать у допустимих межах
+
+    Raises:
+        ValueError: Якщо широта поза [-90, 90] або довгота поза [-180, 180]
+    """
+    if not -90 <= lat <= 90:
+        raise ValueError(f"Широта {lat} поза межами [-90, 90]")
+    if not -180 <= lon <= 180:
+        raise ValueError(f"Довгота {lon} поза межами [-180, 180]")
+
+
+def format_coordinates(lat: float, lon: float) -> str:
+    """
+    Формує місце запиту "lat,lon", яке розуміє wttr.in
+
+    Raises:
+        ValueError: Для координат поза допустимими межами
+    """
+    lat, lon = float(lat), float(lon)
+    check_coordinates(lat, lon)
+    return f"{lat:.{COORDINATE_PRECISION}f},{lon:.{COORDINATE_PRECISION}f}"
+
+
+def parse_coordinates(text: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Розбирає місце запиту "lat,lon"
+
+    Returns:
+        (широта, довгота) або None, якщо рядок — не координати
+    """
+    if not text:
+        return None
+    lat, sep, lon = text.partition(",")
+    if not sep:
+        return None
+    try:
+        point = float(lat), float(lon)
+    except ValueError:
+        # Назва на кшталт "kyiv,ua"
+        return None
+    if not all(math.isfinite(value) for value in point):
+        return None
+    try:
+        check_coordinates(*point)
+    except ValueError:
+        return None
+    return point
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Відстань між двома точками по поверхні Землі в кілометрах"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def grid_cell(lat: float, lon: float) -> Tuple[int, int]:
+    """Комірка сітки (рядок, стовпець), у яку потрапляє точка"""
+    return math.floor(lat / GRID_CELL_DEG), math.floor(lon / GRID_CELL_DEG)
+
+
+def grid_window(lat: float, lon: float, radius_km: float) -> Tuple[Tuple[int, int], List[Tuple[int, int]]]:
+    """
+    Комірки сітки, що перетинають квадрат навколо точки
+
+    Args:
+        lat: Широта центру
+        lon: Довгота центру
+        radius_km: Радіус пошуку в кілометрах
+
+    Returns:
+        ((перший, останній рядок), [(перший, останній стовпець), ...]);
+        кілька діапазонів стовпців — коли квадрат перетинає меридіан 180°
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    # Градус довготи найкоротший на ближчому до полюса краї квадрата
+    cos_lat = math.cos(math.radians(min(90.0, abs(lat) + dlat)))
+    dlon = dlat / cos_lat if cos_lat > 1e-9 else 360.0
+
+    rows = (math.floor((lat - dlat) / GRID_CELL_DEG), math.floor((lat + dlat) / GRID_CELL_DEG))
+    if dlon >= 180:
+        spans = [(-180.0, 180.0)]
+    else:
+        spans = []
+        for shift in (-360.0, 0.0, 360.0):
+            low, high = lon - dlon + shift, lon + dlon + shift
+            if high >= -180 and low <= 180:
+                spans.append((max(low, -180.0), min(high, 180.0)))
+    columns = [
+        (math.floor(low / GRID_CELL_DEG), math.floor(high / GRID_CELL_DEG))
+        for low, high in spans
+    ]
+    return rows, columns
+
+
+def in_window(cell: Tuple[int, int], rows: Tuple[int, int], columns: List[Tuple[int, int]]) -> bool:
+    """Чи потрапляє комірка у вікно grid_window()"""
+    row, column = cell
+    return rows[0] <= row <= rows[1] and any(low <= column <= high for low, high in columns)
@@ -0,0 +1,200 @@
+"""
+Частковий потоковий розбір JSON-відповідей j1
+
+Відповідь j1 — це об'єкт з ключами current_condition, nearest_area,
+request та weather, де weather (прогноз на три дні погодинно) займає
+більшу частину документа. CLI потрібні лише перші два ключі, тож
+extract_fields читає тіло шматками, розбирає лише потрібні значення,
+інші пропускає без побудови об'єктів і зупиняється, щойно знайдено
+все потрібне.
+
+Якщо встановлено orjson, значення розбираються ним, інакше — json.
+"""
+
+import json
+import re
+from typing import Callable, Dict, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # необов'язкова залежність
+    orjson = None
+
+
+J1_FIELDS = ("current_condition", "nearest_area")
+
+LOADERS: Dict[str, Callable] = {"json": json.loads}
+if orjson is not None:
+    LOADERS["orjson"] = orjson.loads
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+_WHITESPACE = b" \t\r\n"
+# Рядок JSON повністю, з екранованими символами
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Усе до наступної дужки поза рядками
+_SKIP = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+
+
+def _error(message: str, pos: int):
+    return json.JSONDecodeError(message, "", pos)
+
+
+class _Reader:
+    """
+    Буфер над ітератором шматків тіла
+
+    Уже прочитану частину буфера відкидаємо, тож у пам'яті тримається
+    лише незакінчене значення, яке зараз зберігається (mark), або
+    поточний шматок.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self.buf = bytearray()
+        self.pos = 0
+        self.mark: Optional[int] = None
+        self.consumed = 0  # байт відкинуто з початку буфера
+
+    def more(self) -> bool:
+        """Дочитує наступний шматок; False — дані скінчилися"""
+        start = self.pos if self.mark is None else self.mark
+        if start:
+            del self.buf[:start]
+            self.consumed += start
+            self.pos -= start
+            if self.mark is not None:
+                self.mark = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buf += chunk
+                return True
+        return False
+
+    def peek(self) -> Optional[int]:
+        """Пропускає пробіли; повертає наступний байт або None в кінці"""
+        while True:
+            buf = self.buf
+            while self.pos < len(buf) and buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(buf):
+                return buf[self.pos]
+            if not self.more():
+                return None
+
+    def expect(self, char: bytes):
+        if self.peek() != char[0]:
+            raise _error(f"Очікувався символ {char.decode()!r}", self.consumed + self.pos)
+        self.pos += 1
+
+    def skip_string(self):
+        """Пересуває pos за кінець рядка, що починається з лапок у pos"""
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                return
+            if not self.more():
+                raise _error("Незавершений рядок", self.consumed + self.pos)
+
+    def skip_value(self):
+        """Пересуває pos за кінець значення, що починається з pos"""
+        first = self.peek()
+        if first is None:
+            raise _error("Очікувалося значення", self.consumed + self.pos)
+        if first == ord('"'):
+            self.skip_string()
+            return
+        if first not in b"{[":
+            # Число, true, false або null
+            while True:
+                match = _SCALAR_END.search(self.buf, self.pos)
+                if match is not None:
+                    self.pos = match.start()
+                    return
+                self.pos = len(self.buf)
+                if not self.more():
+                    return
+
+        # Об'єкт або масив: одним регулярним виразом проскакуємо все,
+        # крім дужок поза рядками, і лише дужки рахуємо в Python.
+        # Коректність вкладених значень перевіряє loads для збережених
+        # значень; пропущені значення не розбираються зовсім.
+        depth = 0
+        while True:
+            end = _SKIP.match(self.buf, self.pos).end()
+            if end == len(self.buf) or self.buf[end] == ord('"'):
+                # Кінець буфера або рядок, що не вмістився в буфер
+                self.pos = end
+                if not self.more():
+                    raise _error("Незавершене значення", self.consumed + self.pos)
+                continue
+            self.pos = end + 1
+            if self.buf[end] in b"{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def read_value(self, loads: Callable):
+        """Розбирає значення, що починається з pos"""
+        self.peek()
+        self.mark = self.pos
+        self.skip_value()
+        raw = bytes(self.buf[self.mark:self.pos])
+        self.mark = None
+        return loads(raw)
+
+
+def extract_fields(
+    chunks: Iterable[bytes],
+    fields: Iterable[str] = J1_FIELDS,
+    loads: Optional[Callable] = None,
+) -> Dict:
+    """
+    Розбирає лише вказані ключі верхнього рівня JSON-об'єкта
+
+    Args:
+        chunks: Тіло відповіді шматками (наприклад, response.iter_content())
+        fields: Потрібні ключі верхнього рівня
+        loads: Функція розбору значень (за замовчуванням JSON_BACKEND)
+
+    Returns:
+        Словник лише з тими з fields, що є в документі. Після того як
+        знайдено всі ключі, решта тіла не читається.
+
+    Raises:
+        json.JSONDecodeError: Якщо документ не є коректним JSON-об'єктом
+    """
+    if loads is None:
+        loads = LOADERS[JSON_BACKEND]
+    wanted = set(fields)
+    result: Dict = {}
+    reader = _Reader(chunks)
+
+    reader.expect(b"{")
+    if reader.peek() == ord("}"):
+        return result
+
+    while wanted:
+        if reader.peek() != ord('"'):
+            raise _error("Очікувався ключ", reader.consumed + reader.pos)
+        key = reader.read_value(loads)
+        reader.expect(b":")
+
+        if key in wanted:
+            result[key] = reader.read_value(loads)
+            wanted.discard(key)
+        else:
+            reader.skip_value()
+
+        separator = reader.peek()
+        if separator == ord(","):
+            reader.pos += 1
+        elif separator == ord("}"):
+            break
+        else:
+            raise _error("Очікувалася кома або кінець об'єкта", reader.consumed + reader.pos)
+
+    return result
@@ -0,0 +1,77 @@
+"""
+Міжпроцесні блокування ключів кешу на файлах (fcntl)
+
+Коли запис популярного міста застаріває, лише один процес іде до
+wttr.in, а решта чекають на блокування і потім читають щойно
+записаний запис.
+"""
+
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from . import cache, timings
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокування не підтримуються
+    fcntl = None
+
+
+LOCK_DIR_NAME = "locks"
+DEFAULT_LOCK_TIMEOUT = 15.0  # секунд очікування на чужий запит
+POLL_INTERVAL = 0.02
+
+
+class LockTimeout(Exception):
+    """Не вдалося отримати блокування за відведений час"""
+    pass
+
+
+def lock_path(key: str) -> str:
+    """Шлях до файлу блокування ключа поруч із кешем"""
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(os.path.dirname(cache.CACHE_FILE), LOCK_DIR_NAME, f"{digest}.lock")
+
+
+@contextmanager
+def key_lock(key: str, timeout: Optional[float] = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+    """
+    Тримає ексклюзивне блокування ключа кешу
+
+    Файли блокувань не видаляються: видалення файлу, на якому вже
+    чекає інший процес, зламало б взаємне виключення.
+
+    Args:
+        key: Ключ кешу
+        timeout: Скільки секунд чекати (0 — не чекати, None — без обмеження)
+
+    Raises:
+        LockTimeout: Якщо блокування тримає інший процес довше за timeout
+    """
+    if fcntl is None:
+        yield
+        return
+
+    path = lock_path(key)
+    cache.ensure_dir(path)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with timings.phase("lock.wait"):
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise LockTimeout(f"Блокування '{key}' зайняте")
+                    time.sleep(POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
@@ -0,0 +1,259 @@
+"""
+Метрики для довготривалого режиму --watch у текстовому форматі Prometheus
+
+Лічильники та гістограми живуть у пам'яті процесу й оновлюються з
+cli та api. serve() віддає їх за адресою /metrics з фонового потоку,
+тож збирання метрик не затримує цикл оновлення.
+
+Приклад:
+    ./weather.sh --watch 60 --city Kyiv --metrics-port 9108
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_HOST = "127.0.0.1"  # лише локальний доступ
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Межі кошиків гістограм у секундах
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Екранує значення мітки: зворотна коса риска, лапки, новий рядок"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Лічильник, що лише зростає; може мати мітки (ім'я отримує суфікс _total)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name if name.endswith("_total") else f"{name}_total"
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {} if labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, labels: Tuple[str, ...] = ()):
+        """
+        Збільшує лічильник
+
+        Args:
+            amount: На скільки збільшити
+            labels: Значення міток у порядку labelnames
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def reset(self):
+        with self._lock:
+            self._values = {} if self.labelnames else {(): 0}
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            (self.name, dict(zip(self.labelnames, labels)), value)
+            for labels, value in items
+        ]
+
+
+class Histogram:
+    """Гістограма тривалостей з накопичувальними кошиками"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def observe(self, value: float):
+        """Додає одне спостереження (у секундах)"""
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def time(self) -> "_Timer":
+        """Контекстний менеджер, що спостерігає тривалість блоку"""
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self.buckets)
+            self._sum = 0.0
+            self._count = 0
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            samples.append((f"{self.name}_bucket", {"le": _format_value(bound)}, cumulative))
+        samples.append((f"{self.name}_bucket", {"le": "+Inf"}, count))
+        samples.append((f"{self.name}_sum", {}, total))
+        samples.append((f"{self.name}_count", {}, count))
+        return samples
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+FETCH_DURATION = Histogram(
+    "weather_fetch_duration_seconds",
+    "Час завантаження погоди з wttr.in, включно з помилками",
+)
+CACHE_HITS = Counter("weather_cache_hits", "Актуальні записи, віддані з кешу")
+CACHE_MISSES = Counter("weather_cache_misses", "Запити, для яких у кеші не було даних")
+CACHE_STALE = Counter("weather_cache_stale_served", "Застарілі записи, віддані з оновленням у фоні")
+UPSTREAM_ERRORS = Counter(
+    "weather_upstream_errors",
+    "Помилки отримання погоди за класом",
+    labelnames=("class",),
+)
+RECEIVED_BYTES = Counter("weather_received_bytes", "Байт тіла відповідей wttr.in (після розпакування)")
+RENDER_DURATION = Histogram(
+    "weather_render_duration_seconds",
+    "Час форматування та виведення погоди",
+    buckets=RENDER_BUCKETS,
+)
+
+REGISTRY = (
+    FETCH_DURATION, CACHE_HITS, CACHE_MISSES, CACHE_STALE,
+    UPSTREAM_ERRORS, RECEIVED_BYTES, RENDER_DURATION,
+)
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """
+    Поточний обсяг резидентної пам'яті процесу
+
+    Returns:
+        RSS у байтах (з /proc на Linux; деінде — пікове значення з
+        getrusage) або None, якщо визначити не вдалося
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: кілобайти на Linux, байти на macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def render() -> str:
+    """Усі метрики у текстовому форматі Prometheus"""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    rss = resident_memory_bytes()
+    if rss is not None:
+        lines.append("# HELP process_resident_memory_bytes Резидентна пам'ять процесу в байтах")
+        lines.append("# TYPE process_resident_memory_bytes gauge")
+        lines.append(f"process_resident_memory_bytes {rss}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Обнуляє всі метрики (для тестів)"""
+    for metric in REGISTRY:
+        metric.reset()
+
+
+def serve(port: int, host: str = DEFAULT_HOST):
+    """
+    Запускає HTTP-сервер метрик у фоновому потоці
+
+    Args:
+        port: Порт (0 — будь-який вільний)
+        host: Адреса для прослуховування
+
+    Returns:
+        Сервер; адреса — server.server_address, зупинка — server.shutdown()
+
+    Raises:
+        OSError: Якщо порт зайнятий
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="weather-metrics", daemon=True)
+    thread.start()
+    return server
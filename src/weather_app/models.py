@@ -0,0 +1,193 @@
+"""
+Типізовані записи з даними про погоду
+"""
+
+from typing import Dict, Optional
+
+
+class ValidationError(ValueError):
+    """Відповідь API не містить обов'язкового поля або має іншу структуру"""
+
+    def __init__(self, field: str, message: str = "відсутнє або некоректне"):
+        """
+        Args:
+            field: Шлях до поля, що не пройшло перевірку,
+                наприклад "current_condition[0].temp_C"
+            message: Опис проблеми
+        """
+        super().__init__(f"{field}: {message}")
+        self.field = field
+
+
+def to_int(value: Optional[str]) -> int:
+    """Безпечне перетворення в int"""
+    if value is None:
+        return 0
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+class WeatherInfo:
+    """
+    Поточна погода в місті — лише поля, які показує CLI
+
+    Компактна заміна повної відповіді j1: саме цей запис зберігається
+    в кеші в режимі "compact". Підтримує доступ як до словника
+    (info["city"], info.get("country")), тож його можна передавати
+    туди, де раніше очікувався результат extract_weather_info.
+    """
+
+    __slots__ = (
+        "city",
+        "country",
+        "temperature",
+        "feels_like",
+        "description",
+        "humidity",
+        "wind_speed",
+        "pressure",
+    )
+
+    def __init__(
+        self,
+        city: str,
+        country: str = "",
+        temperature: int = 0,
+        feels_like: int = 0,
+        description: str = "",
+        humidity: int = 0,
+        wind_speed: int = 0,
+        pressure: int = 0,
+    ):
+        self.city = city
+        self.country = country
+        self.temperature = temperature
+        self.feels_like = feels_like
+        self.description = description
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.pressure = pressure
+
+    @classmethod
+    def from_data(cls, data: Dict) -> "WeatherInfo":
+        """
+        Витягує запис з повної відповіді API (format=j1)
+
+        Raises:
+            ValidationError: Якщо відсутні обов'язкові поля
+        """
+        return parse_weather(data)
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> "WeatherInfo":
+        """Створює запис зі словника (наприклад, з кешу)"""
+        return cls(**{name: values[name] for name in cls.__slots__ if name in values})
+
+    def to_dict(self) -> Dict:
+        """Повертає поля запису у вигляді словника"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_data(self) -> Dict:
+        """
+        Відтворює мінімальну відповідь j1 з полів запису
+
+        Містить лише current_condition та nearest_area — те, що читає
+        from_data, — без прогнозу.
+        """
+        return {
+            "current_condition": [{
+                "temp_C": str(self.temperature),
+                "FeelsLikeC": str(self.feels_like),
+                "weatherDesc": [{"value": self.description}],
+                "humidity": str(self.humidity),
+                "windspeedKmph": str(self.wind_speed),
+                "pressure": str(self.pressure),
+            }],
+            "nearest_area": [{
+                "areaName": [{"value": self.city}],
+                "country": [{"value": self.country}],
+            }],
+        }
+
+    def __getitem__(self, name: str):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default=None):
+        if name not in self.__slots__:
+            return default
+        return getattr(self, name)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, WeatherInfo):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"WeatherInfo({self.city!r}, {self.temperature}°C, {self.description!r})"
+
+
+def _first(container: Dict, key: str, path: str) -> Dict:
+    """Перший елемент непорожнього списку словників container[key]"""
+    items = container.get(key)
+    if not isinstance(items, list) or not items or not isinstance(items[0], dict):
+        raise ValidationError(path + key)
+    return items[0]
+
+
+def _first_value(container: Dict, key: str, path: str) -> str:
+    """Непорожнє значення container[key][0]["value"]"""
+    value = _first(container, key, path).get("value")
+    if not value:
+        raise ValidationError(f"{path}{key}[0].value")
+    return value
+
+
+def parse_weather(data: Dict) -> WeatherInfo:
+    """
+    Перевіряє відповідь API (format=j1) і витягує WeatherInfo за один прохід
+
+    Обов'язкові поля ті самі, що перевіряє api.validate_weather_data:
+    current_condition[0].temp_C, опис погоди та назва міста. Інші числові
+    поля за відсутності дорівнюють 0, країна — порожньому рядку.
+
+    Args:
+        data: Повні дані від API
+
+    Returns:
+        WeatherInfo з поточною погодою
+
+    Raises:
+        ValidationError: З шляхом до першого поля, що не пройшло перевірку
+    """
+    if not isinstance(data, dict):
+        raise ValidationError("<root>", "очікувався JSON-об'єкт")
+    current = _first(data, "current_condition", "")
+    area = _first(data, "nearest_area", "")
+
+    temperature = current.get("temp_C")
+    if temperature is None:
+        raise ValidationError("current_condition[0].temp_C")
+    description = _first_value(current, "weatherDesc", "current_condition[0].")
+    city = _first_value(area, "areaName", "nearest_area[0].")
+
+    countries = area.get("country")
+    country = ""
+    if isinstance(countries, list) and countries and isinstance(countries[0], dict):
+        country = countries[0].get("value") or ""
+
+    return WeatherInfo(
+        city=city,
+        country=country,
+        temperature=to_int(temperature),
+        feels_like=to_int(current.get("FeelsLikeC")),
+        description=description,
+        humidity=to_int(current.get("humidity")),
+        wind_speed=to_int(current.get("windspeedKmph")),
+        pressure=to_int(current.get("pressure")),
+    )
@@ -0,0 +1,209 @@
+"""
+Фонове оновлення кешу для stale-while-revalidate
+
+Коли CLI віддає застарілий запис, свіжі дані завантажуються у фоні:
+у потоці для довготривалих процесів (watch) або в окремому
+від'єднаному процесі для одноразових запусків, щоб не затримувати вихід.
+
+Дані завантажуються тим самим шляхом, що й основний запит
+(api.fetch_result та api.cache_result), тож оновлення з --lean
+отримує компактну відповідь, а не повний j1.
+
+Запуск окремим процесом:
+    python -m weather_app.refresh --city Kyiv --ttl 300
+"""
+
+import argparse
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+from . import api, cache, locking
+
+if TYPE_CHECKING:
+    import subprocess
+
+
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+
+def refresh(city: Optional[str], ttl: int = cache.DEFAULT_TTL, lean: bool = False) -> bool:
+    """
+    Завантажує свіжі дані та записує їх у кеш
+
+    Args:
+        city: Назва міста або None для автовизначення
+        ttl: TTL кешу в секундах
+        lean: Завантажувати лише поточну погоду (LEAN_FORMAT)
+
+    Returns:
+        True якщо кеш оновлено
+    """
+    try:
+        # Якщо цей ключ уже оновлює інший процес — не дублюємо запит
+        with locking.key_lock(cache.get_cache_key(city), timeout=0):
+            try:
+                result = api.fetch_result(city, lean)
+            except api.CityNotFoundError as e:
+                api.cache_result(api.WeatherResult(city, error=e), ttl)
+                raise
+            api.cache_result(result, ttl)
+    except locking.LockTimeout:
+        return False
+    except (api.NetworkError, api.CityNotFoundError, api.InvalidResponseError):
+        cache.increment_counter("stale_refresh_failed")
+        return False
+    cache.increment_counter("stale_refreshed")
+    return True
+
+
+def refresh_in_thread(
+    city: Optional[str],
+    ttl: int = cache.DEFAULT_TTL,
+    lean: bool = False
+) -> Optional[threading.Thread]:
+    """
+    Запускає оновлення у фоновому потоці
+
+    Повторний виклик для ключа, який уже оновлюється, нічого не робить.
+
+    Returns:
+        Потік оновлення або None, якщо оновлення вже триває
+    """
+    key = cache.get_cache_key(city)
+    with _in_flight_lock:
+        if key in _in_flight:
+            return None
+        _in_flight.add(key)
+
+    def run():
+        try:
+            refresh(city, ttl, lean)
+        finally:
+            with _in_flight_lock:
+                _in_flight.discard(key)
+
+    thread = threading.Thread(target=run, name=f"refresh-{key}", daemon=True)
+    thread.start()
+    return thread
+
+
+def refresh_command(city: Optional[str], ttl: int = cache.DEFAULT_TTL, lean: bool = False) -> List[str]:
+    """Формує команду запуску оновлення з поточними налаштуваннями кешу"""
+    command = [
+        sys.executable, "-m", "weather_app.refresh",
+        "--ttl", str(ttl),
+        "--cache-dir", os.path.abspath(os.path.dirname(cache.CACHE_FILE)),
+        "--cache-backend", cache.CACHE_BACKEND,
+        "--cache-mode", cache.CACHE_MODE,
+        "--stale-ttl", str(cache.STALE_TTL),
+        "--negative-ttl", str(cache.NEGATIVE_TTL),
+        "--radius", str(cache.GEO_RADIUS_KM),
+        "--fallback-ttl", str(cache.FALLBACK_TTL),
+        "--cache-max-entries", str(cache.MAX_ENTRIES),
+        "--cache-max-bytes", str(cache.MAX_BYTES),
+    ]
+    if lean:
+        command.append("--lean")
+    if city:
+        command += ["--city", city]
+    return command
+
+
+def spawn_refresh_process(
+    city: Optional[str],
+    ttl: int = cache.DEFAULT_TTL,
+    lean: bool = False
+) -> Optional["subprocess.Popen"]:
+    """
+    Запускає оновлення у від'єднаному процесі, який переживе CLI
+
+    Returns:
+        Запущений процес або None, якщо запустити не вдалося
+    """
+    import subprocess
+
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (package_root, env.get("PYTHONPATH")) if p
+    )
+
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        kwargs["start_new_session"] = True
+
+    try:
+        return subprocess.Popen(
+            refresh_command(city, ttl, lean),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            close_fds=True,
+            **kwargs
+        )
+    except OSError:
+        return None
+
+
+def schedule_refresh(
+    city: Optional[str],
+    ttl: int = cache.DEFAULT_TTL,
+    mode: str = "process",
+    lean: bool = False
+):
+    """
+    Запускає фонове оновлення обраним способом
+
+    Args:
+        city: Назва міста або None для автовизначення
+        ttl: TTL кешу в секундах
+        mode: "thread" для довготривалих процесів, "process" для
+            одноразових запусків
+        lean: Завантажувати лише поточну погоду, як і основний запит
+    """
+    if mode == "thread":
+        return refresh_in_thread(city, ttl, lean)
+    return spawn_refresh_process(city, ttl, lean)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входу для запуску оновлення окремим процесом"""
+    parser = argparse.ArgumentParser(description="Фонове оновлення кешу погоди")
+    parser.add_argument('--city')
+    parser.add_argument('--ttl', type=int, default=cache.DEFAULT_TTL)
+    parser.add_argument('--cache-dir')
+    parser.add_argument('--cache-backend', choices=cache.BACKENDS, default=cache.CACHE_BACKEND)
+    parser.add_argument('--cache-mode', choices=cache.CACHE_MODES, default=cache.CACHE_MODE)
+    parser.add_argument('--stale-ttl', type=int, default=cache.STALE_TTL)
+    parser.add_argument('--negative-ttl', type=int, default=cache.NEGATIVE_TTL)
+    parser.add_argument('--radius', type=float, default=cache.GEO_RADIUS_KM)
+    parser.add_argument('--fallback-ttl', type=int, default=cache.FALLBACK_TTL)
+    parser.add_argument('--cache-max-entries', type=int, default=cache.MAX_ENTRIES)
+    parser.add_argument('--cache-max-bytes', type=int, default=cache.MAX_BYTES)
+    parser.add_argument('--lean', action='store_true')
+    args = parser.parse_args(argv)
+
+    cache.configure(
+        backend=args.cache_backend,
+        cache_dir=args.cache_dir,
+        mode=args.cache_mode,
+        stale_ttl=args.stale_ttl,
+        negative_ttl=args.negative_ttl,
+        geo_radius=args.radius,
+        fallback_ttl=args.fallback_ttl,
+        max_entries=args.cache_max_entries,
+        max_bytes=args.cache_max_bytes
+    )
+    return 0 if refresh(args.city, args.ttl, args.lean) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Тонкий клієнт локального демона погоди (див. daemon)
+
+Модуль імпортує лише json, os та socket, тож запуск CLI, що отримує
+дані від демона, не платить за мережевий стек, розбір файлу кешу чи
+нове TLS-з'єднання. Якщо демон не запущений, fetch_weather() повертає
+None, і CLI працює як раніше — у власному процесі.
+
+Протокол: один JSON-об'єкт на рядок в обидва боки. Запит —
+{"id", "city", "ttl", "lean", "cache"}, відповідь —
+{"id", "ok", "info", "source", "age"} або {"id", "ok": false, "error",
+"message"}. Клієнт надсилає всі запити одразу (pipelining), а демон
+відповідає в тому самому порядку.
+"""
+
+import json
+import os
+import socket
+from typing import Dict, List, Optional, Tuple, Union
+
+
+DEFAULT_TCP_ADDRESS = "127.0.0.1:8765"  # для систем без Unix-сокетів
+CONNECT_TIMEOUT = 0.5  # секунди на з'єднання з демоном
+# Копія api.DEFAULT_CONNECT_TIMEOUT + api.DEFAULT_READ_TIMEOUT: імпорт api
+# потягнув би мережевий стек. Найдовше законне очікування відповіді —
+# одне завантаження демоном; довше мовчить лише демон, що завис, і тоді
+# краще одразу завантажити дані самому.
+API_TIMEOUT = 3.05 + 10
+DEFAULT_TIMEOUT = API_TIMEOUT + 0.5  # секунди на кожну відповідь демона
+OVERLOADED = "Overloaded"  # черга демона переповнена
+BAD_REQUEST = "BadRequest"
+
+
+def default_address() -> str:
+    """
+    Адреса демона: $WEATHER_DAEMON або Unix-сокет користувача
+
+    Returns:
+        Шлях до Unix-сокета або "host:port"
+    """
+    address = os.environ.get("WEATHER_DAEMON")
+    if address:
+        return address
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "getuid"):
+        return DEFAULT_TCP_ADDRESS
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(runtime_dir, f"weather-app-{os.getuid()}.sock")
+
+
+def parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """
+    Розбирає адресу демона
+
+    "host:port" (або ":port") — TCP, усе інше — шлях до Unix-сокета
+
+    Returns:
+        (сімейство сокета, адреса для connect/bind)
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and os.sep not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def connect(address: Optional[str] = None, timeout: float = CONNECT_TIMEOUT) -> Optional[socket.socket]:
+    """
+    З'єднується з демоном
+
+    Returns:
+        Сокет або None, якщо демон не запущений
+    """
+    family, target = parse_address(address or default_address())
+    try:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+    except (AttributeError, OSError):
+        return None
+    sock.settimeout(timeout)
+    try:
+        sock.connect(target)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(
+    messages: List[Dict],
+    address: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Optional[List[Dict]]:
+    """
+    Надсилає запити демону одним пакетом і читає відповіді
+
+    Args:
+        messages: Запити (поле id додається автоматично)
+        address: Адреса демона (за замовчуванням default_address())
+        timeout: Скільки секунд чекати на кожну відповідь
+
+    Returns:
+        Відповіді в порядку запитів або None, якщо демон недоступний
+    """
+    sock = connect(address)
+    if sock is None:
+        return None
+    payload = b"".join(
+        json.dumps(dict(message, id=index)).encode("utf-8") + b"\n"
+        for index, message in enumerate(messages)
+    )
+    with sock:
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as reader:
+                return [json.loads(reader.readline()) for _ in messages]
+        except (OSError, ValueError):
+            # Демон зупинився чи не відповів вчасно — працюємо без нього
+            return None
+
+
+def fetch_weather(
+    cities: List[Optional[str]],
+    use_cache: bool,
+    ttl: int,
+    lean: bool = False,
+    address: Optional[str] = None,
+) -> Optional[List[Dict]]:
+    """
+    Отримує погоду для міст через демон
+
+    Returns:
+        Відповіді в порядку міст або None, якщо демон недоступний
+    """
+    return request(
+        [{"city": city, "ttl": ttl, "lean": lean, "cache": use_cache} for city in cities],
+        address,
+    )
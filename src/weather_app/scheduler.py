@@ -0,0 +1,109 @@
+"""
+Планувальник оновлень для режиму --watch з кількома містами
+
+Купа (heapq) тримає час наступного оновлення кожного ключа, тож
+вибір наступного завдання коштує O(log n) незалежно від кількості
+міст. Кожен ключ має власний інтервал, а випадковий зсув (jitter)
+розносить оновлення в часі, щоб міста з однаковим інтервалом не
+йшли до сервера одночасно.
+"""
+
+import heapq
+import itertools
+import random
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+DEFAULT_JITTER = 0.1  # частка інтервалу для випадкового зсуву
+
+
+class Scheduler:
+    """
+    Черга оновлень із власним інтервалом для кожного ключа
+
+    Ключ, вийнятий через pop_due(), не повертається в чергу, доки не
+    викликано schedule(): так оновлення, що ще триває, не запускається
+    вдруге.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            clock: Монотонне джерело часу
+            rng: Генератор випадкових чисел для зсуву (для відтворюваності)
+        """
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = itertools.count()
+        self._jobs: Dict[Hashable, Tuple[float, float]] = {}
+
+    def add(self, key: Hashable, interval: float, jitter: float = DEFAULT_JITTER,
+            delay: float = 0.0):
+        """
+        Додає ключ; перше оновлення — через delay секунд
+
+        Args:
+            key: Ключ (наприклад, назва міста)
+            interval: Інтервал оновлення в секундах
+            jitter: Частка інтервалу, на яку випадково зсувається
+                кожне наступне оновлення (0 — без зсуву)
+            delay: Затримка першого оновлення в секундах
+
+        Raises:
+            ValueError: Для неправильного інтервалу або зсуву
+        """
+        if interval <= 0:
+            raise ValueError(f"Інтервал має бути додатнім: {interval}")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"Зсув має бути в межах [0, 1): {jitter}")
+        self._jobs[key] = (interval, jitter)
+        self._push(key, self.clock() + delay)
+
+    def schedule(self, key: Hashable, now: Optional[float] = None) -> float:
+        """
+        Планує наступне оновлення ключа через його інтервал від now
+
+        Returns:
+            Час наступного оновлення
+        """
+        interval, jitter = self._jobs[key]
+        if now is None:
+            now = self.clock()
+        spread = interval * jitter
+        due = now + interval + (self.rng.uniform(-spread, spread) if spread else 0.0)
+        self._push(key, due)
+        return due
+
+    def next_due(self) -> Optional[float]:
+        """Час найближчого оновлення або None, якщо черга порожня"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Виймає всі ключі, час яких настав, у порядку їхнього часу
+
+        Returns:
+            Список ключів (порожній, якщо ще рано)
+        """
+        if now is None:
+            now = self.clock()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def interval(self, key: Hashable) -> float:
+        return self._jobs[key][0]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, key: Hashable, due: float):
+        # Лічильник розв'язує нічиї, щоб heapq не порівнював самі ключі
+        heapq.heappush(self._heap, (due, next(self._counter), key))
@@ -0,0 +1,93 @@
+"""
+Інкрементальне виведення кадрів режиму --watch
+
+Замість очищення екрана через os.system('clear') на кожному оновленні
+Screen пам'ятає попередній кадр і за допомогою ANSI-послідовностей
+керування курсором переписує лише рядки, що змінилися. Однаковий кадр
+не виводиться зовсім. Якщо stdout — не термінал (файл, канал), кадри
+виводяться звичайним текстом, лише коли вони змінюються.
+"""
+
+import os
+import sys
+from typing import List, Optional, TextIO
+
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_TO_END = "\x1b[J"
+CLEAR_LINE_END = "\x1b[K"
+
+
+def move_to(row: int) -> str:
+    """Переміщує курсор на початок рядка row (з 1)"""
+    return f"\x1b[{row};1H"
+
+
+def supports_ansi(stream: TextIO) -> bool:
+    """True, якщо stream — термінал, що розуміє ANSI-послідовності"""
+    try:
+        if not stream.isatty():
+            return False
+    except (AttributeError, ValueError):
+        return False
+    return os.environ.get("TERM") != "dumb"
+
+
+class Screen:
+    """Виводить кадри, переписуючи лише змінені рядки"""
+
+    def __init__(self, stream: Optional[TextIO] = None, ansi: Optional[bool] = None):
+        """
+        Args:
+            stream: Куди виводити (за замовчуванням sys.stdout)
+            ansi: Використовувати ANSI-послідовності (None — визначити
+                за тим, чи stream є терміналом)
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.ansi = supports_ansi(self.stream) if ansi is None else ansi
+        self._lines: Optional[List[str]] = None
+        if self.ansi and os.name == "nt":
+            # Вмикає обробку ANSI-послідовностей у консолі Windows 10+
+            os.system("")
+
+    def render(self, frame: str) -> bool:
+        """
+        Виводить кадр
+
+        Args:
+            frame: Текст кадру (рядки через \\n)
+
+        Returns:
+            False, якщо кадр такий самий, як попередній, і нічого не виведено
+        """
+        lines = frame.split("\n")
+        if lines == self._lines:
+            return False
+
+        if not self.ansi:
+            self.stream.write(frame + "\n")
+        elif self._lines is None:
+            # Перший кадр: очищаємо екран один раз
+            self.stream.write(CLEAR_SCREEN + frame + "\n")
+        else:
+            self.stream.write(self._diff(self._lines, lines))
+        self.stream.flush()
+        self._lines = lines
+        return True
+
+    def reset(self):
+        """Забуває попередній кадр: наступний буде виведено повністю"""
+        self._lines = None
+
+    @staticmethod
+    def _diff(old: List[str], new: List[str]) -> str:
+        """ANSI-послідовність, що перетворює екран зі старого кадру на новий"""
+        parts = []
+        for index, line in enumerate(new):
+            if index >= len(old) or old[index] != line:
+                parts.append(move_to(index + 1) + line + CLEAR_LINE_END)
+        # Прибираємо хвіст довшого попереднього кадру
+        parts.append(move_to(len(new) + 1))
+        if len(old) > len(new):
+            parts.append(CLEAR_TO_END)
+        return "".join(parts)
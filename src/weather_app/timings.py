@@ -0,0 +1,160 @@
+"""
+Вимірювання часу фаз отримання погоди (--timings)
+
+Фази позначаються контекстним менеджером phase(name). Поки вимірювання
+вимкнене, phase повертає спільний порожній менеджер, тож інструментований
+код платить лише за виклик функції та перевірку прапорця.
+
+Назви фаз:
+    cache.read      читання запису кешу (сховище та кеш у пам'яті)
+    cache.write     запис у кеш
+    lock.wait       очікування блокування ключа (single-flight)
+    breaker         читання/запис стану запобіжника
+    http.setup      імпорт HTTP-стеку та створення сесії
+    http.wait       від надсилання запиту до заголовків відповіді:
+                    DNS, TCP/TLS (для нового з'єднання) та очікування сервера
+    http.body       читання тіла відповіді
+    http.stream     потокове читання тіла разом з частковим розбором
+    parse.json      розбір JSON
+    parse.validate  перевірка та витягування полів
+    render          форматування та виведення
+    total           уся команда (у режимі --watch — один цикл оновлення)
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import Dict, Optional, TextIO
+
+
+OUTPUTS = ("text", "json")
+
+_enabled = False
+_output = "text"
+_lock = threading.Lock()
+# Назва фази → [сумарний час у секундах, кількість]
+_totals: Dict[str, list] = {}
+
+
+class _NullPhase:
+    """Порожній менеджер для вимкненого вимірювання"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Phase:
+    """Вимірює час блоку та додає його до підсумків фази"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def enable(output: str = "text"):
+    """
+    Вмикає вимірювання та очищає попередні підсумки
+
+    Args:
+        output: Формат звіту: "text" (таблиця) або "json" (один рядок)
+
+    Raises:
+        ValueError: Для невідомого формату
+    """
+    global _enabled, _output
+    if output not in OUTPUTS:
+        raise ValueError(f"Невідомий формат вимірювань: {output}")
+    reset()
+    _output = output
+    _enabled = True
+
+
+def disable():
+    """Вимикає вимірювання; зібрані підсумки залишаються"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def output_format() -> str:
+    """Формат звіту, заданий у enable()"""
+    return _output
+
+
+def reset():
+    """Очищає зібрані підсумки"""
+    with _lock:
+        _totals.clear()
+
+
+def phase(name: str):
+    """
+    Контекстний менеджер для вимірювання фази
+
+    Args:
+        name: Назва фази (див. опис модуля)
+    """
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def record(name: str, seconds: float):
+    """
+    Додає виміряний окремо час до фази (наприклад, response.elapsed)
+
+    Args:
+        name: Назва фази
+        seconds: Тривалість у секундах
+    """
+    if not _enabled:
+        return
+    with _lock:
+        total = _totals.get(name)
+        if total is None:
+            _totals[name] = [seconds, 1]
+        else:
+            total[0] += seconds
+            total[1] += 1
+
+
+def snapshot() -> Dict[str, Dict]:
+    """
+    Повертає підсумки у порядку першого виміру кожної фази
+
+    Returns:
+        Назва фази → {"ms": сумарний час у мілісекундах, "count": кількість}
+    """
+    with _lock:
+        return {
+            name: {"ms": round(seconds * 1000, 3), "count": count}
+            for name, (seconds, count) in _totals.items()
+        }
+
+
+def emit_json(stream: Optional[TextIO] = None):
+    """Пише підсумки одним рядком JSON (за замовчуванням у stderr)"""
+    stream = stream if stream is not None else sys.stderr
+    print(json.dumps({"timings": snapshot()}, ensure_ascii=False), file=stream)
@@ -0,0 +1,164 @@
+"""
+Попереднє оновлення кешу (refresh-ahead) для відомого списку міст
+
+Кожне місто оновлюється на частці TTL (за замовчуванням 80%), тож
+запис замінюється свіжим ще до того, як застаріє, і читачі майже не
+бачать промахів. Черговість тримає Scheduler з випадковим зсувом,
+завантаження виконує обмежений пул потоків, а записи в кеш (через
+cache.set_to_cache) робить лише потік, що викликав run(): сховища
+кешу не розраховані на одночасних записувачів.
+
+Перед кожним оновленням Warmer перевіряє кеш так, як це зробив би
+читач; частка таких перевірок, що влучили в актуальний запис, — це
+warm hit ratio.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from . import api, cache
+from .scheduler import DEFAULT_JITTER, Scheduler
+
+
+DEFAULT_REFRESH_FRACTION = 0.8  # частка TTL, після якої запис оновлюється
+
+
+class Warmer:
+    """Тримає записи кешу для списку міст постійно актуальними"""
+
+    def __init__(
+        self,
+        cities: List[Optional[str]],
+        ttl: int = cache.DEFAULT_TTL,
+        fraction: float = DEFAULT_REFRESH_FRACTION,
+        jitter: float = DEFAULT_JITTER,
+        max_workers: int = api.DEFAULT_MAX_WORKERS,
+        lean: bool = False,
+        client: Optional[api.WeatherClient] = None,
+        scheduler: Optional[Scheduler] = None,
+    ):
+        """
+        Args:
+            cities: Міста для підігріву (None — автовизначення за IP)
+            ttl: TTL записів кешу в секундах
+            fraction: Частка TTL, після якої запис оновлюється
+            jitter: Випадковий зсув оновлень як частка інтервалу
+            max_workers: Максимальна кількість одночасних запитів
+            lean: Завантажувати лише поточну погоду (LEAN_FORMAT)
+            client: Клієнт для запитів (за замовчуванням спільний)
+            scheduler: Планувальник (для тестів — з підробленим годинником)
+
+        Raises:
+            ValueError: Якщо оновлення зі зсувом може статися пізніше за TTL
+        """
+        if not 0 < fraction * (1 + jitter) < 1:
+            raise ValueError(
+                f"Оновлення має відбуватися до кінця TTL: частка {fraction}, зсув {jitter}"
+            )
+        self.ttl = ttl
+        self.lean = lean
+        self.client = client
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.max_workers = max(1, max_workers)
+
+        self.cities: Dict[str, Optional[str]] = {}
+        for city in cities:
+            self.cities.setdefault(cache.get_cache_key(city), city)
+        for key in self.cities:
+            self.scheduler.add(key, ttl * fraction, jitter)
+
+        self._warmed = set()
+        self.refreshes = 0
+        self.errors = 0
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: str) -> bool:
+        """
+        Перевіряє запис міста так, як це зробив би читач
+
+        Перше заповнення кешу не рахується: до нього запис і не мав бути.
+
+        Returns:
+            True, якщо запис актуальний
+        """
+        hit = cache.lookup_cache(self.cities[key], self.ttl) is not None
+        if key in self._warmed:
+            self.probes += 1
+            self.hits += hit
+        return hit
+
+    def apply(self, key: str, result: api.WeatherResult) -> bool:
+        """
+        Записує завантажений результат у кеш
+
+        Returns:
+            True, якщо запис оновлено
+        """
+        self._warmed.add(key)
+        if not result.ok:
+            self.errors += 1
+            # Невідоме місто стає негативним записом для читачів
+            api.cache_result(result, self.ttl)
+            return False
+        api.cache_result(result, self.ttl)
+        self.refreshes += 1
+        return True
+
+    def stats(self) -> Dict:
+        """Лічильники підігріву та warm hit ratio (None, доки немає перевірок)"""
+        return {
+            "cities": len(self.cities),
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_ratio": self.hits / self.probes if self.probes else None,
+        }
+
+    def run(
+        self,
+        stop: Optional[Callable[[], bool]] = None,
+        on_batch: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Оновлює записи до виклику stop() == True або KeyboardInterrupt
+
+        Args:
+            stop: Перевіряється після кожної пачки оновлень
+            on_batch: Викликається після кожної пачки з кількістю
+                завершених оновлень
+        """
+        workers = min(self.max_workers, len(self.cities))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        in_flight = {}
+        try:
+            while not (stop and stop()):
+                for key in self.scheduler.pop_due():
+                    self.probe(key)
+                    future = executor.submit(self._fetch, self.cities[key])
+                    in_flight[future] = key
+
+                next_due = self.scheduler.next_due()
+                timeout = None if next_due is None else max(0.0, next_due - self.scheduler.clock())
+                if not in_flight:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    self.apply(key, future.result())
+                    # Наступне оновлення рахуємо від завершення поточного
+                    self.scheduler.schedule(key)
+                if done and on_batch:
+                    on_batch(len(done))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, city: Optional[str]) -> api.WeatherResult:
+        try:
+            return api.fetch_result(city, self.lean, self.client)
+        except Exception as e:
+            return api.WeatherResult(city, error=e)
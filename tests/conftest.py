@@ -0,0 +1,40 @@
+import pytest
+
+from src.weather_app import cache
+from src.weather_app.cache import MemoryTier
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    """Point the file cache (and breaker/lock files next to it) at a temporary directory"""
+    cache_file = tmp_path / ".cache" / "weather.json"
+    monkeypatch.setattr(cache, "CACHE_FILE", str(cache_file))
+    return cache_file
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, tmp_cache, monkeypatch):
+    """Run the test against both stores, with a fresh memory tier and no pending LRU touches"""
+    monkeypatch.setattr(cache, "CACHE_BACKEND", request.param)
+    monkeypatch.setattr(cache, "_memory", MemoryTier())
+    monkeypatch.setattr(cache, "_pending_access", {})
+    return request.param
+
+
+@pytest.fixture
+def weather_payload():
+    """Minimal valid j1 payload"""
+    return {
+        "current_condition": [{
+            "temp_C": "25",
+            "FeelsLikeC": "28",
+            "weatherDesc": [{"value": "Sunny"}],
+            "humidity": "60",
+            "windspeedKmph": "10",
+            "pressure": "1013"
+        }],
+        "nearest_area": [{
+            "areaName": [{"value": "Kyiv"}],
+            "country": [{"value": "Ukraine"}]
+        }]
+    }
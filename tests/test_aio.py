@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from src.weather_app.aio import aget_weather, aget_weather_many
+from src.weather_app.api import (
+    CircuitOpenError,
+    NetworkError,
+    CityNotFoundError,
+    InvalidResponseError,
+    extract_weather_info,
+)
+from src.weather_app.breaker import CircuitBreaker
+from loadtest.stub_server import StubWttr
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_aget_weather_success(weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        data = run(aget_weather("Kyiv", base_url=stub.url))
+    assert data == weather_payload
+    assert extract_weather_info(data)["city"] == "Kyiv"
+
+
+def test_aget_weather_quotes_spaces(weather_payload):
+    with StubWttr({"/New York": (200, weather_payload)}) as stub:
+        assert run(aget_weather("New York", base_url=stub.url)) == weather_payload
+
+
+def test_aget_weather_chunked_body(weather_payload):
+    with StubWttr({"/": (200, weather_payload)}, chunked=True) as stub:
+        assert run(aget_weather(None, base_url=stub.url)) == weather_payload
+
+
+def test_aget_weather_404():
+    with StubWttr() as stub:
+        with pytest.raises(CityNotFoundError, match="Місто 'Atlantis' не розпізнано"):
+            run(aget_weather("Atlantis", base_url=stub.url))
+
+
+def test_aget_weather_http_error():
+    with StubWttr({"/City": (503, "busy")}) as stub:
+        with pytest.raises(NetworkError, match="HTTP код відповіді: 503"):
+            run(aget_weather("City", base_url=stub.url))
+
+
+def test_aget_weather_not_json():
+    with StubWttr({"/City": (200, "<html>")}) as stub:
+        with pytest.raises(InvalidResponseError, match="не JSON"):
+            run(aget_weather("City", base_url=stub.url))
+
+
+def test_aget_weather_empty_nearest_area(weather_payload):
+    weather_payload["nearest_area"] = []
+    with StubWttr({"/City": (200, weather_payload)}) as stub:
+        with pytest.raises(CityNotFoundError):
+            run(aget_weather("City", base_url=stub.url))
+
+
+def test_aget_weather_invalid_payload():
+    payload = {"nearest_area": [{"areaName": [{"value": "City"}]}]}
+    with StubWttr({"/City": (200, payload)}) as stub:
+        with pytest.raises(InvalidResponseError, match="Відсутні обов'язкові поля"):
+            run(aget_weather("City", base_url=stub.url))
+
+
+def test_aget_weather_deadline(weather_payload):
+    with StubWttr({"/Slow": (200, weather_payload)}, delay=0.5) as stub:
+        with pytest.raises(NetworkError, match="Таймаут"):
+            run(aget_weather("Slow", base_url=stub.url, deadline=0.1))
+
+
+def test_aget_weather_connection_refused():
+    with pytest.raises(NetworkError, match="Помилка з'єднання"):
+        run(aget_weather("Kyiv", base_url="http://127.0.0.1:9", deadline=2))
+
+
+def test_aget_weather_cancellation(weather_payload):
+    async def scenario(url):
+        task = asyncio.ensure_future(aget_weather("Slow", base_url=url))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with StubWttr({"/Slow": (200, weather_payload)}, delay=0.5) as stub:
+        run(scenario(stub.url))
+
+
+def test_aget_weather_many_limits_concurrency(tmp_cache, weather_payload):
+    routes = {f"/city{i}": (200, weather_payload) for i in range(8)}
+    with StubWttr(routes, delay=0.05) as stub:
+        results = run(aget_weather_many(
+            [f"city{i}" for i in range(8)], max_concurrency=2, base_url=stub.url
+        ))
+    assert all(r.ok for r in results)
+    assert stub.peak_active <= 2
+
+
+def test_aget_weather_many_dedup_cache_and_errors(tmp_cache, weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        results = run(aget_weather_many(["Kyiv", "kyiv", "Atlantis"], base_url=stub.url))
+        again = run(aget_weather_many(["Kyiv"], base_url=stub.url))
+    assert stub.count("/Kyiv") == 1
+    assert results[0] is results[1]
+    assert isinstance(results[2].error, CityNotFoundError)
+    assert again[0].from_cache
+
+
+def test_aget_weather_records_failures_in_breaker():
+    breaker = CircuitBreaker(failure_threshold=1)
+    with StubWttr({"/Kyiv": (500, "oops")}) as stub:
+        with pytest.raises(NetworkError):
+            run(aget_weather("Kyiv", base_url=stub.url, breaker=breaker))
+        with pytest.raises(CircuitOpenError):
+            run(aget_weather("Kyiv", base_url=stub.url, breaker=breaker))
+    assert stub.count("/Kyiv") == 1
+
+
+def test_aget_weather_many_skips_network_while_breaker_is_open(tmp_cache, weather_payload):
+    opened = CircuitBreaker(failure_threshold=1)
+    opened.record_failure()
+    with StubWttr({"/Kyiv": (200, weather_payload), "/Lviv": (200, weather_payload)}) as stub:
+        # The default breaker reads the state shared through the cache directory
+        results = run(aget_weather_many(["Kyiv", "Lviv"], base_url=stub.url))
+    assert stub.count() == 0
+    assert all(isinstance(r.error, CircuitOpenError) for r in results)
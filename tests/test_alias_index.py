@@ -0,0 +1,113 @@
+import copy
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli
+from src.weather_app.breaker import CircuitBreaker
+from src.weather_app.cache import MemoryTier
+from loadtest.stub_server import StubWttr
+
+KYIV_KEY = "@kyiv|ukraine|50.45,30.52"
+
+
+@pytest.fixture
+def located(weather_payload):
+    """Build a payload whose nearest_area carries coordinates"""
+    def make(temp="25", lat="50.450", lon="30.523"):
+        data = copy.deepcopy(weather_payload)
+        data["current_condition"][0]["temp_C"] = temp
+        data["nearest_area"][0].update(latitude=lat, longitude=lon)
+        return data
+    return make
+
+
+def keys():
+    return sorted(key for key, _ in cache.get_store().items())
+
+
+def test_canonical_key():
+    area = {"areaName": [{"value": "Kyiv "}], "country": [{"value": "Ukraine"}],
+            "latitude": "50.4547", "longitude": "30.5238"}
+    assert cache.canonical_key({"nearest_area": [area]}) == KYIV_KEY
+    del area["latitude"]
+    assert cache.canonical_key({"nearest_area": [area]}) is None
+    assert cache.canonical_key(None) is None
+
+
+def test_aliases_share_one_entry(backend, located):
+    for name in ("Kyiv", "Kiev", "Київ"):
+        cache.set_to_cache(name, located(), now=1000.0)
+    assert keys() == sorted([KYIV_KEY, "kyiv", "kiev", "київ"])
+    assert cache.get_store().get("kiev")["alias"] == KYIV_KEY
+
+    # A refresh through any alias is visible through all of them
+    cache.set_to_cache("Kiev", located(temp="30"), now=1010.0)
+    assert cache.get_from_cache("Kyiv", now=1020.0)["current_condition"][0]["temp_C"] == "30"
+    assert cache.lookup_cache("Київ", now=1020.0).key == KYIV_KEY
+    assert cache.cache_stats(now=1020.0)["aliases"] == 3
+
+
+def test_alias_lookup_reads_json_store_once(located, monkeypatch):
+    monkeypatch.setattr(cache, "_memory", MemoryTier(max_entries=0))
+    cache.set_to_cache("Kiev", located(), now=1000.0)
+    store = cache.get_store()
+    with mock.patch.object(store, "load", wraps=store.load) as load:
+        assert cache.lookup_cache("Kiev", now=1010.0).key == KYIV_KEY
+    assert load.call_count == 1
+
+
+def test_repeated_write_keeps_current_alias(backend, located):
+    cache.set_to_cache("Kiev", located(), now=1000.0)
+    store = cache.get_store()
+    with mock.patch.object(store, "apply", wraps=store.apply) as apply:
+        cache.set_to_cache("Kiev", located(temp="30"), now=1010.0)
+    assert list(apply.call_args.args[0]) == [KYIV_KEY]
+    assert cache.get_from_cache("Kiev", now=1020.0)["current_condition"][0]["temp_C"] == "30"
+
+    # Past half of ALIAS_TTL the alias is written again
+    later = 1000.0 + cache.ALIAS_TTL / 2 + 1
+    cache.set_to_cache("Kiev", located(), now=later)
+    assert cache.get_store().get("kiev")["cached_at"] == later
+
+
+def test_compact_mode_stores_info_under_canonical_key(backend, located, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_MODE", "compact")
+    cache.set_to_cache("kyiv,ua", located())
+    assert "info" in cache.get_store().get(KYIV_KEY)
+    assert cache.get_info_from_cache("kyiv,ua").temperature == 25
+
+
+def test_auto_and_coordinate_free_entries_keep_plain_keys(backend, located, weather_payload):
+    cache.set_to_cache(None, located())
+    cache.set_to_cache("Kyiv", weather_payload)
+    assert keys() == ["AUTO", "kyiv"]
+
+
+def test_expired_canonical_entry_is_a_miss(backend, located):
+    cache.set_to_cache("Kiev", located(), now=1000.0, ttl=60)
+    assert cache.get_from_cache("Kiev", ttl=60, now=1100.0) is None
+
+
+def test_known_alias_skips_network(located):
+    with StubWttr({"/Kyiv": (200, located()), "/Kiev": (200, located())}) as stub:
+        client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+        previous = api.set_default_client(client)
+        try:
+            api.get_weather_many(["Kyiv"])
+            api.get_weather_many(["Kiev"])
+            # The canonical entry was refreshed through "Kiev"; "Kyiv" still hits it
+            results = api.get_weather_many(["Kyiv", "Kiev"])
+        finally:
+            api.set_default_client(previous)
+            client.close()
+    assert all(result.from_cache for result in results)
+    assert stub.count() == 2
+    assert "🔗 Псевдонімів назв: 2" in cli.format_cache_stats(cache.cache_stats())
+
+
+def test_aliases_survive_migration_to_sqlite(located, monkeypatch):
+    cache.set_to_cache("Kiev", located(), now=1000.0)
+    assert cache.migrate_json_to_sqlite() == 2
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    monkeypatch.setattr(cache, "_memory", MemoryTier())
+    assert cache.get_from_cache("Kiev", now=1010.0)["current_condition"][0]["temp_C"] == "25"
+    assert cache.lookup_cache("kiev", now=1010.0).key == KYIV_KEY
@@ -0,0 +1,51 @@
+import json
+from benchmarks import suite
+
+
+def make_results(**timings):
+    return {"meta": {}, "results": {name: {"ns_per_op": ns} for name, ns in timings.items()}}
+
+
+def test_compare_flags_only_slowdowns_over_threshold():
+    baseline = make_results(a=100.0, b=100.0, c=100.0, gone=1.0)
+    current = make_results(a=129.0, b=131.0, c=50.0, new=1.0)
+    rows = {row["name"]: row for row in suite.compare(baseline, current, threshold=0.3)}
+    assert set(rows) == {"a", "b", "c"}
+    assert [name for name, row in sorted(rows.items()) if row["regression"]] == ["b"]
+    assert rows["c"]["ratio"] == 0.5
+
+
+def test_compare_command_exit_code(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(make_results(a=100.0)))
+    current.write_text(json.dumps(make_results(a=100.0)))
+    assert suite.main(["compare", str(baseline), str(current)]) == 0
+    current.write_text(json.dumps(make_results(a=200.0)))
+    assert suite.main(["compare", str(baseline), str(current)]) == 1
+    assert "регресій: 1" in capsys.readouterr().out
+
+
+def test_run_writes_json_results(tmp_path):
+    output = tmp_path / "results.json"
+    assert suite.main(["run", "--quick", "-k", "localization/*", "-o", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert set(results["results"]) == {"localization/translate", "localization/get_weather_emoji"}
+    assert all(r["ns_per_op"] > 0 for r in results["results"].values())
+    assert results["meta"]["python"]
+
+
+def test_suite_covers_requested_paths():
+    names = set(suite.CASES)
+    for backend in ("json", "sqlite"):
+        for keys in (1, 100, 10000):
+            assert f"cache/{backend}/get_cold/{keys}" in names
+            assert f"cache/{backend}/set/{keys}" in names
+    assert {"parse/validate_weather_data", "parse/extract_weather_info",
+            "cli/format_weather_output", "cli/fetch_and_display_weather/network"} <= names
+
+
+def test_baseline_covers_all_cases():
+    with open(suite.BASELINE_FILE, encoding="utf-8") as f:
+        baseline = json.load(f)
+    assert set(baseline["results"]) == set(suite.CASES)
@@ -0,0 +1,134 @@
+import logging
+import time
+import pytest
+from unittest import mock
+import requests
+from src.weather_app import api, cache, cli
+from src.weather_app.api import WeatherClient, CircuitOpenError, NetworkError
+from src.weather_app.breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, recovery_timeout=30, clock=clock)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.read_state()["state"] == CLOSED
+    breaker.record_failure()
+    assert breaker.read_state()["state"] == OPEN
+    assert breaker.allow_request() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.read_state() == {"state": CLOSED, "failures": 1}
+
+
+def test_half_open_single_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 31
+    assert breaker.allow_request() is True
+    assert breaker.read_state()["state"] == HALF_OPEN
+    # Only one probe at a time
+    assert breaker.allow_request() is False
+    breaker.record_success()
+    assert breaker.read_state()["state"] == CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_failed_probe_reopens(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 31
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    state = breaker.read_state()
+    assert state["state"] == OPEN and state["opened_at"] == clock.now
+    assert breaker.stats()["transitions"] == {
+        "closed->open": 1, "open->half_open": 1, "half_open->open": 1
+    }
+
+
+def test_state_is_shared_between_instances(breaker, clock):
+    other = CircuitBreaker(failure_threshold=3, recovery_timeout=30, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    assert other.allow_request() is False
+
+
+def test_transitions_are_logged_and_counted(breaker, caplog):
+    with caplog.at_level(logging.INFO, logger="src.weather_app.breaker"):
+        for _ in range(3):
+            breaker.record_failure()
+    assert "closed -> open" in caplog.text
+    assert cache.read_counters()["breaker_open"] == 1
+
+
+def test_client_fails_fast_when_open(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=clock)
+    client = WeatherClient(breaker=breaker)
+    with mock.patch.object(client.session, "get", side_effect=requests.exceptions.Timeout) as get:
+        for _ in range(2):
+            with pytest.raises(NetworkError):
+                client.fetch("Kyiv")
+        with pytest.raises(CircuitOpenError):
+            client.fetch("Kyiv")
+    assert get.call_count == 2
+
+
+def test_client_404_counts_as_success(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=clock)
+    breaker.record_failure()
+    client = WeatherClient(breaker=breaker)
+    response = mock.Mock(status_code=404, content=b"Unknown location")
+    with mock.patch.object(client.session, "get", return_value=response):
+        with pytest.raises(api.CityNotFoundError):
+            client.fetch("Atlantis")
+    assert breaker.read_state()["failures"] == 0
+
+
+def test_cli_falls_back_to_expired_entry(weather_payload, capsys):
+    cache.set_to_cache("Kyiv", weather_payload, now=time.time() - 3600, ttl=60)
+    with mock.patch.object(api, "get_weather", side_effect=CircuitOpenError("open")):
+        assert cli.fetch_and_display_weather("Kyiv", ttl=60) is True
+    out = capsys.readouterr().out
+    assert "сервіс недоступний; показуємо дані 3600 с тому" in out
+    assert "Kyiv, Ukraine" in out
+    assert cache.read_counters()["fallback_served"] == 1
+
+
+def test_fallback_survives_writes_after_expiry(weather_payload, capsys):
+    cache.set_to_cache("Kyiv", weather_payload, now=time.time() - 3600, ttl=60)
+    # Any later write compacts the store; the expired entry must outlive it
+    cache.set_to_cache("Lviv", weather_payload, ttl=60)
+    with mock.patch.object(api, "get_weather", side_effect=CircuitOpenError("open")):
+        assert cli.fetch_and_display_weather("Kyiv", ttl=60) is True
+    assert "сервіс недоступний; показуємо дані 3600 с тому" in capsys.readouterr().out
+
+
+def test_cli_without_fallback_reports_error():
+    with mock.patch("sys.exit") as exit_mock, \
+            mock.patch.object(api, "get_weather", side_effect=CircuitOpenError("open")):
+        assert cli.fetch_and_display_weather("Kyiv") is False
+    exit_mock.assert_called_once_with(7)
@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+import pytest
+from unittest import mock
+from src.weather_app import cache
+
+
+def test_roundtrip(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    assert cache.get_from_cache(" KYIV ", ttl=60, now=1030.0) == weather_payload
+
+
+def test_expired_entry_is_ignored(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    assert cache.get_from_cache("Kyiv", ttl=60, now=1061.0) is None
+
+
+def test_missing_key(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    assert cache.get_from_cache("Lviv") is None
+
+
+def test_clear_cache(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    cache.clear_cache()
+    assert cache.get_from_cache("Kyiv") is None
+
+
+def test_entry_records_expiry(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=120)
+    entry = cache.get_store().get("kyiv")
+    assert entry["cached_at"] == 1000.0
+    assert entry["expires_at"] == 1120.0
+
+
+def test_json_corrupted_file_is_ignored(tmp_cache):
+    tmp_cache.parent.mkdir(parents=True)
+    tmp_cache.write_text("{not json", encoding="utf-8")
+    assert cache.get_from_cache("Kyiv") is None
+
+
+def test_json_concurrent_writers_do_not_lose_entries(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "_memory", cache.MemoryTier())
+
+    def write(worker):
+        for i in range(5):
+            cache.set_to_cache(f"city-{worker}-{i}", weather_payload)
+            cache.increment_counter("writes")
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache.get_store().keys()) == 40
+    assert cache.read_counters()["writes"] == 40
+    assert not list(tmp_cache.parent.glob("*.tmp"))
+
+
+def test_counter_increments_are_batched(monkeypatch):
+    monkeypatch.setattr(cache, "COUNTER_FLUSH_INTERVAL", 60)
+    monkeypatch.setattr(cache, "_counters_flushed_at", 0.0)
+    with mock.patch.object(cache.JsonFileStore, "write", autospec=True,
+                           side_effect=cache.JsonFileStore.write) as write:
+        for _ in range(3):
+            cache.increment_counter("stale_served")
+        assert write.call_count == 1
+        assert cache.read_counters() == {"stale_served": 3}
+    assert write.call_count == 2
+
+
+def test_sqlite_uses_wal_and_expiry_index(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    cache.set_to_cache("Kyiv", weather_payload)
+    conn = sqlite3.connect(cache.sqlite_path())
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = [row[1] for row in conn.execute("PRAGMA index_list(entries)")]
+    assert "entries_expires_at" in indexes
+    conn.close()
+
+
+def test_configure_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_FILE", ".cache/weather.json")
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "json")
+    cache.configure(backend="sqlite", cache_dir=str(tmp_path))
+    assert cache.CACHE_FILE == str(tmp_path / "weather.json")
+    assert cache.sqlite_path() == str(tmp_path / "weather.db")
+    with pytest.raises(ValueError):
+        cache.configure(backend="redis")
+
+
+def test_xdg_cache_dir(monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", "/var/cache/me")
+    assert cache.xdg_cache_dir() == "/var/cache/me/weather-app"
+    monkeypatch.setenv("XDG_CACHE_HOME", "relative")
+    assert cache.xdg_cache_dir().endswith("/.cache/weather-app")
+
+
+def test_migrate_json_to_sqlite(tmp_cache, monkeypatch, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    cache.set_to_cache(None, weather_payload, now=1000.0)
+
+    assert cache.migrate_json_to_sqlite() == 2
+    assert not tmp_cache.exists()
+    assert (tmp_cache.parent / "weather.json.migrated").exists()
+
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    assert cache.get_from_cache("Kyiv", now=1010.0) == weather_payload
+    assert cache.get_from_cache(None, now=1010.0) == weather_payload
+    assert cache.migrate_json_to_sqlite() == 0
@@ -0,0 +1,102 @@
+from unittest import mock
+from src.weather_app import cache
+
+
+def keys():
+    return sorted(key for key, _ in cache.get_store().items())
+
+
+def test_expired_entries_removed_on_write(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "FALLBACK_TTL", 0)
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=60)
+    cache.set_to_cache("Lviv", weather_payload, now=1100.0, ttl=60)
+    assert keys() == ["lviv"]
+
+
+def test_expired_entries_kept_for_fallback_window(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "FALLBACK_TTL", 3600)
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=60)
+    cache.set_to_cache("Lviv", weather_payload, now=1100.0, ttl=60)
+    assert keys() == ["kyiv", "lviv"]
+    assert cache.get_from_cache("Kyiv", ttl=60, now=1100.0) is None
+    cache.set_to_cache("Odesa", weather_payload, now=1000.0 + 60 + 3601, ttl=60)
+    assert keys() == ["lviv", "odesa"]
+
+
+def test_refresh_process_keeps_fallback_window(monkeypatch):
+    from src.weather_app import refresh
+
+    monkeypatch.setattr(cache, "FALLBACK_TTL", 3600)
+    command = refresh.refresh_command("Kyiv", 60)
+    assert command[command.index("--fallback-ttl") + 1] == "3600"
+    with mock.patch.object(cache, "configure") as configure, \
+            mock.patch.object(refresh, "refresh", return_value=True):
+        refresh.main(["--city", "Kyiv", "--fallback-ttl", "0"])
+    assert configure.call_args.kwargs["fallback_ttl"] == 0
+
+
+def test_entry_limit_evicts_least_recently_written(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "MAX_ENTRIES", 2)
+    for i, city in enumerate(["Kyiv", "Lviv", "Odesa"]):
+        cache.set_to_cache(city, weather_payload, now=1000.0 + i)
+    assert keys() == ["lviv", "odesa"]
+    assert cache.get_from_cache("Kyiv", now=1003.0) is None
+
+
+def test_entry_limit_respects_reads(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "MAX_ENTRIES", 2)
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    cache.set_to_cache("Lviv", weather_payload, now=1001.0)
+    assert cache.get_from_cache("Kyiv", now=1002.0) == weather_payload
+    cache.set_to_cache("Odesa", weather_payload, now=1003.0)
+    assert keys() == ["kyiv", "odesa"]
+
+
+def test_byte_limit(backend, monkeypatch, weather_payload):
+    size = cache.entry_size(cache.make_entry(weather_payload, 1000.0, 300))
+    monkeypatch.setattr(cache, "MAX_BYTES", size * 2 + size // 2)
+    for i in range(4):
+        cache.set_to_cache(f"city{i}", weather_payload, now=1000.0 + i)
+    assert keys() == ["city2", "city3"]
+
+
+def test_prune_cache(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "FALLBACK_TTL", 0)
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=60)
+    cache.set_to_cache("Lviv", weather_payload, now=1000.0, ttl=600)
+    assert cache.prune_cache(now=1100.0) == 1
+    assert keys() == ["lviv"]
+
+
+def test_prune_keeps_fallback_window(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "FALLBACK_TTL", 3600)
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=60)
+    # Expired 3600 s ago exactly: still inside the retention window
+    assert cache.prune_cache(now=1060.0 + 3600) == 0
+    assert keys() == ["kyiv"]
+    assert cache.prune_cache(now=1060.0 + 3601) == 1
+    assert keys() == []
+
+
+def test_cache_stats(backend, weather_payload):
+    cache.set_to_cache("Lviv", weather_payload, now=1000.0, ttl=600)
+    cache.set_to_cache("Kyiv", weather_payload, now=1070.0, ttl=20)
+    stats = cache.cache_stats(now=1100.0)
+    assert stats["backend"] == backend
+    assert stats["entries"] == 2
+    assert stats["expired"] == 1
+    assert stats["bytes"] > 0
+    assert stats["file_bytes"] > 0
+    assert stats["ages"]["<1m"] == 1
+    assert stats["ages"]["1-5m"] == 1
+    assert sum(stats["ages"].values()) == 2
+
+
+def test_select_evictions_prefers_expired_then_lru():
+    entries = {
+        "a": {"cached_at": 0, "expires_at": 10},
+        "b": {"cached_at": 5, "expires_at": 500},
+        "c": {"cached_at": 1, "expires_at": 500, "accessed_at": 50},
+        "d": {"cached_at": 6, "expires_at": 500},
+    }
+    assert cache.select_evictions(entries, now=100, max_entries=2) == ["a", "b"]
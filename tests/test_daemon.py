@@ -0,0 +1,195 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import pytest
+from unittest import mock
+from src.weather_app import api, cli, daemon, remote
+from src.weather_app.breaker import CircuitBreaker
+from loadtest.stub_server import StubWttr
+
+OK = {"ok": True, "info": {"city": "Lviv"}, "source": "cache"}
+
+
+@pytest.fixture
+def upstream(weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload), "/Lviv": (200, weather_payload)}, delay=0.2) as stub:
+        client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+        yield stub, client
+        client.close()
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 bytes, so avoid the long pytest tmp_path
+    directory = tempfile.mkdtemp(prefix="wd")
+    yield os.path.join(directory, "weather.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def start(address, weather):
+    server = daemon.make_server(address, weather)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def running(upstream, socket_path):
+    stub, client = upstream
+    server = start(socket_path, daemon.WeatherDaemon(max_workers=2, client=client))
+    yield stub, socket_path
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_second_request_is_served_from_daemon_cache(running):
+    stub, address = running
+    first = remote.fetch_weather(["Kyiv"], use_cache=True, ttl=300, address=address)
+    second = remote.fetch_weather(["Kyiv"], use_cache=True, ttl=300, address=address)
+    assert first[0]["ok"] and first[0]["source"] == "network"
+    assert second[0]["source"] == "cache"
+    assert second[0]["info"]["city"] == "Kyiv"
+    assert stub.count() == 1
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_pipelined_requests_are_answered_in_order_and_deduplicated(running):
+    stub, address = running
+    responses = remote.request(
+        [{"city": "Kyiv", "cache": False}, {"city": "Lviv", "cache": False},
+         {"city": "kyiv", "cache": False}, {"city": 42}],
+        address,
+    )
+    assert [r["id"] for r in responses] == [0, 1, 2, 3]
+    assert [r["ok"] for r in responses] == [True, True, True, False]
+    assert responses[3]["error"] == remote.BAD_REQUEST
+    assert stub.count("/Kyiv") == 1
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_malformed_line_gets_bad_request(running):
+    _, address = running
+    with remote.connect(address) as sock:
+        sock.sendall(b"not json\n")
+        sock.shutdown(socket.SHUT_WR)
+        reply = sock.makefile("rb").readline()
+    assert b'"BadRequest"' in reply
+
+
+def test_failing_submit_still_gets_a_reply():
+    weather = daemon.WeatherDaemon(max_workers=0)
+    server = start("127.0.0.1:0", weather)
+    try:
+        address = "127.0.0.1:%d" % server.server_address[1]
+        with mock.patch.object(weather, "submit", side_effect=[RuntimeError("shut down"), daemon._resolved(OK)]):
+            responses = remote.request([{"city": "Kyiv"}, {"city": "Lviv"}], address, timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert [r["id"] for r in responses] == [0, 1]
+    assert responses[0]["error"] == "RuntimeError"
+    assert responses[1]["ok"]
+
+
+def test_tcp_address_and_errors(upstream):
+    stub, client = upstream
+    server = start("127.0.0.1:0", daemon.WeatherDaemon(max_workers=1, client=client))
+    try:
+        address = "127.0.0.1:%d" % server.server_address[1]
+        responses = remote.fetch_weather(["Atlantis"], use_cache=False, ttl=300, address=address)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert responses[0]["error"] == "CityNotFoundError"
+
+
+def test_full_queue_sheds_load(weather_payload):
+    # No workers: nothing leaves the queue, so the second distinct city is rejected
+    weather = daemon.WeatherDaemon(max_workers=0, queue_size=1)
+    first = weather.submit({"city": "Kyiv", "cache": False})
+    assert weather.submit({"city": "KYIV", "cache": False}) is first
+    rejected = weather.submit({"city": "Lviv", "cache": False}).result(timeout=1)
+    assert rejected["error"] == remote.OVERLOADED
+    assert weather.pending() == 1
+
+
+def test_uncached_request_does_not_join_cached_fetch():
+    weather = daemon.WeatherDaemon(max_workers=0)
+    cached = weather.submit({"city": "Kyiv"})
+    fresh = weather.submit({"city": "Kyiv", "cache": False})
+    assert fresh is not cached
+    assert weather.submit({"city": "KYIV", "cache": False}) is fresh
+    assert weather.pending() == 2
+
+
+def test_daemon_does_not_import_cli():
+    code = "import sys; from src.weather_app import daemon; sys.exit('src.weather_app.cli' in sys.modules)"
+    root = os.path.join(os.path.dirname(__file__), os.pardir)
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+
+def test_network_error_falls_back_to_last_known_data(weather_payload):
+    from src.weather_app import cache
+
+    cache.set_to_cache("Kyiv", weather_payload, ttl=1)
+    client = mock.Mock()
+    client.fetch.side_effect = api.NetworkError("down")
+    weather = daemon.WeatherDaemon(max_workers=1, client=client)
+    response = weather.submit({"city": "Kyiv", "ttl": 0}).result(timeout=5)
+    assert response["source"] == "fallback"
+    assert response["info"]["temperature"] == 25
+
+
+def test_reply_timeout_follows_api_timeout():
+    api_timeout = api.DEFAULT_CONNECT_TIMEOUT + api.DEFAULT_READ_TIMEOUT
+    assert remote.API_TIMEOUT == pytest.approx(api_timeout)
+    assert api_timeout < remote.DEFAULT_TIMEOUT < api_timeout + 1
+
+
+def test_hung_daemon_returns_none():
+    # Accepts connections but never answers
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    try:
+        address = "127.0.0.1:%d" % listener.getsockname()[1]
+        assert remote.request([{"city": "Kyiv"}], address, timeout=0.2) is None
+    finally:
+        listener.close()
+
+
+def test_missing_daemon_returns_none(socket_path):
+    assert remote.fetch_weather(["Kyiv"], use_cache=True, ttl=300, address=socket_path) is None
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+def test_stale_socket_is_replaced_but_live_one_is_not(socket_path):
+    open(socket_path, "w").close()
+    server = start(socket_path, daemon.WeatherDaemon(max_workers=0))
+    try:
+        with pytest.raises(OSError):
+            daemon.make_server(socket_path, daemon.WeatherDaemon(max_workers=0))
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_display_remote_matches_in_process_output(capsys):
+    responses = [
+        {"ok": True, "info": {"city": "Kyiv", "temperature": 25}, "source": "cache"},
+        {"ok": False, "error": "CityNotFoundError", "message": "Місто 'Atlantis' не знайдено"},
+    ]
+    assert cli.display_remote(["Kyiv", "Atlantis"], responses) is False
+    captured = capsys.readouterr()
+    assert "📦 (дані з кешу)" in captured.out
+    assert "Kyiv" in captured.out
+    assert "❌ Atlantis: Місто 'Atlantis' не знайдено" in captured.err
+
+    with mock.patch.object(cli, "print_error") as print_error:
+        cli.display_remote(["Atlantis"], responses[1:])
+    print_error.assert_called_once_with("Місто 'Atlantis' не знайдено", exit_code=2)
@@ -0,0 +1,49 @@
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli
+from src.weather_app.models import WeatherInfo
+
+
+@pytest.fixture(autouse=True)
+def no_exit():
+    with mock.patch("sys.exit") as exit_mock:
+        yield exit_mock
+
+
+def test_fetch_stores_and_prints(tmp_cache, weather_payload, capsys):
+    with mock.patch.object(api, "get_weather", return_value=weather_payload) as get_weather:
+        assert cli.fetch_and_display_weather("Kyiv") is True
+    get_weather.assert_called_once_with("Kyiv")
+    assert "Kyiv, Ukraine" in capsys.readouterr().out
+    assert cache.get_from_cache("Kyiv") == weather_payload
+
+
+def test_cache_hit_skips_network(tmp_cache, weather_payload, capsys):
+    cache.set_to_cache("Kyiv", weather_payload)
+    with mock.patch.object(api, "get_weather") as get_weather:
+        assert cli.fetch_and_display_weather("Kyiv") is True
+    get_weather.assert_not_called()
+    assert "📦 (дані з кешу)" in capsys.readouterr().out
+
+
+def test_compact_cache_hit_skips_extraction(tmp_cache, monkeypatch, weather_payload, capsys):
+    monkeypatch.setattr(cache, "CACHE_MODE", "compact")
+    cache.set_to_cache("Kyiv", weather_payload)
+    with mock.patch.object(WeatherInfo, "from_data") as from_data, \
+            mock.patch.object(api, "get_weather") as get_weather:
+        assert cli.fetch_and_display_weather("Kyiv") is True
+    from_data.assert_not_called()
+    get_weather.assert_not_called()
+    assert "Kyiv, Ukraine" in capsys.readouterr().out
+
+
+def test_city_not_found_exit_code(tmp_cache, no_exit):
+    with mock.patch.object(api, "get_weather", side_effect=api.CityNotFoundError("nope")):
+        assert cli.fetch_and_display_weather("Atlantis") is False
+    no_exit.assert_called_once_with(2)
+
+
+def test_network_error_exit_code(tmp_cache, no_exit):
+    with mock.patch.object(api, "get_weather", side_effect=api.NetworkError("down")):
+        assert cli.fetch_and_display_weather("Kyiv") is False
+    no_exit.assert_called_once_with(7)
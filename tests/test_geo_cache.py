@@ -0,0 +1,173 @@
+import json
+import random
+import sqlite3
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, geo
+from src.weather_app.breaker import CircuitBreaker
+from loadtest.stub_server import StubWttr
+
+HERE = "50.4500,30.5200"
+
+
+def add_points(points, now=1000.0, payload=None):
+    """Write many point entries in one store update"""
+    payload = payload or {"current_condition": []}
+    cache._write_entries({
+        cache.get_cache_key(geo.format_coordinates(lat, lon)): cache.make_entry(payload, now, 300)
+        for lat, lon in points
+    })
+
+
+def test_coordinates_are_normalized_into_geo_keys():
+    assert cache.get_cache_key(" 50.45, 30.52 ") == "geo:" + HERE
+    assert cache.get_cache_key("50.45000001,30.52") == "geo:" + HERE
+    assert cache.get_cache_key("kyiv,ua") == "kyiv,ua"
+    assert cache.get_cache_key("91,30") == "91,30"
+    assert cache.geo_point("geo:" + HERE) == (50.45, 30.52)
+    assert cache.geo_point("kyiv") is None
+    with pytest.raises(ValueError):
+        geo.format_coordinates(50, 181)
+
+
+def test_grid_window_covers_radius():
+    rows, columns = geo.grid_window(50.45, 30.52, 3)
+    assert geo.in_window(geo.grid_cell(50.45, 30.52), rows, columns)
+    assert geo.in_window(geo.grid_cell(50.47, 30.55), rows, columns)
+    assert not geo.in_window(geo.grid_cell(50.60, 30.52), rows, columns)
+    # Near the antimeridian the window spans both edges of the map
+    rows, columns = geo.grid_window(0.0, -179.99, 5)
+    assert geo.in_window(geo.grid_cell(0.0, 179.99), rows, columns)
+
+
+def test_nearby_keys_wrap_around_the_antimeridian_and_poles(backend):
+    add_points([(0.0, 179.99), (89.999, -120.0), (10.0, 10.0)])
+    assert [key for _, key in cache._nearby_keys(0.0, -179.99, 5)] == ["geo:0.0000,179.9900"]
+    assert [key for _, key in cache._nearby_keys(89.999, 60.0, 5)] == ["geo:89.9990,-120.0000"]
+
+
+def test_nearby_keys_match_brute_force(backend):
+    rng = random.Random(7)
+    points = [(round(rng.uniform(49, 51), 4), round(rng.uniform(29, 32), 4)) for _ in range(2000)]
+    add_points(points)
+    for radius in (0.5, 3, 40, 500):
+        lat, lon = rng.uniform(49, 51), rng.uniform(29, 32)
+        expected = sorted(
+            (geo.haversine_km(lat, lon, *point), "geo:" + geo.format_coordinates(*point))
+            for point in set(points)
+            if geo.haversine_km(lat, lon, *point) <= radius
+        )
+        assert cache._nearby_keys(lat, lon, radius) == expected
+
+
+def test_sqlite_reads_only_nearby_cells(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    monkeypatch.setattr(cache, "MAX_ENTRIES", 50000)
+    rng = random.Random(1)
+    add_points([(rng.uniform(44, 52), rng.uniform(22, 40)) for _ in range(20000)])
+
+    store = cache.get_store()
+    rows, columns = geo.grid_window(50.45, 30.52, 3)
+    assert len(store.grid_keys(rows, columns)) < 100
+    plan = " ".join(str(row) for row in store._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT key FROM entries"
+        " WHERE geo_row IS NOT NULL AND geo_row BETWEEN ? AND ? AND (geo_col BETWEEN ? AND ?)",
+        [*rows, *columns[0]]
+    ))
+    assert "entries_geo_cell" in plan
+
+
+def test_existing_sqlite_cache_gets_grid_cells(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    tmp_cache.parent.mkdir(parents=True)
+    conn = sqlite3.connect(cache.sqlite_path())
+    conn.execute(
+        "CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+        " cached_at REAL NOT NULL, expires_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL DEFAULT 0, size INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID"
+    )
+    conn.execute(
+        "INSERT INTO entries VALUES (?, ?, 1000, 1300, 1000, 0)",
+        ("geo:" + HERE, json.dumps({"data": weather_payload}))
+    )
+    conn.commit()
+    conn.close()
+    assert cache.lookup_cache("50.4510,30.5200", now=1010.0).key == "geo:" + HERE
+
+
+def test_nearby_fresh_entry_is_reused(backend, weather_payload):
+    cache.set_to_cache(HERE, weather_payload, now=1000.0)
+    hit = cache.lookup_cache("50.4600,30.5200", ttl=300, now=1010.0)  # ~1.1 km away
+    assert hit is not None and hit.key == "geo:" + HERE
+    assert cache.lookup_cache("50.5000,30.5200", ttl=300, now=1010.0) is None  # ~5.6 km
+    assert cache.lookup_cache("50.4600,30.5200", ttl=300, now=2000.0) is None
+    assert cache.cache_stats(now=1010.0)["points"] == 1
+
+
+def test_radius_is_configurable(backend, weather_payload, monkeypatch):
+    cache.set_to_cache(HERE, weather_payload, now=1000.0)
+    monkeypatch.setattr(cache, "GEO_RADIUS_KM", 0)
+    assert cache.lookup_cache("50.4510,30.5200", now=1010.0) is None
+    cache.configure(geo_radius=10)
+    assert cache.lookup_cache("50.5000,30.5200", now=1010.0) is not None
+
+
+def test_refresh_process_keeps_radius(monkeypatch):
+    from src.weather_app import refresh
+
+    monkeypatch.setattr(cache, "GEO_RADIUS_KM", 7.5)
+    command = refresh.refresh_command(HERE, 60)
+    assert command[command.index("--radius") + 1] == "7.5"
+    with mock.patch.object(cache, "configure") as configure, \
+            mock.patch.object(refresh, "refresh", return_value=True):
+        refresh.main(["--city", HERE, "--radius", "0"])
+    assert configure.call_args.kwargs["geo_radius"] == 0
+
+
+def test_fresh_neighbour_beats_stale_points(backend, weather_payload):
+    cache.set_to_cache("50.4510,30.5200", weather_payload, now=1000.0)
+    cache.set_to_cache("50.4600,30.5200", weather_payload, now=1250.0)
+    cache.set_to_cache(HERE, weather_payload, now=1000.0)
+    hit = cache.lookup_cache(HERE, ttl=300, stale_ttl=600, now=1400.0)
+    assert hit.key == "geo:50.4600,30.5200" and not hit.stale
+
+    # With no fresh point around, the nearest stale one is returned
+    hit = cache.lookup_cache("50.4502,30.5200", ttl=300, stale_ttl=600, now=1700.0)
+    assert hit.key == "geo:" + HERE and hit.stale
+
+
+def test_index_follows_writes_by_other_processes(backend, weather_payload):
+    cache.set_to_cache(HERE, weather_payload, now=1000.0)
+    assert cache.lookup_cache("50.4510,30.5200", now=1010.0) is not None
+
+    # Another process replaces the store contents behind our back
+    store = cache.get_store()
+    store.delete("geo:" + HERE)
+    store.set("geo:48.0000,30.0000", cache.make_entry(weather_payload, 1000.0, 300))
+    assert cache.lookup_cache("50.4510,30.5200", now=1010.0) is None
+    assert cache.lookup_cache("48.0010,30.0000", now=1010.0).key == "geo:48.0000,30.0000"
+
+
+def test_get_weather_accepts_coordinates(weather_payload):
+    client = mock.Mock()
+    client.fetch.return_value = weather_payload
+    with mock.patch.object(api, "get_default_client", return_value=client):
+        assert api.get_weather(lat=50.45, lon=30.52) is weather_payload
+        with pytest.raises(ValueError):
+            api.get_weather(lat=50.45)
+        with pytest.raises(ValueError):
+            api.get_weather("Kyiv", lat=50.45, lon=30.52)
+    client.fetch.assert_called_once_with(HERE)
+
+
+def test_nearby_point_is_served_without_network(weather_payload):
+    with StubWttr({"/" + HERE: (200, weather_payload)}) as stub:
+        client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+        try:
+            first = api.fetch_single_flight(api.location(lat=50.45, lon=30.52), client=client)
+            second = api.fetch_single_flight(api.location(lat=50.4512, lon=30.5207), client=client)
+        finally:
+            client.close()
+    assert first.ok and not first.from_cache
+    assert second.ok and second.from_cache
+    assert stub.count() == 1
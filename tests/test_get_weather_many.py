@@ -0,0 +1,82 @@
+import threading
+import time
+import pytest
+from unittest import mock
+from src.weather_app import cache
+from src.weather_app.api import (
+    WeatherClient,
+    get_weather_many,
+    CityNotFoundError,
+    NetworkError,
+)
+
+
+@pytest.fixture
+def client():
+    return WeatherClient()
+
+
+def test_get_weather_many_returns_results_in_order(tmp_cache, client, weather_payload):
+    with mock.patch.object(client, "fetch", return_value=weather_payload):
+        results = get_weather_many(["Kyiv", "Lviv"], client=client)
+    assert [r.city for r in results] == ["Kyiv", "Lviv"]
+    assert all(r.ok and r.data == weather_payload for r in results)
+
+
+def test_get_weather_many_deduplicates_by_cache_key(tmp_cache, client, weather_payload):
+    with mock.patch.object(client, "fetch", return_value=weather_payload) as mock_fetch:
+        results = get_weather_many(["Kyiv", " kyiv ", "KYIV"], client=client)
+    mock_fetch.assert_called_once_with("Kyiv")
+    assert len(results) == 3
+    assert results[0] is results[1] is results[2]
+
+
+def test_get_weather_many_serves_cache_hits_first(tmp_cache, client, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    with mock.patch.object(client, "fetch", return_value=weather_payload) as mock_fetch:
+        results = get_weather_many(["Kyiv", "Lviv"], client=client)
+    mock_fetch.assert_called_once_with("Lviv")
+    assert results[0].from_cache is True
+    assert results[1].from_cache is False
+    assert cache.get_from_cache("Lviv") == weather_payload
+
+
+def test_get_weather_many_collects_errors(tmp_cache, client, weather_payload):
+    def fetch(city):
+        if city == "Nowhere":
+            raise CityNotFoundError("not found")
+        if city == "Offline":
+            raise NetworkError("down")
+        return weather_payload
+
+    with mock.patch.object(client, "fetch", side_effect=fetch):
+        results = get_weather_many(["Nowhere", "Kyiv", "Offline"], client=client)
+    assert isinstance(results[0].error, CityNotFoundError)
+    assert results[1].ok
+    assert isinstance(results[2].error, NetworkError)
+
+
+def test_get_weather_many_no_cache(tmp_cache, client, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    with mock.patch.object(client, "fetch", return_value=weather_payload) as mock_fetch:
+        get_weather_many(["Kyiv"], use_cache=False, client=client)
+    mock_fetch.assert_called_once_with("Kyiv")
+
+
+def test_get_weather_many_fetches_concurrently(tmp_cache, client, weather_payload):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(city):
+        with lock:
+            active.append(city)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(city)
+        return weather_payload
+
+    with mock.patch.object(client, "fetch", side_effect=fetch):
+        get_weather_many([f"city{i}" for i in range(6)], max_workers=3, client=client)
+    assert max(peak) == 3
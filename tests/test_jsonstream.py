@@ -0,0 +1,90 @@
+import json
+import os
+import pytest
+from src.weather_app import jsonstream
+from src.weather_app.api import WeatherClient, CityNotFoundError, InvalidResponseError
+from src.weather_app.jsonstream import J1_FIELDS, LOADERS, extract_fields
+from loadtest.stub_server import StubWttr
+
+FIXTURE = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fixtures", "kyiv_j1.json")
+
+
+@pytest.fixture(scope="module")
+def j1_body():
+    with open(FIXTURE, "rb") as f:
+        return f.read()
+
+
+def split(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("backend", sorted(LOADERS))
+@pytest.mark.parametrize("size", [1, 5, 64, 8192, 1 << 20])
+def test_extract_matches_full_parse(j1_body, backend, size):
+    full = json.loads(j1_body)
+    result = extract_fields(split(j1_body, size), J1_FIELDS, loads=LOADERS[backend])
+    assert result == {key: full[key] for key in J1_FIELDS}
+
+
+def test_extract_stops_after_last_field(j1_body):
+    read = []
+
+    def chunks():
+        for chunk in split(j1_body, 1024):
+            read.append(chunk)
+            yield chunk
+
+    extract_fields(chunks())
+    assert sum(map(len, read)) < len(j1_body) // 4
+
+
+def test_extract_skips_tricky_values():
+    body = json.dumps({
+        "skip": ["}]\"{[", {"nested": "\\\"]"}, -1.5e3, True, None],
+        "current_condition": [{"q": "\\"}],
+        "n": 7,
+    }).encode()
+    assert extract_fields(split(body, 1), ("current_condition", "n")) == {
+        "current_condition": [{"q": "\\"}],
+        "n": 7,
+    }
+
+
+def test_extract_missing_fields_returns_what_exists():
+    assert extract_fields([b'{"nearest_area": [], "x": 1}']) == {"nearest_area": []}
+    assert extract_fields([b"{}"]) == {}
+
+
+@pytest.mark.parametrize("body", [b"", b"[]", b'{"a" 1}', b'{"a": [1, "x', b'{"a": 1 "b": 2}'])
+def test_extract_malformed_raises_decode_error(body):
+    with pytest.raises(json.JSONDecodeError):
+        extract_fields([body])
+
+
+def test_default_backend_is_registered():
+    assert jsonstream.JSON_BACKEND in LOADERS
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_client_partial_parse_over_http(j1_body, chunked):
+    with StubWttr({"/Kyiv": (200, j1_body)}, chunked=chunked) as stub:
+        client = WeatherClient(base_url=stub.url, partial=True)
+        first = client.fetch("Kyiv")
+        second = client.fetch("Kyiv")
+        client.close()
+    assert set(first) == set(J1_FIELDS)
+    assert first == second
+    assert first["nearest_area"][0]["areaName"][0]["value"] == "Kyiv"
+
+
+def test_client_partial_parse_errors():
+    with StubWttr({"/Bad": (200, "<html>"), "/Nowhere": (200, {"current_condition": []})}) as stub:
+        client = WeatherClient(base_url=stub.url, partial=True)
+        with pytest.raises(InvalidResponseError):
+            client.fetch("Bad")
+        with pytest.raises(CityNotFoundError):
+            client.fetch("Nowhere")
+        with pytest.raises(CityNotFoundError):
+            client.fetch("Atlantis")
+        client.close()
@@ -0,0 +1,102 @@
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli
+from src.weather_app.api import (
+    WeatherClient,
+    CityNotFoundError,
+    InvalidResponseError,
+    extract_weather_info,
+    parse_lean_response,
+)
+from src.weather_app.models import WeatherInfo
+from loadtest.stub_server import StubWttr
+
+LEAN_BODY = "+25°C|+28°C|Sunny|60%|↖10km/h|1013hPa|Kyiv, Ukraine\n"
+
+
+def test_build_url_lean_quotes_format():
+    url = api.build_url("Kyiv", "https://wttr.in", lean=True)
+    assert url == "https://wttr.in/Kyiv?format=%25t%7C%25f%7C%25C%7C%25h%7C%25w%7C%25P%7C%25l&m"
+    assert api.build_url(None, "https://wttr.in") == "https://wttr.in/?format=j1"
+
+
+def test_parse_lean_matches_extract_weather_info(weather_payload):
+    info = parse_lean_response(LEAN_BODY, "Kyiv")
+    assert info == extract_weather_info(weather_payload)
+
+
+def test_parse_lean_negative_values_and_no_country():
+    info = parse_lean_response("-7°C|-12°C|Light snow|91%|←22km/h|998hPa|Lviv", "Lviv")
+    assert info == WeatherInfo(
+        city="Lviv", country="", temperature=-7, feels_like=-12,
+        description="Light snow", humidity=91, wind_speed=22, pressure=998,
+    )
+
+
+def test_parse_lean_keeps_coordinate_location():
+    info = parse_lean_response("+25°C|+28°C|Sunny|60%|↖10km/h|1013hPa|50.45,30.52", "50.4500,30.5200")
+    assert info.city == "50.45,30.52" and info.country == ""
+    assert info.temperature == 25 and info.pressure == 1013
+
+
+def test_parse_lean_unknown_location():
+    with pytest.raises(CityNotFoundError, match="Місто 'Atlantis' не розпізнано"):
+        parse_lean_response("Unknown location; please try ~Atlantis", "Atlantis")
+
+
+@pytest.mark.parametrize("body", ["", "<html>oops</html>", "+25°C|+28°C||60%|↖10km/h|1013hPa|Kyiv"])
+def test_parse_lean_invalid_body(body):
+    with pytest.raises(InvalidResponseError):
+        parse_lean_response(body, "Kyiv")
+
+
+def test_client_fetch_lean_over_http():
+    with StubWttr({"/Kyiv": (200, LEAN_BODY)}) as stub:
+        client = WeatherClient(base_url=stub.url)
+        info = client.fetch_lean("Kyiv")
+        client.close()
+    assert info.city == "Kyiv" and info.temperature == 25 and info.wind_speed == 10
+
+
+def test_client_fetch_lean_404():
+    with StubWttr({}) as stub:
+        client = WeatherClient(base_url=stub.url)
+        with pytest.raises(CityNotFoundError):
+            client.fetch_lean("Atlantis")
+        client.close()
+
+
+def test_single_flight_lean_caches_info_entry():
+    info = parse_lean_response(LEAN_BODY, "Kyiv")
+    with mock.patch.object(api, "get_weather_lean", return_value=info) as get_lean, \
+            mock.patch.object(api, "get_weather") as get_weather:
+        result = api.fetch_single_flight("Kyiv", lean=True)
+        again = api.fetch_single_flight("Kyiv", lean=True)
+    get_lean.assert_called_once_with("Kyiv")
+    get_weather.assert_not_called()
+    assert result.weather_info() == info
+    assert again.from_cache and again.weather_info() == info
+    # Full-data readers do not mistake the lean entry for a j1 payload
+    assert cache.get_from_cache("Kyiv") is None
+    assert cache.get_info_from_cache("Kyiv") == info
+
+
+def test_get_weather_many_lean():
+    infos = {
+        "Kyiv": parse_lean_response(LEAN_BODY, "Kyiv"),
+        "Lviv": parse_lean_response("+18°C|+18°C|Cloudy|70%|→5km/h|1010hPa|Lviv", "Lviv"),
+    }
+    client = mock.Mock()
+    client.fetch_lean.side_effect = infos.get
+    results = api.get_weather_many(["Kyiv", "Lviv"], client=client, lean=True)
+    assert [r.weather_info() for r in results] == [infos["Kyiv"], infos["Lviv"]]
+    client.fetch.assert_not_called()
+
+
+def test_cli_lean_mode(capsys):
+    info = parse_lean_response(LEAN_BODY, "Kyiv")
+    with mock.patch.object(api, "get_weather_lean", return_value=info):
+        assert cli.fetch_and_display_weather("Kyiv", use_cache=False, lean=True) is True
+    out = capsys.readouterr().out
+    assert "Kyiv, Ukraine" in out
+    assert "25°C" in out
@@ -0,0 +1,98 @@
+import json
+import random
+import pytest
+import requests
+from loadtest import driver
+from loadtest.stub_server import StubWttr, parse_fault, parse_latency
+
+
+@pytest.mark.parametrize("spec, low, high", [
+    (None, 0.0, 0.0),
+    (0.25, 0.25, 0.25),
+    ("0.1", 0.1, 0.1),
+    ("fixed:0.2", 0.2, 0.2),
+    ("uniform:0.01,0.02", 0.01, 0.02),
+    ("exp:0.05", 0.0, float("inf")),
+    ("lognormal:0.08,0.5", 0.0, float("inf")),
+])
+def test_parse_latency(spec, low, high):
+    sample = parse_latency(spec)
+    rng = random.Random(1)
+    assert all(low <= sample(rng) <= high for _ in range(100))
+
+
+@pytest.mark.parametrize("spec", ["gauss:1,2", "uniform:1", "fixed:x"])
+def test_parse_latency_rejects_unknown(spec):
+    with pytest.raises(ValueError):
+        parse_latency(spec)
+
+
+def test_parse_fault():
+    assert parse_fault("500=0.25") == ("500", 0.25)
+    with pytest.raises(ValueError):
+        parse_fault("418=0.1")
+    with pytest.raises(ValueError):
+        parse_fault("500=lots")
+
+
+def test_default_route_serves_any_path(weather_payload):
+    with StubWttr(default=(200, weather_payload)) as stub:
+        assert requests.get(f"{stub.url}/Anywhere?format=j1").json() == weather_payload
+        assert stub.count() == 1
+        assert stub.stats()["responses"] == {"200": 1}
+
+
+@pytest.mark.parametrize("fault, status", [("404", 404), ("503", 503)])
+def test_injected_status_faults(weather_payload, fault, status):
+    with StubWttr(default=(200, weather_payload), faults={fault: 1.0}) as stub:
+        assert requests.get(f"{stub.url}/Kyiv").status_code == status
+        assert stub.stats()["responses"] == {fault: 1}
+
+
+def test_injected_malformed_body(weather_payload):
+    with StubWttr(default=(200, weather_payload), faults={"malformed": 1.0}) as stub:
+        response = requests.get(f"{stub.url}/Kyiv")
+    assert response.status_code == 200
+    with pytest.raises(ValueError):
+        json.loads(response.text)
+
+
+def test_injected_timeout(weather_payload):
+    with StubWttr(default=(200, weather_payload), faults={"timeout": 1.0}, hang=5) as stub:
+        with pytest.raises(requests.Timeout):
+            requests.get(f"{stub.url}/Kyiv", timeout=0.2)
+        assert stub.stats()["responses"] == {"timeout": 1}
+
+
+def test_fault_rates_are_seeded(weather_payload):
+    def statuses():
+        with StubWttr(default=(200, weather_payload), faults={"500": 0.5}, seed=7) as stub:
+            return [requests.get(f"{stub.url}/Kyiv").status_code for _ in range(20)]
+
+    first = statuses()
+    assert first == statuses()
+    assert set(first) == {200, 500}
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert driver.percentile(values, 50) == 50.0
+    assert driver.percentile(values, 99) == 99.0
+    assert driver.percentile([], 95) == 0.0
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_api_run_reports_cache_hits_and_upstream_requests(backend):
+    report = driver.run(mode="api", concurrency=1, total=30, cities=3, backend=backend)
+    assert report["requests"] == 30
+    assert report["errors"] == {}
+    assert report["upstream"]["requests"] == 3
+    assert report["cache_hit_ratio"] == pytest.approx(27 / 30)
+    assert set(report["latency_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+
+
+def test_api_run_counts_errors_by_type():
+    report = driver.run(mode="api", concurrency=4, total=20, cities=20, use_cache=False,
+                        faults={"500": 1.0})
+    assert report["errors"] == {"NetworkError": 20}
+    assert report["upstream"]["responses"] == {"500": 20}
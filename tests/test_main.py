@@ -26,75 +26,280 @@ def patch_cli_and_cache(monkeypatch):
     cli_mock = types.SimpleNamespace()
     cli_mock.get_user_choice = mock.Mock(return_value="Kyiv")
     cli_mock.watch_mode = mock.Mock()
+    cli_mock.watch_many = mock.Mock()
     cli_mock.fetch_and_display_weather = mock.Mock(return_value=True)
+    cli_mock.fetch_and_display_many = mock.Mock(return_value=True)
+    cli_mock.format_cache_stats = mock.Mock(return_value="stats")
+    cli_mock.format_negative_entries = mock.Mock(return_value="negative")
+    cli_mock.report_timings = mock.Mock()
+    cli_mock.serve_mode = mock.Mock()
+    cli_mock.warm_mode = mock.Mock()
+    cli_mock.display_remote = mock.Mock(return_value=True)
     cache_mock = types.SimpleNamespace()
     cache_mock.DEFAULT_TTL = 300
+    cache_mock.BACKENDS = ("json", "sqlite")
+    cache_mock.CACHE_MODES = ("full", "compact")
+    cache_mock.configure = mock.Mock()
+    cache_mock.xdg_cache_dir = mock.Mock(return_value="/home/user/.cache/weather-app")
+    cache_mock.migrate_json_to_sqlite = mock.Mock(return_value=3)
+    cache_mock.prune_cache = mock.Mock(return_value=2)
+    cache_mock.cache_stats = mock.Mock(return_value={"entries": 1})
+    cache_mock.list_negative = mock.Mock(return_value=[])
+    cache_mock.purge_negative = mock.Mock(return_value=4)
     monkeypatch.setattr("src.main.cli", cli_mock)
     monkeypatch.setattr("src.main.cache", cache_mock)
     return cli_mock, cache_mock
 
+@pytest.fixture(autouse=True)
+def patch_remote(monkeypatch):
+    """No daemon is running unless a test says otherwise"""
+    remote_mock = types.SimpleNamespace(OVERLOADED="Overloaded")
+    remote_mock.fetch_weather = mock.Mock(return_value=None)
+    monkeypatch.setattr("src.main.remote", remote_mock)
+    return remote_mock
+
+def make_args(city=None, **kwargs):
+    """Build a parsed-args namespace; ``city`` is a single --city value"""
+    values = dict(
+        cities_file=None, workers=None, cache_backend=None, cache_dir=None,
+        xdg_cache=False, cache_migrate=False, cache_max_entries=None,
+        cache_max_bytes=None, cache_prune=False, cache_stats=False, cache_mode=None,
+        stale_ttl=0, lean=False, timings=None, metrics_port=None, jitter=0.1,
+        serve=None, queue_size=None, no_daemon=False, warm=None, warm_fraction=0.8,
+        negative_ttl=None, cache_negative=False, cache_purge_negative=None,
+        lat=None, lon=None, radius=None,
+    )
+    values.update(kwargs)
+    return mock.Mock(city=[city] if city else None, **values)
+
 def test_main_default_args(patch_argparse_parse_args, patch_cli_and_cache):
     cli_mock, cache_mock = patch_cli_and_cache
-    patch_argparse_parse_args.return_value = mock.Mock(
-        city=None, watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL
+    patch_argparse_parse_args.return_value = make_args(
+        city=None, watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0
     )
     main()
     cli_mock.get_user_choice.assert_called_once()
     cli_mock.fetch_and_display_weather.assert_called_once_with(
-        city="Kyiv", use_cache=True, ttl=cache_mock.DEFAULT_TTL
+        city="Kyiv", use_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0,
+        lean=False
     )
 
 def test_main_city_arg(patch_argparse_parse_args, patch_cli_and_cache):
     cli_mock, cache_mock = patch_cli_and_cache
-    patch_argparse_parse_args.return_value = mock.Mock(
-        city="London", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL
+    patch_argparse_parse_args.return_value = make_args(
+        city="London", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0
     )
     main()
     cli_mock.get_user_choice.assert_not_called()
     cli_mock.fetch_and_display_weather.assert_called_once_with(
-        city="London", use_cache=True, ttl=cache_mock.DEFAULT_TTL
+        city="London", use_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0,
+        lean=False
     )
 
 def test_main_no_cache(patch_argparse_parse_args, patch_cli_and_cache):
     cli_mock, cache_mock = patch_cli_and_cache
-    patch_argparse_parse_args.return_value = mock.Mock(
-        city="Paris", watch=None, no_cache=True, ttl=cache_mock.DEFAULT_TTL
+    patch_argparse_parse_args.return_value = make_args(
+        city="Paris", watch=None, no_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0
     )
     main()
     cli_mock.fetch_and_display_weather.assert_called_once_with(
-        city="Paris", use_cache=False, ttl=cache_mock.DEFAULT_TTL
+        city="Paris", use_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0,
+        lean=False
     )
 
 def test_main_watch_mode_with_city(patch_argparse_parse_args, patch_cli_and_cache):
     cli_mock, cache_mock = patch_cli_and_cache
-    patch_argparse_parse_args.return_value = mock.Mock(
-        city="Berlin", watch=60, no_cache=False, ttl=cache_mock.DEFAULT_TTL
+    patch_argparse_parse_args.return_value = make_args(
+        city="Berlin", watch=60, no_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0
     )
     main()
     cli_mock.watch_mode.assert_called_once_with(
-        city="Berlin", interval=60, use_cache=True, ttl=cache_mock.DEFAULT_TTL
+        city="Berlin", interval=60, use_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0,
+        lean=False, metrics_port=None
     )
 
 def test_main_watch_mode_without_city(patch_argparse_parse_args, patch_cli_and_cache):
     cli_mock, cache_mock = patch_cli_and_cache
-    patch_argparse_parse_args.return_value = mock.Mock(
-        city=None, watch=120, no_cache=False, ttl=cache_mock.DEFAULT_TTL
+    patch_argparse_parse_args.return_value = make_args(
+        city=None, watch=120, no_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0
     )
     main()
     cli_mock.get_user_choice.assert_called_once()
     cli_mock.watch_mode.assert_called_once_with(
-        city="Kyiv", interval=120, use_cache=True, ttl=cache_mock.DEFAULT_TTL
+        city="Kyiv", interval=120, use_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0,
+        lean=False, metrics_port=None
     )
 
 def test_main_fetch_and_display_weather_failure(patch_argparse_parse_args, patch_cli_and_cache, patch_sys_exit):
     cli_mock, cache_mock = patch_cli_and_cache
     cli_mock.fetch_and_display_weather.return_value = False
-    patch_argparse_parse_args.return_value = mock.Mock(
-        city="Rome", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL
+    patch_argparse_parse_args.return_value = make_args(
+        city="Rome", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0
     )
     main()
     patch_sys_exit.assert_called_once_with(1)
 
+def test_main_multiple_cities(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, workers=4
+    )
+    patch_argparse_parse_args.return_value.city = ["Kyiv", "Lviv"]
+    main()
+    cli_mock.fetch_and_display_weather.assert_not_called()
+    cli_mock.fetch_and_display_many.assert_called_once_with(
+        ["Kyiv", "Lviv"], use_cache=True, ttl=cache_mock.DEFAULT_TTL, max_workers=4, lean=False
+    )
+
+def test_main_cities_file(tmp_path, patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    cities_file = tmp_path / "cities.txt"
+    cities_file.write_text("# hot set\nOdesa\n\n  Dnipro  \n", encoding="utf-8")
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL,
+        cities_file=str(cities_file)
+    )
+    main()
+    cli_mock.fetch_and_display_many.assert_called_once_with(
+        ["Kyiv", "Odesa", "Dnipro"], use_cache=True, ttl=cache_mock.DEFAULT_TTL, max_workers=None, lean=False
+    )
+
+def test_main_cache_backend_options(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL,
+        cache_backend="sqlite", xdg_cache=True
+    )
+    main()
+    cache_mock.configure.assert_called_once_with(
+        backend="sqlite", cache_dir="/home/user/.cache/weather-app",
+        max_entries=None, max_bytes=None, mode=None, stale_ttl=0, negative_ttl=None, geo_radius=None
+    )
+    cli_mock.fetch_and_display_weather.assert_called_once()
+
+def test_main_cache_migrate(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, cache_migrate=True
+    )
+    main()
+    cache_mock.migrate_json_to_sqlite.assert_called_once_with()
+    cache_mock.configure.assert_not_called()
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+def test_main_cache_prune(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL,
+        cache_prune=True, cache_max_entries=100
+    )
+    main()
+    cache_mock.configure.assert_called_once_with(
+        backend=None, cache_dir=None, max_entries=100, max_bytes=None, mode=None,
+        stale_ttl=0, negative_ttl=None, geo_radius=None
+    )
+    cache_mock.prune_cache.assert_called_once_with()
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+def test_main_cache_stats(patch_argparse_parse_args, patch_cli_and_cache, patch_print):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, cache_stats=True
+    )
+    main()
+    cli_mock.format_cache_stats.assert_called_once_with({"entries": 1})
+    patch_print.assert_called_with("stats")
+    cli_mock.get_user_choice.assert_not_called()
+
+def test_main_stale_ttl(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, stale_ttl=600
+    )
+    main()
+    cache_mock.configure.assert_called_once_with(
+        backend=None, cache_dir=None, max_entries=None, max_bytes=None, mode=None,
+        stale_ttl=600, negative_ttl=None, geo_radius=None
+    )
+    cli_mock.fetch_and_display_weather.assert_called_once_with(
+        city="Kyiv", use_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=600,
+        lean=False
+    )
+
+def test_main_lean(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, lean=True
+    )
+    main()
+    cache_mock.configure.assert_not_called()
+    cli_mock.fetch_and_display_weather.assert_called_once_with(
+        city="Kyiv", use_cache=True, ttl=cache_mock.DEFAULT_TTL, stale_ttl=0,
+        lean=True
+    )
+
+def test_main_timings(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, timings="json"
+    )
+    with mock.patch.object(main_module, "timings") as timings_mock:
+        main()
+    timings_mock.enable.assert_called_once_with("json")
+    timings_mock.phase.assert_called_once_with("total")
+    cli_mock.fetch_and_display_weather.assert_called_once()
+    cli_mock.report_timings.assert_called_once_with()
+
+def test_main_watch_metrics_port(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=60, no_cache=False, ttl=cache_mock.DEFAULT_TTL, metrics_port=9108
+    )
+    main()
+    assert cli_mock.watch_mode.call_args.kwargs["metrics_port"] == 9108
+
+def test_main_metrics_port_requires_watch(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=cache_mock.DEFAULT_TTL, metrics_port=9108
+    )
+    with mock.patch("argparse.ArgumentParser.error", side_effect=SystemExit(2)):
+        with pytest.raises(SystemExit):
+            main()
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+def test_main_watch_many_cities(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    args = make_args(watch=300, no_cache=False, ttl=cache_mock.DEFAULT_TTL, workers=4)
+    args.city = ["Kyiv", "Lviv=60"]
+    patch_argparse_parse_args.return_value = args
+    main()
+    cli_mock.watch_mode.assert_not_called()
+    cli_mock.watch_many.assert_called_once_with(
+        [("Kyiv", 300), ("Lviv", 60)], use_cache=True, ttl=cache_mock.DEFAULT_TTL,
+        lean=False, max_workers=4, jitter=0.1, metrics_port=None
+    )
+
+def test_main_watch_city_interval(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Lviv=60", watch=300, no_cache=False, ttl=cache_mock.DEFAULT_TTL
+    )
+    main()
+    assert cli_mock.watch_mode.call_args.kwargs["city"] == "Lviv"
+    assert cli_mock.watch_mode.call_args.kwargs["interval"] == 60
+
+@pytest.mark.parametrize("spec", ["Lviv=0", "Lviv=soon"])
+def test_main_watch_city_bad_interval(patch_argparse_parse_args, patch_cli_and_cache, spec):
+    cli_mock, cache_mock = patch_cli_and_cache
+    args = make_args(watch=300, no_cache=False, ttl=cache_mock.DEFAULT_TTL)
+    args.city = ["Kyiv", spec]
+    patch_argparse_parse_args.return_value = args
+    with mock.patch("argparse.ArgumentParser.error", side_effect=SystemExit(2)):
+        with pytest.raises(SystemExit):
+            main()
+    cli_mock.watch_many.assert_not_called()
+
 def test_main_keyboard_interrupt(monkeypatch, patch_print, patch_sys_exit):
     def raise_keyboard_interrupt():
         raise KeyboardInterrupt()
@@ -109,4 +314,139 @@ def test_main_unhandled_exception(monkeypatch, patch_print, patch_sys_exit):
     monkeypatch.setattr("src.main.main", raise_exception)
     main_module.__name__ = "__main__"
     with pytest.raises(RuntimeError):
-        raise_exception()
\ No newline at end of file
+        raise_exception()
+DAEMON_OK = {"ok": True, "info": {"city": "Kyiv"}, "source": "cache"}
+
+def test_main_uses_daemon_when_running(patch_argparse_parse_args, patch_cli_and_cache, patch_remote):
+    cli_mock, _ = patch_cli_and_cache
+    patch_remote.fetch_weather.return_value = [DAEMON_OK]
+    patch_argparse_parse_args.return_value = make_args(city="Kyiv", watch=None, no_cache=False, ttl=300)
+    main()
+    patch_remote.fetch_weather.assert_called_once_with(["Kyiv"], use_cache=True, ttl=300, lean=False)
+    cli_mock.display_remote.assert_called_once_with(["Kyiv"], [DAEMON_OK])
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+def test_main_daemon_batch_failure_exits(patch_argparse_parse_args, patch_cli_and_cache, patch_remote, patch_sys_exit):
+    cli_mock, _ = patch_cli_and_cache
+    patch_remote.fetch_weather.return_value = [DAEMON_OK, DAEMON_OK]
+    cli_mock.display_remote.return_value = False
+    patch_argparse_parse_args.return_value = make_args(watch=None, no_cache=True, ttl=300)
+    patch_argparse_parse_args.return_value.city = ["Kyiv", "Lviv"]
+    main()
+    patch_remote.fetch_weather.assert_called_once_with(["Kyiv", "Lviv"], use_cache=False, ttl=300, lean=False)
+    cli_mock.fetch_and_display_many.assert_not_called()
+    patch_sys_exit.assert_called_once_with(1)
+
+def test_main_falls_back_when_daemon_overloaded(patch_argparse_parse_args, patch_cli_and_cache, patch_remote):
+    cli_mock, _ = patch_cli_and_cache
+    patch_remote.fetch_weather.return_value = [{"ok": False, "error": "Overloaded"}]
+    patch_argparse_parse_args.return_value = make_args(city="Kyiv", watch=None, no_cache=False, ttl=300)
+    main()
+    cli_mock.display_remote.assert_not_called()
+    cli_mock.fetch_and_display_weather.assert_called_once()
+
+@pytest.mark.parametrize("option", [
+    {"no_daemon": True}, {"timings": "text"}, {"cache_dir": "/tmp/c"}, {"stale_ttl": 60},
+])
+def test_main_skips_daemon(patch_argparse_parse_args, patch_cli_and_cache, patch_remote, option):
+    cli_mock, _ = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=300, **option
+    )
+    main()
+    patch_remote.fetch_weather.assert_not_called()
+    cli_mock.fetch_and_display_weather.assert_called_once()
+
+def test_main_serve(patch_argparse_parse_args, patch_cli_and_cache, patch_remote):
+    cli_mock, _ = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=300, serve="", workers=4, queue_size=16
+    )
+    main()
+    cli_mock.serve_mode.assert_called_once_with(None, max_workers=4, queue_size=16)
+    cli_mock.get_user_choice.assert_not_called()
+    patch_remote.fetch_weather.assert_not_called()
+
+def test_main_warm(patch_argparse_parse_args, patch_cli_and_cache, tmp_path):
+    cli_mock, _ = patch_cli_and_cache
+    cities_file = tmp_path / "hot.txt"
+    cities_file.write_text("Kyiv\n# comment\nLviv\n", encoding="utf-8")
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=600, warm=str(cities_file), warm_fraction=0.7, workers=3
+    )
+    main()
+    cli_mock.warm_mode.assert_called_once_with(
+        ["Kyiv", "Lviv"], ttl=600, fraction=0.7, jitter=0.1, max_workers=3, lean=False
+    )
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+def test_main_warm_requires_cache(patch_argparse_parse_args, patch_cli_and_cache, tmp_path):
+    cli_mock, _ = patch_cli_and_cache
+    cities_file = tmp_path / "hot.txt"
+    cities_file.write_text("Kyiv\n", encoding="utf-8")
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=True, ttl=300, warm=str(cities_file)
+    )
+    with mock.patch("argparse.ArgumentParser.error", side_effect=SystemExit(2)) as error:
+        with pytest.raises(SystemExit):
+            main()
+    error.assert_called_once()
+    cli_mock.warm_mode.assert_not_called()
+
+def test_main_negative_ttl(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        city="Kyiv", watch=None, no_cache=False, ttl=300, negative_ttl=0
+    )
+    main()
+    assert cache_mock.configure.call_args.kwargs["negative_ttl"] == 0
+
+def test_main_cache_negative(patch_argparse_parse_args, patch_cli_and_cache, patch_print):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=300, cache_negative=True
+    )
+    main()
+    cli_mock.format_negative_entries.assert_called_once_with([])
+    patch_print.assert_called_once_with("negative")
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+@pytest.mark.parametrize("value, city", [("", None), ("Kyvi", "Kyvi")])
+def test_main_cache_purge_negative(patch_argparse_parse_args, patch_cli_and_cache, value, city):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=300, cache_purge_negative=value
+    )
+    main()
+    cache_mock.purge_negative.assert_called_once_with(city)
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+def test_main_coordinates(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, cache_mock = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=300, lat=50.45, lon=30.5234, radius=5.0
+    )
+    main()
+    assert cache_mock.configure.call_args.kwargs["geo_radius"] == 5.0
+    cli_mock.get_user_choice.assert_not_called()
+    assert cli_mock.fetch_and_display_weather.call_args.kwargs["city"] == "50.4500,30.5234"
+
+def test_main_latitude_requires_longitude(patch_argparse_parse_args, patch_cli_and_cache):
+    cli_mock, _ = patch_cli_and_cache
+    patch_argparse_parse_args.return_value = make_args(
+        watch=None, no_cache=False, ttl=300, lat=50.45
+    )
+    with mock.patch("argparse.ArgumentParser.error", side_effect=SystemExit(2)) as error:
+        with pytest.raises(SystemExit):
+            main()
+    error.assert_called_once()
+    cli_mock.fetch_and_display_weather.assert_not_called()
+
+@pytest.mark.parametrize("parse, value", [
+    (main_module.latitude, "91"), (main_module.longitude, "-180.5"),
+    (main_module.non_negative_float, "-1"), (main_module.latitude, "north"),
+])
+def test_coordinate_arguments_are_validated(parse, value):
+    import argparse
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse(value)
@@ -0,0 +1,83 @@
+import json
+from unittest import mock
+from src.weather_app import cache
+from src.weather_app.cache import MemoryTier
+
+
+def test_repeat_lookup_skips_store(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    store = cache.get_store()
+    with mock.patch.object(store, "resolve", wraps=store.resolve) as store_read:
+        for _ in range(5):
+            assert cache.get_from_cache("Kyiv") == weather_payload
+    store_read.assert_not_called()
+    assert cache.memory_stats()["hits"] == 5
+
+
+def test_missing_key_is_remembered(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    store = cache.get_store()
+    with mock.patch.object(store, "resolve", wraps=store.resolve) as store_read:
+        assert cache.get_from_cache("Lviv") is None
+        assert cache.get_from_cache("Lviv") is None
+    assert store_read.call_count == 1
+
+
+def test_external_write_invalidates_tier(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "_memory", MemoryTier(max_entries=4))
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    assert cache.get_from_cache("Kyiv", now=1001.0) == weather_payload
+
+    # Another process rewrites the file
+    other = dict(weather_payload, marker="other-process")
+    with open(tmp_cache, "w", encoding="utf-8") as f:
+        json.dump({"kyiv": {"data": other, "cached_at": 1000.0}}, f)
+
+    assert cache.get_from_cache("Kyiv", now=1001.0) == other
+    assert cache.memory_stats()["invalidations"] == 1
+
+
+def test_external_sqlite_write_invalidates_tier(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    monkeypatch.setattr(cache, "_memory", MemoryTier(max_entries=4))
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    assert cache.get_from_cache("Kyiv", now=1001.0) == weather_payload
+
+    other_store = cache.SqliteStore(cache.sqlite_path())
+    other = dict(weather_payload, marker="other-process")
+    other_store.set("kyiv", cache.make_entry(other, 1000.0, 300))
+    other_store.close()
+
+    assert cache.get_from_cache("Kyiv", now=1001.0) == other
+
+
+def test_own_write_updates_tier(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    cache.get_from_cache("Lviv", now=1000.0)
+    newer = dict(weather_payload, marker="newer")
+    cache.set_to_cache("Kyiv", newer, now=1001.0)
+    assert cache.get_from_cache("Kyiv", now=1002.0) == newer
+    # Lviv's remembered absence survives our own write
+    assert cache.memory_stats()["invalidations"] == 0
+
+
+def test_lru_eviction(backend, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache._memory, "max_entries", 4)
+    for i in range(6):
+        cache.set_to_cache(f"city{i}", weather_payload)
+    stats = cache.memory_stats()
+    assert stats["size"] == 4
+    assert stats["evictions"] == 2
+
+
+def test_expired_entry_is_dropped(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0)
+    assert cache.get_from_cache("Kyiv", ttl=60, now=1100.0) is None
+    assert cache.memory_stats()["size"] == 0
+
+
+def test_disabled_tier(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "_memory", MemoryTier(max_entries=0))
+    cache.set_to_cache("Kyiv", weather_payload)
+    assert cache.get_from_cache("Kyiv") == weather_payload
+    assert cache.memory_stats()["size"] == 0
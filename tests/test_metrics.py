@@ -0,0 +1,139 @@
+import io
+import pytest
+import requests
+from unittest import mock
+from src.weather_app import api, cli, metrics
+from src.weather_app.breaker import CircuitBreaker
+from src.weather_app.screen import Screen
+from loadtest.stub_server import StubWttr
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def stub_client(weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload), "/Bad": (200, "<html>")}) as stub:
+        client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+        previous = api.set_default_client(client)
+        yield stub
+        api.set_default_client(previous)
+        client.close()
+
+
+def test_counter_and_histogram_render():
+    metrics.CACHE_HITS.inc()
+    metrics.UPSTREAM_ERRORS.inc(labels=("NetworkError",))
+    metrics.UPSTREAM_ERRORS.inc(2, labels=("NetworkError",))
+    metrics.FETCH_DURATION.observe(0.007)
+    metrics.FETCH_DURATION.observe(20)
+    text = metrics.render()
+    assert "# TYPE weather_cache_hits_total counter\nweather_cache_hits_total 1\n" in text
+    assert 'weather_upstream_errors_total{class="NetworkError"} 3\n' in text
+    assert 'weather_fetch_duration_seconds_bucket{le="0.005"} 0\n' in text
+    assert 'weather_fetch_duration_seconds_bucket{le="0.01"} 1\n' in text
+    assert 'weather_fetch_duration_seconds_bucket{le="10"} 1\n' in text
+    assert 'weather_fetch_duration_seconds_bucket{le="+Inf"} 2\n' in text
+    assert "weather_fetch_duration_seconds_count 2\n" in text
+
+
+def test_resident_memory_is_reported():
+    rss = metrics.resident_memory_bytes()
+    assert rss is None or rss > 0
+    if rss is not None:
+        assert "process_resident_memory_bytes " in metrics.render()
+
+
+def test_serve_exposes_metrics():
+    metrics.CACHE_MISSES.inc()
+    server = metrics.serve(0)
+    try:
+        host, port = server.server_address
+        response = requests.get(f"http://{host}:{port}/metrics", timeout=5)
+        assert requests.get(f"http://{host}:{port}/other", timeout=5).status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "weather_cache_misses_total 1" in response.text
+
+
+def test_fetch_and_display_updates_metrics(stub_client, capsys):
+    assert cli.fetch_and_display_weather("Kyiv")
+    assert cli.fetch_and_display_weather("Kyiv")
+    assert metrics.CACHE_MISSES.value() == 1
+    assert metrics.CACHE_HITS.value() == 1
+    assert metrics.FETCH_DURATION.count == 1
+    assert metrics.RENDER_DURATION.count == 2
+    assert metrics.RECEIVED_BYTES.value() > 0
+
+
+@pytest.mark.parametrize("city, error", [
+    ("Bad", "InvalidResponseError"),
+    ("Atlantis", "CityNotFoundError"),
+])
+def test_upstream_errors_by_class(stub_client, city, error):
+    with mock.patch("sys.exit"), mock.patch("builtins.print"):
+        assert cli.fetch_and_display_weather(city) is False
+    assert metrics.UPSTREAM_ERRORS.value((error,)) == 1
+    assert metrics.FETCH_DURATION.count == 1
+
+
+def test_partial_parse_counts_streamed_bytes(weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        client = api.WeatherClient(base_url=stub.url, partial=True)
+        client.fetch("Kyiv")
+        client.close()
+    assert metrics.RECEIVED_BYTES.value() > 0
+
+
+def test_watch_mode_serves_metrics_in_background(stub_client):
+    scraped = []
+
+    def sleep(seconds):
+        # Під час паузи між оновленнями сервер метрик уже відповідає
+        scraped.append(requests.get("http://127.0.0.1:%d/metrics" % port, timeout=5).text)
+        raise KeyboardInterrupt()
+
+    server = metrics.serve(0)
+    port = server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+    with mock.patch.object(cli.time, "sleep", sleep), mock.patch("builtins.print"), \
+            pytest.raises(SystemExit):
+        cli.watch_mode("Kyiv", interval=60, metrics_port=port)
+    assert "weather_cache_misses_total 1" in scraped[0]
+
+
+def test_watch_mode_survives_upstream_errors(stub_client):
+    stream = io.StringIO()
+    ticks = []
+
+    def sleep(seconds):
+        ticks.append(seconds)
+        if len(ticks) == 3:
+            raise KeyboardInterrupt()
+
+    with mock.patch.object(cli, "Screen", lambda: Screen(stream, ansi=False)), \
+            mock.patch.object(cli.time, "sleep", sleep), pytest.raises(SystemExit):
+        cli.watch_mode("Bad", interval=60)
+    assert len(ticks) == 3
+    assert metrics.UPSTREAM_ERRORS.value(("InvalidResponseError",)) == 3
+    assert "❌ Помилка" in stream.getvalue()
+
+
+def test_watch_mode_reports_busy_port():
+    server = metrics.serve(0)
+    try:
+        with mock.patch.object(cli, "print_error") as print_error:
+            cli.watch_mode("Kyiv", metrics_port=server.server_address[1])
+        print_error.assert_called_once()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,99 @@
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli
+from src.weather_app.breaker import CircuitBreaker
+from loadtest.stub_server import StubWttr
+
+
+@pytest.fixture
+def stub(weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+        previous = api.set_default_client(client)
+        yield stub
+        api.set_default_client(previous)
+        client.close()
+
+
+def test_negative_entry_expires_with_its_own_ttl(backend):
+    cache.set_negative("Kyvi", "Місто 'Kyvi' не знайдено", now=1000, ttl=60)
+    assert cache.get_negative("kyvi", now=1059) == "Місто 'Kyvi' не знайдено"
+    assert cache.get_negative("Kyvi", now=1061) is None
+    # Negative entries never look like weather data
+    assert cache.get_from_cache("Kyvi", now=1001) is None
+
+
+def test_list_and_purge_negative(backend, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    cache.set_negative("Kyvi", "not found")
+    cache.set_negative("Lvov", "not found")
+    assert [entry["city"] for entry in cache.list_negative()] == ["Kyvi", "Lvov"]
+    assert cache.cache_stats()["negative"] == 2
+    assert cache.purge_negative("lvov") == 1
+    assert cache.purge_negative("Atlantis") == 0
+    assert cache.purge_negative() == 1
+    assert cache.list_negative() == []
+    assert cache.get_from_cache("Kyiv") == weather_payload
+
+
+def test_negative_entries_survive_migration_to_sqlite(monkeypatch):
+    cache.set_negative("Kyvi", "Місто 'Kyvi' не знайдено", now=1000, ttl=60)
+    assert cache.migrate_json_to_sqlite() == 1
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "sqlite")
+    assert cache.get_negative("Kyvi", now=1030) == "Місто 'Kyvi' не знайдено"
+
+
+def test_refresh_process_keeps_negative_ttl(monkeypatch):
+    from src.weather_app import refresh
+
+    monkeypatch.setattr(cache, "NEGATIVE_TTL", 42)
+    command = refresh.refresh_command("Kyiv", 60)
+    assert command[command.index("--negative-ttl") + 1] == "42"
+    with mock.patch.object(cache, "configure") as configure, \
+            mock.patch.object(refresh, "refresh", return_value=True):
+        refresh.main(["--city", "Kyiv", "--negative-ttl", "0"])
+    assert configure.call_args.kwargs["negative_ttl"] == 0
+
+
+def test_zero_ttl_disables_negative_caching(monkeypatch):
+    cache.set_negative("Kyvi", "not found", ttl=0)
+    assert cache.list_negative() == []
+    cache.set_negative("Kyvi", "not found")
+    monkeypatch.setattr(cache, "NEGATIVE_TTL", 0)
+    assert cache.get_negative("Kyvi") is None
+
+
+def test_single_flight_answers_repeated_unknown_city_locally(stub):
+    for _ in range(3):
+        with pytest.raises(api.CityNotFoundError):
+            api.fetch_single_flight("Atlantis")
+    assert stub.count("/Atlantis") == 1
+
+
+def test_get_weather_many_records_and_reuses_negative_entries(stub):
+    first = api.get_weather_many(["Kyiv", "Atlantis"])
+    second = api.get_weather_many(["Atlantis"])
+    assert isinstance(first[1].error, api.CityNotFoundError)
+    assert isinstance(second[0].error, api.CityNotFoundError) and second[0].from_cache
+    assert stub.count("/Atlantis") == 1
+
+
+def test_cli_answers_known_unknown_city_without_network(stub):
+    cache.set_negative("Atlantis", "Місто 'Atlantis' не знайдено")
+    with mock.patch.object(cli, "print_error") as print_error:
+        assert cli.fetch_and_display_weather("Atlantis") is False
+    assert print_error.call_args.kwargs["exit_code"] == 2
+    assert stub.count() == 0
+
+
+def test_no_cache_ignores_negative_entries(stub):
+    cache.set_negative("Kyiv", "stale negative")
+    assert api.get_weather_many(["Kyiv"], use_cache=False)[0].ok
+
+
+def test_format_negative_entries():
+    assert "немає" in cli.format_negative_entries([])
+    text = cli.format_negative_entries([
+        {"city": "Kyvi", "message": "not found", "age": 5, "expires_in": 595.4},
+    ])
+    assert "Kyvi  ще 595 с · not found" in text
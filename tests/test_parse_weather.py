@@ -0,0 +1,78 @@
+import copy
+import pytest
+from src.weather_app.api import (
+    InvalidResponseError,
+    check_payload,
+    extract_weather_info,
+    validate_weather_data,
+)
+from src.weather_app.models import ValidationError, WeatherInfo, parse_weather
+
+
+def test_parse_weather_extracts_all_fields(weather_payload):
+    assert parse_weather(weather_payload) == WeatherInfo(
+        city="Kyiv", country="Ukraine", temperature=25, feels_like=28,
+        description="Sunny", humidity=60, wind_speed=10, pressure=1013,
+    )
+
+
+def test_wrappers_agree_with_parse_weather(weather_payload):
+    assert validate_weather_data(weather_payload) is True
+    assert extract_weather_info(weather_payload) == parse_weather(weather_payload).to_dict()
+
+
+def break_payload(payload, path, value):
+    data = copy.deepcopy(payload)
+    target = data
+    for step in path[:-1]:
+        target = target[step]
+    if value is KeyError:
+        del target[path[-1]]
+    else:
+        target[path[-1]] = value
+    return data
+
+
+@pytest.mark.parametrize("path, value, field", [
+    (("current_condition",), KeyError, "current_condition"),
+    (("current_condition",), [], "current_condition"),
+    (("current_condition",), ["x"], "current_condition"),
+    (("nearest_area",), None, "nearest_area"),
+    (("current_condition", 0, "temp_C"), None, "current_condition[0].temp_C"),
+    (("current_condition", 0, "weatherDesc"), [], "current_condition[0].weatherDesc"),
+    (("current_condition", 0, "weatherDesc", 0, "value"), "", "current_condition[0].weatherDesc[0].value"),
+    (("nearest_area", 0, "areaName"), KeyError, "nearest_area[0].areaName"),
+    (("nearest_area", 0, "areaName", 0), {}, "nearest_area[0].areaName[0].value"),
+])
+def test_parse_weather_reports_failed_field(weather_payload, path, value, field):
+    data = break_payload(weather_payload, path, value)
+    with pytest.raises(ValidationError) as excinfo:
+        parse_weather(data)
+    assert excinfo.value.field == field
+    assert validate_weather_data(data) is False
+
+
+def test_parse_weather_rejects_non_dict():
+    with pytest.raises(ValidationError, match="<root>"):
+        parse_weather(["not", "a", "dict"])
+
+
+def test_parse_weather_optional_fields_default(weather_payload):
+    data = break_payload(weather_payload, ("nearest_area", 0, "country"), ["x"])
+    for name in ("FeelsLikeC", "humidity", "windspeedKmph", "pressure"):
+        del data["current_condition"][0][name]
+    info = parse_weather(data)
+    assert info.country == ""
+    assert (info.feels_like, info.humidity, info.wind_speed, info.pressure) == (0, 0, 0, 0)
+
+
+def test_validation_error_is_value_error(weather_payload):
+    with pytest.raises(ValueError):
+        WeatherInfo.from_data({})
+
+
+def test_check_payload_names_failed_field(weather_payload):
+    data = break_payload(weather_payload, ("current_condition", 0, "temp_C"), None)
+    with pytest.raises(InvalidResponseError, match=r"\(current_condition\[0\]\.temp_C\)"):
+        check_payload(data, "Kyiv")
+
@@ -0,0 +1,65 @@
+import random
+import pytest
+from src.weather_app.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_keys_are_due_immediately_and_in_order(clock):
+    scheduler = Scheduler(clock=clock)
+    scheduler.add("b", 10, jitter=0, delay=2)
+    scheduler.add("a", 10, jitter=0)
+    assert scheduler.pop_due() == ["a"]
+    assert scheduler.next_due() == 102.0
+    clock.now = 102.0
+    assert scheduler.pop_due() == ["b"]
+    assert len(scheduler) == 0
+    assert scheduler.next_due() is None
+
+
+def test_each_key_keeps_its_own_interval(clock):
+    scheduler = Scheduler(clock=clock)
+    scheduler.add("fast", 5, jitter=0)
+    scheduler.add("slow", 60, jitter=0)
+    seen = []
+    for _ in range(14):
+        for key in scheduler.pop_due():
+            seen.append((clock.now, key))
+            scheduler.schedule(key)
+        clock.now = scheduler.next_due()
+    assert [t for t, key in seen if key == "slow"] == [100.0, 160.0]
+    assert [t for t, key in seen if key == "fast"][:3] == [100.0, 105.0, 110.0]
+
+
+def test_popped_key_is_not_due_again_until_rescheduled(clock):
+    scheduler = Scheduler(clock=clock)
+    scheduler.add("kyiv", 1, jitter=0)
+    assert scheduler.pop_due() == ["kyiv"]
+    clock.now += 10
+    assert scheduler.pop_due() == []
+    assert scheduler.schedule("kyiv") == 111.0
+
+
+def test_jitter_spreads_within_bounds(clock):
+    scheduler = Scheduler(clock=clock, rng=random.Random(3))
+    scheduler.add("kyiv", 100, jitter=0.1)
+    dues = {scheduler.schedule("kyiv", now=0) for _ in range(50)}
+    assert all(90 <= due <= 110 for due in dues)
+    assert len(dues) > 1
+
+
+@pytest.mark.parametrize("interval, jitter", [(0, 0.1), (10, 1.0), (10, -0.1)])
+def test_add_rejects_invalid_settings(clock, interval, jitter):
+    with pytest.raises(ValueError):
+        Scheduler(clock=clock).add("kyiv", interval, jitter)
@@ -0,0 +1,84 @@
+import io
+from unittest import mock
+from src.weather_app import cli, screen
+from src.weather_app.screen import CLEAR_LINE_END, CLEAR_SCREEN, CLEAR_TO_END, Screen, move_to
+
+
+def test_plain_mode_writes_only_changed_frames():
+    stream = io.StringIO()
+    view = Screen(stream, ansi=False)
+    assert view.render("a\nb")
+    assert not view.render("a\nb")
+    assert view.render("a\nc")
+    assert stream.getvalue() == "a\nb\na\nc\n"
+
+
+def test_first_ansi_frame_clears_screen_once():
+    stream = io.StringIO()
+    view = Screen(stream, ansi=True)
+    view.render("title\nrow")
+    assert stream.getvalue() == CLEAR_SCREEN + "title\nrow\n"
+
+
+def test_ansi_rewrites_only_changed_lines():
+    stream = io.StringIO()
+    view = Screen(stream, ansi=True)
+    view.render("title\nKyiv 20\nLviv 18")
+    stream.seek(0)
+    stream.truncate()
+
+    view.render("title\nKyiv 21\nLviv 18")
+    output = stream.getvalue()
+    assert output == move_to(2) + "Kyiv 21" + CLEAR_LINE_END + move_to(4)
+    assert CLEAR_SCREEN not in output
+
+
+def test_shorter_frame_clears_leftover_lines():
+    stream = io.StringIO()
+    view = Screen(stream, ansi=True)
+    view.render("a\nb\nc")
+    stream.seek(0)
+    stream.truncate()
+
+    view.render("a")
+    assert stream.getvalue() == move_to(2) + CLEAR_TO_END
+
+
+def test_reset_redraws_full_frame():
+    stream = io.StringIO()
+    view = Screen(stream, ansi=True)
+    view.render("a")
+    view.reset()
+    assert view.render("a")
+    assert stream.getvalue().count(CLEAR_SCREEN) == 2
+
+
+def test_non_tty_falls_back_to_plain_output():
+    assert not screen.supports_ansi(io.StringIO())
+    tty = mock.Mock()
+    tty.isatty.return_value = True
+    with mock.patch.dict("os.environ", {"TERM": "dumb"}):
+        assert not screen.supports_ansi(tty)
+    with mock.patch.dict("os.environ", {"TERM": "xterm"}):
+        assert screen.supports_ansi(tty)
+
+
+def test_watch_mode_skips_identical_ticks():
+    stream = io.StringIO()
+    ticks = []
+
+    def fetch(*args, **kwargs):
+        print("🌡️  Температура: 25°C")
+        return True
+
+    def sleep(seconds):
+        ticks.append(seconds)
+        if len(ticks) == 3:
+            raise KeyboardInterrupt()
+
+    with mock.patch.object(cli, "Screen", lambda: Screen(stream, ansi=False)), \
+            mock.patch.object(cli, "fetch_and_display_weather", side_effect=fetch), \
+            mock.patch.object(cli.time, "sleep", sleep), \
+            mock.patch("sys.exit"):
+        cli.watch_mode("Kyiv", interval=5)
+    assert stream.getvalue().count("Температура") == 1
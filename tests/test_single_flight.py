@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, locking
+from loadtest.stub_server import StubWttr
+
+MAIN = os.path.join(os.path.dirname(__file__), os.pardir, "src", "main.py")
+
+pytestmark = pytest.mark.skipif(locking.fcntl is None, reason="fcntl is not available")
+
+
+def test_key_lock_times_out_while_held(tmp_cache):
+    with locking.key_lock("kyiv"):
+        with pytest.raises(locking.LockTimeout):
+            with locking.key_lock("kyiv", timeout=0.05):
+                pass
+        with locking.key_lock("lviv", timeout=0):
+            pass
+
+
+def test_waiter_reads_entry_written_by_lock_holder(tmp_cache, weather_payload):
+    started = threading.Event()
+
+    def holder():
+        with locking.key_lock("kyiv"):
+            started.set()
+            time.sleep(0.1)
+            cache.set_to_cache("Kyiv", weather_payload)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    started.wait()
+    with mock.patch.object(api, "get_weather") as get_weather:
+        result = api.fetch_single_flight("Kyiv")
+    thread.join()
+    get_weather.assert_not_called()
+    assert result.from_cache and result.data == weather_payload
+
+
+def test_lock_timeout_falls_back_to_fetch(tmp_cache, weather_payload):
+    with locking.key_lock("kyiv"):
+        with mock.patch.object(api, "get_weather", return_value=weather_payload) as get_weather:
+            result = api.fetch_single_flight("Kyiv", lock_timeout=0.05)
+    get_weather.assert_called_once_with("Kyiv")
+    assert result.data == weather_payload
+    assert cache.get_from_cache("Kyiv") == weather_payload
+
+
+def test_concurrent_processes_make_one_upstream_request(tmp_path, weather_payload):
+    processes = 8
+    with StubWttr({"/Kyiv": (200, weather_payload)}, delay=0.3) as stub:
+        env = dict(os.environ, WEATHER_API_URL=stub.url)
+        # A developer's running daemon must not answer for the processes
+        env.pop("WEATHER_DAEMON", None)
+        procs = [
+            subprocess.Popen(
+                [sys.executable, MAIN, "--city", "Kyiv", "--no-daemon"],
+                cwd=tmp_path, env=env,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            )
+            for _ in range(processes)
+        ]
+        outputs = [p.communicate(timeout=60) for p in procs]
+        assert [p.returncode for p in procs] == [0] * processes, outputs
+        assert stub.count("/Kyiv") == 1
+    assert all("Kyiv, Ukraine" in out.decode("utf-8") for out, _ in outputs)
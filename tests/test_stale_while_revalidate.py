@@ -0,0 +1,94 @@
+import time
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli, refresh
+from src.weather_app.cache import MemoryTier
+from src.weather_app.models import WeatherInfo
+from loadtest.stub_server import StubWttr
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory(monkeypatch):
+    monkeypatch.setattr(cache, "_memory", MemoryTier())
+
+
+def test_lookup_cache_reports_age_and_staleness(tmp_cache, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=60)
+    fresh = cache.lookup_cache("Kyiv", ttl=60, stale_ttl=120, now=1030.0)
+    assert fresh.age == 30.0 and not fresh.stale
+    stale = cache.lookup_cache("Kyiv", ttl=60, stale_ttl=120, now=1100.0)
+    assert stale.age == 100.0 and stale.stale
+    assert stale.data == weather_payload
+    assert cache.lookup_cache("Kyiv", ttl=60, stale_ttl=120, now=1200.0) is None
+    assert cache.get_from_cache("Kyiv", ttl=60, now=1100.0) is None
+
+
+def test_stale_entries_survive_compaction(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "STALE_TTL", 300)
+    cache.set_to_cache("Kyiv", weather_payload, now=1000.0, ttl=60)
+    cache.set_to_cache("Lviv", weather_payload, now=1200.0, ttl=60)
+    assert cache.lookup_cache("Kyiv", ttl=60, stale_ttl=300, now=1200.0).stale
+
+
+def test_cli_serves_stale_and_schedules_refresh(tmp_cache, weather_payload, capsys):
+    cache.set_to_cache("Kyiv", weather_payload, now=time.time() - 100, ttl=60)
+    with mock.patch.object(refresh, "schedule_refresh") as schedule, \
+            mock.patch.object(api, "get_weather") as get_weather:
+        assert cli.fetch_and_display_weather("Kyiv", ttl=60, stale_ttl=300) is True
+    get_weather.assert_not_called()
+    schedule.assert_called_once_with("Kyiv", 60, mode="process", lean=False)
+    out = capsys.readouterr().out
+    assert "застарілі дані, 100 с тому" in out
+    assert "Kyiv, Ukraine" in out
+    assert cache.read_counters()["stale_served"] == 1
+
+
+def test_cli_without_stale_window_fetches(tmp_cache, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload, now=time.time() - 100, ttl=60)
+    with mock.patch.object(refresh, "schedule_refresh") as schedule, \
+            mock.patch.object(api, "get_weather", return_value=weather_payload) as get_weather:
+        assert cli.fetch_and_display_weather("Kyiv", ttl=60) is True
+    get_weather.assert_called_once_with("Kyiv")
+    schedule.assert_not_called()
+
+
+def test_refresh_updates_cache_and_counters(tmp_cache, weather_payload):
+    with mock.patch.object(api, "get_weather", return_value=weather_payload):
+        assert refresh.refresh("Kyiv", ttl=60) is True
+    with mock.patch.object(api, "get_weather", side_effect=api.NetworkError("down")):
+        assert refresh.refresh("Lviv", ttl=60) is False
+    assert cache.get_from_cache("Kyiv", ttl=60) == weather_payload
+    assert cache.read_counters() == {"stale_refreshed": 1, "stale_refresh_failed": 1}
+
+
+def test_refresh_uses_lean_fetch_path(tmp_cache):
+    info = WeatherInfo(city="Kyiv", temperature=21)
+    with mock.patch.object(api, "get_weather") as get_weather, \
+            mock.patch.object(api, "get_weather_lean", return_value=info) as get_weather_lean:
+        assert refresh.refresh("Kyiv", ttl=60, lean=True) is True
+    get_weather.assert_not_called()
+    get_weather_lean.assert_called_once_with("Kyiv")
+    assert cache.get_info_from_cache("Kyiv", ttl=60).temperature == 21
+    assert "--lean" in refresh.refresh_command("Kyiv", 60, lean=True)
+
+
+def test_refresh_in_thread_deduplicates(tmp_cache, weather_payload):
+    def slow_get_weather(city):
+        time.sleep(0.1)
+        return weather_payload
+
+    with mock.patch.object(api, "get_weather", side_effect=slow_get_weather) as get_weather:
+        first = refresh.refresh_in_thread("Kyiv", 60)
+        second = refresh.refresh_in_thread("kyiv", 60)
+        first.join()
+    assert second is None
+    get_weather.assert_called_once()
+
+
+def test_refresh_process_updates_cache(tmp_cache, monkeypatch, weather_payload):
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        monkeypatch.setenv("WEATHER_API_URL", stub.url)
+        process = refresh.spawn_refresh_process("Kyiv", ttl=60)
+        assert process.wait(timeout=30) == 0
+    assert stub.count("/Kyiv") == 1
+    assert cache.get_from_cache("Kyiv", ttl=60) == weather_payload
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import pytest
+from src.weather_app import cache
+
+MAIN = os.path.join(os.path.dirname(__file__), os.pardir, "src", "main.py")
+
+# Import budget for the cache-hit path, in milliseconds (interpreter startup excluded)
+STARTUP_BUDGET_MS = float(os.environ.get("WEATHER_STARTUP_BUDGET_MS", "100"))
+
+HTTP_STACK = ("requests", "urllib3", "ssl", "http", "charset_normalizer", "chardet", "idna", "certifi")
+
+
+def run_with_importtime(*args):
+    """Run src/main.py under -X importtime; return (process, [(module, cumulative_us, depth)])"""
+    env = dict(os.environ, WEATHER_API_URL="http://127.0.0.1:9")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN, *args],
+        capture_output=True, text=True, env=env, timeout=30
+    )
+    imports = []
+    started = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if name.strip() == "site" and depth == 0:
+            # Everything up to and including site is interpreter startup
+            started = True
+            continue
+        if started:
+            imports.append((name.strip(), int(cumulative), depth))
+    return proc, imports
+
+
+@pytest.fixture
+def cached_kyiv(tmp_cache, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    return str(tmp_cache.parent)
+
+
+def test_cache_hit_does_not_import_http_stack(cached_kyiv):
+    proc, imports = run_with_importtime("--city", "Kyiv", "--cache-dir", cached_kyiv)
+    assert proc.returncode == 0, proc.stderr
+    assert "дані з кешу" in proc.stdout
+    loaded = {name.split(".")[0] for name, _, _ in imports}
+    assert not loaded & set(HTTP_STACK)
+    assert "weather_app.api" not in {name for name, _, _ in imports}
+
+
+def test_cache_hit_import_budget(cached_kyiv):
+    proc, imports = run_with_importtime("--city", "Kyiv", "--cache-dir", cached_kyiv)
+    assert proc.returncode == 0, proc.stderr
+    total_ms = sum(cumulative for _, cumulative, depth in imports if depth == 0) / 1000
+    assert total_ms <= STARTUP_BUDGET_MS, (
+        f"cache-hit imports took {total_ms:.1f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)"
+    )
+
+
+def test_daemon_client_does_not_import_http_stack(weather_payload, monkeypatch):
+    import threading
+    from src.weather_app import api, daemon
+    from loadtest.stub_server import StubWttr
+
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        client = api.WeatherClient(base_url=stub.url)
+        server = daemon.make_server("127.0.0.1:0", daemon.WeatherDaemon(max_workers=1, client=client))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        monkeypatch.setenv("WEATHER_DAEMON", "127.0.0.1:%d" % server.server_address[1])
+        try:
+            proc, imports = run_with_importtime("--city", "Kyiv", "--no-cache")
+        finally:
+            server.shutdown()
+            server.server_close()
+            client.close()
+    assert proc.returncode == 0, proc.stderr
+    assert "Kyiv" in proc.stdout and stub.count("/Kyiv") == 1
+    loaded = {name.split(".")[0] for name, _, _ in imports}
+    assert not loaded & set(HTTP_STACK)
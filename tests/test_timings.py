@@ -0,0 +1,89 @@
+import io
+import json
+import pytest
+from src.weather_app import api, cli, timings
+from src.weather_app.breaker import CircuitBreaker
+from loadtest.stub_server import StubWttr
+
+
+@pytest.fixture(autouse=True)
+def reset_timings():
+    yield
+    timings.disable()
+    timings.reset()
+
+
+def test_disabled_phase_records_nothing():
+    assert timings.phase("a") is timings.phase("b")
+    with timings.phase("a"):
+        pass
+    timings.record("b", 1.0)
+    assert timings.snapshot() == {}
+
+
+def test_enabled_phase_accumulates():
+    timings.enable()
+    for _ in range(3):
+        with timings.phase("cache.read"):
+            pass
+    timings.record("http.wait", 0.25)
+    snapshot = timings.snapshot()
+    assert list(snapshot) == ["cache.read", "http.wait"]
+    assert snapshot["cache.read"]["count"] == 3
+    assert snapshot["http.wait"] == {"ms": 250.0, "count": 1}
+
+
+def test_phase_records_on_exception():
+    timings.enable()
+    with pytest.raises(RuntimeError):
+        with timings.phase("render"):
+            raise RuntimeError()
+    assert timings.snapshot()["render"]["count"] == 1
+
+
+def test_enable_rejects_unknown_output():
+    with pytest.raises(ValueError):
+        timings.enable("xml")
+
+
+def test_emit_json():
+    timings.enable("json")
+    timings.record("total", 0.001)
+    stream = io.StringIO()
+    timings.emit_json(stream)
+    assert json.loads(stream.getvalue()) == {"timings": {"total": {"ms": 1.0, "count": 1}}}
+
+
+@pytest.mark.parametrize("output", ["text", "json"])
+def test_report_timings_writes_stderr_and_resets(capsys, output):
+    timings.enable(output)
+    timings.record("render", 0.002)
+    cli.report_timings()
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "render" in captured.err
+    assert timings.snapshot() == {}
+
+
+def test_report_timings_disabled_prints_nothing(capsys):
+    cli.report_timings()
+    assert capsys.readouterr() == ("", "")
+
+
+def test_fetch_and_display_records_phases(weather_payload, capsys):
+    with StubWttr({"/Kyiv": (200, weather_payload)}) as stub:
+        client = api.WeatherClient(base_url=stub.url, breaker=CircuitBreaker())
+        previous = api.set_default_client(client)
+        try:
+            timings.enable()
+            assert cli.fetch_and_display_weather("Kyiv")
+            miss = timings.snapshot()
+            timings.reset()
+            assert cli.fetch_and_display_weather("Kyiv")
+            hit = timings.snapshot()
+        finally:
+            api.set_default_client(previous)
+            client.close()
+    assert {"cache.read", "lock.wait", "breaker", "http.wait", "http.body",
+            "parse.json", "parse.validate", "cache.write", "render"} <= set(miss)
+    assert set(hit) == {"cache.read", "render"}
@@ -0,0 +1,73 @@
+import time
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli, warmer
+from src.weather_app.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client(weather_payload):
+    client = mock.Mock()
+    client.fetch.return_value = weather_payload
+    return client
+
+
+def make_warmer(client, cities=("Kyiv", "Lviv"), **kwargs):
+    clock = FakeClock()
+    kwargs.setdefault("jitter", 0)
+    return warmer.Warmer(list(cities), ttl=10, client=client, scheduler=Scheduler(clock=clock), **kwargs), clock
+
+
+def test_refreshes_at_fraction_of_ttl(client):
+    warm, clock = make_warmer(client)
+    fetched_at = []
+    client.fetch.side_effect = lambda city: fetched_at.append((clock.now, city)) or client.fetch.return_value
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    with mock.patch.object(warmer.time, "sleep", sleep):
+        warm.run(stop=lambda: warm.refreshes >= 6)
+    assert [t for t, city in fetched_at if city == "Kyiv"] == [100.0, 108.0, 116.0]
+    assert cache.get_from_cache("Lviv", 10) is not None
+    stats = warm.stats()
+    # The first fill is not a probe; every later probe finds a fresh entry
+    assert stats["probes"] == 4 and stats["hit_ratio"] == 1.0
+
+
+def test_expired_entry_counts_as_miss_and_errors_are_counted(client, weather_payload):
+    warm, _ = make_warmer(client, cities=["Kyiv"])
+    client.fetch.side_effect = api.NetworkError("down")
+    assert warm.apply("kyiv", warm._fetch("Kyiv")) is False
+    cache.set_to_cache("Kyiv", weather_payload, now=time.time() - 60, ttl=10)
+    assert warm.probe("kyiv") is False
+    assert warm.stats() == {
+        "cities": 1, "refreshes": 0, "errors": 1, "probes": 1, "hits": 0, "hit_ratio": 0.0,
+    }
+
+
+def test_duplicate_cities_are_warmed_once(client):
+    warm, _ = make_warmer(client, cities=["Kyiv", "kyiv", None])
+    assert len(warm.cities) == 2
+
+
+@pytest.mark.parametrize("fraction, jitter", [(0.95, 0.1), (1.0, 0), (0, 0)])
+def test_refresh_must_land_before_expiry(client, fraction, jitter):
+    with pytest.raises(ValueError):
+        make_warmer(client, fraction=fraction, jitter=jitter)
+
+
+def test_format_warm_stats():
+    text = cli.format_warm_stats({
+        "cities": 2, "refreshes": 10, "errors": 1, "probes": 8, "hits": 7, "hit_ratio": 0.875,
+    })
+    assert "Оновлено: 10, помилок: 1" in text
+    assert "87.5% (7/8)" in text
@@ -0,0 +1,131 @@
+import io
+import threading
+import time
+import pytest
+from unittest import mock
+from src.weather_app import api, cache, cli, metrics
+from src.weather_app.models import WeatherInfo
+from src.weather_app.screen import Screen
+
+INFO = WeatherInfo(
+    city="Kyiv", country="Ukraine", temperature=25, feels_like=28,
+    description="Sunny", humidity=60, wind_speed=10, pressure=1013,
+)
+
+
+@pytest.fixture(autouse=True)
+def quiet_screen():
+    with mock.patch.object(cli, "Screen", lambda: Screen(io.StringIO(), ansi=False)), \
+            mock.patch("builtins.print"):
+        yield
+
+
+def test_format_weather_table_aligns_columns():
+    table = cli.format_weather_table([
+        ("Kyiv", INFO, "12:00:00"),
+        ("New York", None, "очікування"),
+    ])
+    lines = table.splitlines()
+    assert lines[1].startswith("Місто")
+    assert lines[3].split() == ["Kyiv", "25", "28", "Сонячно", "60%", "10", "км/год", "1013", "мбар", "12:00:00"]
+    assert lines[4].startswith("New York")
+    assert len({len(line) for line in (lines[0], lines[2], lines[-1])}) == 1
+
+
+def run_watch(cities, fetch, stop, **kwargs):
+    """Run watch_many until ``stop(rows)`` is true; returns the rendered row lists"""
+    renders = []
+
+    def table(rows):
+        renders.append(rows)
+        if stop(rows):
+            raise KeyboardInterrupt()
+        return ""
+
+    with mock.patch.object(cli, "fetch_city_result", side_effect=fetch), \
+            mock.patch.object(cli, "format_weather_table", side_effect=table), \
+            pytest.raises(SystemExit):
+        cli.watch_many(cities, jitter=0, **kwargs)
+    return renders
+
+
+def test_slow_city_does_not_delay_others():
+    calls = []
+    release = threading.Event()
+
+    def fetch(city, use_cache, ttl, lean):
+        calls.append(city)
+        if city == "Slow":
+            release.wait(5)
+        # A changing temperature makes every refresh a visible change
+        return api.WeatherResult(city, info=WeatherInfo(city, temperature=len(calls)))
+
+    def stop(rows):
+        return calls.count("Fast") >= 3
+
+    started = time.monotonic()
+    renders = run_watch([("Fast", 1), ("Slow", 1)], fetch, stop, use_cache=False)
+    release.set()
+    assert time.monotonic() - started < 4
+    assert renders[-1][1] == ("Slow", None, "очікування")
+    assert renders[-1][0][1] is not None
+
+
+def test_rows_keep_last_data_on_error_and_count_metrics(tmp_cache, weather_payload):
+    metrics.reset()
+    results = iter([
+        api.WeatherResult("Kyiv", weather_payload),
+        api.WeatherResult("Kyiv", error=api.NetworkError("down")),
+    ])
+    renders = run_watch(
+        [("Kyiv", 1)],
+        lambda city, use_cache, ttl, lean: next(results),
+        lambda rows: rows[0][2].startswith("❌"),
+    )
+    label, info, status = renders[-1][0]
+    assert info == INFO and status == "❌ down"
+    assert cache.get_from_cache("Kyiv") == weather_payload
+    assert metrics.CACHE_MISSES.value() == 1
+    assert metrics.UPSTREAM_ERRORS.value(("NetworkError",)) == 1
+
+
+def test_duplicate_cities_share_a_row():
+    renders = run_watch(
+        [("Kyiv", 60), ("kyiv", 60), (None, 60)],
+        lambda city, use_cache, ttl, lean: api.WeatherResult(city, info=INFO),
+        lambda rows: all(info is not None for _, info, _ in rows),
+        use_cache=False,
+    )
+    assert [label for label, _, _ in renders[-1]] == ["Kyiv", cli.AUTO_CITY_LABEL]
+
+
+def test_fetch_city_result_prefers_cache(weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    with mock.patch.object(api, "fetch_result") as fetch_result:
+        result = cli.fetch_city_result("Kyiv", True, 300, False)
+    fetch_result.assert_not_called()
+    assert result.from_cache
+
+
+def test_fetch_city_result_captures_errors():
+    with mock.patch.object(api, "fetch_result", side_effect=api.CityNotFoundError("nope")):
+        result = cli.fetch_city_result("Atlantis", False, 300, False)
+    assert isinstance(result.error, api.CityNotFoundError)
+
+
+def test_identical_refresh_skips_render():
+    calls = []
+
+    def fetch(city, use_cache, ttl, lean):
+        calls.append(city)
+        if len(calls) >= 4:
+            raise KeyboardInterrupt()
+        return api.WeatherResult(city, info=INFO)
+
+    stream = io.StringIO()
+    with mock.patch.object(cli, "Screen", lambda: Screen(stream, ansi=False)), \
+            mock.patch.object(cli, "fetch_city_result", side_effect=fetch), \
+            pytest.raises((SystemExit, KeyboardInterrupt)):
+        cli.watch_many([("Kyiv", 0.01)], use_cache=False, jitter=0)
+    # Initial frame plus the first result; identical refreshes write nothing
+    assert stream.getvalue().count("Місто") == 2
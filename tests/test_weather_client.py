@@ -0,0 +1,77 @@
+import pytest
+from unittest import mock
+import requests
+from src.weather_app import api, cache
+from src.weather_app.api import WeatherClient, get_default_client
+from src.weather_app.models import WeatherInfo
+
+
+def make_response(payload, status_code=200):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.content = b"{}"
+    return response
+
+
+def test_client_uses_separate_timeouts(weather_payload):
+    client = WeatherClient(connect_timeout=1.5, read_timeout=7)
+    with mock.patch.object(client.session, "get", return_value=make_response(weather_payload)) as mock_get:
+        client.fetch("Kyiv")
+    mock_get.assert_called_once_with("https://wttr.in/Kyiv?format=j1", timeout=(1.5, 7))
+
+
+def test_client_mounts_pooled_adapter():
+    client = WeatherClient(pool_connections=2, pool_maxsize=32)
+    adapter = client.session.get_adapter("https://wttr.in/")
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_connections == 2
+
+
+def test_client_custom_base_url(weather_payload):
+    client = WeatherClient(base_url="http://127.0.0.1:8080/")
+    with mock.patch.object(client.session, "get", return_value=make_response(weather_payload)) as mock_get:
+        client.fetch(None)
+    assert mock_get.call_args[0][0] == "http://127.0.0.1:8080/?format=j1"
+
+
+def test_client_reuses_session_between_calls(weather_payload):
+    client = WeatherClient()
+    with mock.patch.object(client.session, "get", return_value=make_response(weather_payload)) as mock_get:
+        client.fetch("Kyiv")
+        client.fetch("Lviv")
+    assert mock_get.call_count == 2
+
+
+def test_client_with_cache_and_clock(tmp_cache, weather_payload):
+    now = [1000.0]
+    client = WeatherClient(cache=cache, ttl=60, clock=lambda: now[0])
+    with mock.patch.object(client.session, "get", return_value=make_response(weather_payload)) as mock_get:
+        assert client.get_weather("Kyiv") == weather_payload
+        now[0] += 30
+        assert client.get_weather("Kyiv") == weather_payload
+        assert mock_get.call_count == 1
+        now[0] += 60
+        client.get_weather("Kyiv")
+        assert mock_get.call_count == 2
+
+
+def test_client_with_compact_cache_hits_network_once(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "CACHE_MODE", "compact")
+    client = WeatherClient(cache=cache, ttl=60, clock=lambda: 1000.0)
+    with mock.patch.object(client.session, "get", return_value=make_response(weather_payload)) as mock_get:
+        assert client.get_weather("Kyiv") == weather_payload
+        again = client.get_weather("Kyiv")
+    assert mock_get.call_count == 1
+    assert WeatherInfo.from_data(again) == WeatherInfo.from_data(weather_payload)
+
+
+def test_client_maps_timeout_to_network_error():
+    client = WeatherClient()
+    with mock.patch.object(client.session, "get", side_effect=requests.exceptions.ConnectTimeout):
+        with pytest.raises(api.NetworkError):
+            client.fetch("Kyiv")
+
+
+def test_default_client_is_shared():
+    assert get_default_client() is get_default_client()
@@ -0,0 +1,53 @@
+import json
+import pytest
+from src.weather_app import cache
+from src.weather_app.models import WeatherInfo
+from src.weather_app.api import extract_weather_info
+
+
+def test_from_data_matches_extract_weather_info(weather_payload):
+    info = WeatherInfo.from_data(weather_payload)
+    assert info == extract_weather_info(weather_payload)
+    assert info.city == "Kyiv"
+    assert info["temperature"] == 25
+    assert info.get("country") == "Ukraine"
+    assert info.get("unknown", "x") == "x"
+
+
+def test_slots_prevent_arbitrary_attributes(weather_payload):
+    info = WeatherInfo.from_data(weather_payload)
+    assert not hasattr(info, "__dict__")
+    with pytest.raises(AttributeError):
+        info.extra = 1
+
+
+def test_dict_roundtrip(weather_payload):
+    info = WeatherInfo.from_data(weather_payload)
+    assert WeatherInfo.from_dict(info.to_dict()) == info
+    with pytest.raises(KeyError):
+        info["hourly"]
+    assert WeatherInfo.from_data(info.to_data()) == info
+
+
+def test_compact_mode_stores_only_record(tmp_cache, monkeypatch, weather_payload):
+    monkeypatch.setattr(cache, "CACHE_MODE", "compact")
+    big_payload = dict(weather_payload, weather=[{"hourly": [{"x": "y" * 100}] * 8}] * 3)
+    cache.set_to_cache("Kyiv", big_payload)
+
+    entry = cache.get_store().get("kyiv")
+    assert "data" not in entry
+    assert len(json.dumps(entry)) < 1024
+    assert cache.get_info_from_cache("Kyiv") == WeatherInfo.from_data(weather_payload)
+    assert cache.get_from_cache("Kyiv") is None
+
+
+def test_full_mode_info_lookup(tmp_cache, weather_payload):
+    cache.set_to_cache("Kyiv", weather_payload)
+    assert cache.get_info_from_cache("Kyiv").city == "Kyiv"
+    assert cache.get_from_cache("Kyiv") == weather_payload
+
+
+def test_compact_mode_skips_invalid_data(tmp_cache, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_MODE", "compact")
+    cache.set_to_cache("Kyiv", {"current_condition": []})
+    assert cache.get_entry_from_cache("Kyiv") is None